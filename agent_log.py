@@ -0,0 +1,114 @@
+"""
+Agent activity log
+Fixed-capacity ring buffer of compact records with monotonic nanosecond
+timestamps and per-step durations. Optionally every record is also written
+as a JSON line to a rotating file for later analysis.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_CAPACITY = 200
+
+# Converts monotonic_ns() readings to wall-clock time for display
+_WALL_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+class LogRecord:
+    __slots__ = ('agent', 'activity', 'status', 'monotonic_ns', 'duration_ns')
+
+    def __init__(self, agent, activity, status, monotonic_ns, duration_ns=None):
+        self.agent = agent
+        self.activity = activity
+        self.status = status
+        self.monotonic_ns = monotonic_ns
+        self.duration_ns = duration_ns
+
+    @property
+    def wall_time(self):
+        return datetime.fromtimestamp((self.monotonic_ns + _WALL_OFFSET_NS) / 1e9)
+
+    @property
+    def timestamp(self):
+        return self.wall_time.strftime('%H:%M:%S')
+
+    @property
+    def duration(self):
+        """Seconds the step took, for records that close a step"""
+        return self.duration_ns / 1e9 if self.duration_ns is not None else None
+
+    def to_dict(self):
+        return {
+            'time': self.wall_time.isoformat(timespec='milliseconds'),
+            'monotonic_ns': self.monotonic_ns,
+            'agent': self.agent,
+            'activity': self.activity,
+            'status': self.status,
+            'duration_ns': self.duration_ns
+        }
+
+_spill_logger = None
+_spill_lock = threading.Lock()
+
+def spill_logger():
+    """Process-wide rotating JSONL sink, or None unless AGENT_LOG_FILE is set"""
+    global _spill_logger
+    path = os.environ.get("AGENT_LOG_FILE")
+    if not path:
+        return None
+    with _spill_lock:
+        if _spill_logger is None:
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=int(os.environ.get("AGENT_LOG_FILE_BYTES", 1024 * 1024)),
+                backupCount=int(os.environ.get("AGENT_LOG_FILE_BACKUPS", 3)),
+                encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            spill = logging.getLogger("agent_activity")
+            spill.setLevel(logging.INFO)
+            spill.propagate = False
+            spill.addHandler(handler)
+            _spill_logger = spill
+    return _spill_logger
+
+class AgentLog:
+    """Bounded activity log; the oldest records fall off once full.
+
+    Appends are safe from several pipeline threads at once.
+    """
+
+    def __init__(self, capacity=None):
+        capacity = capacity or int(os.environ.get("AGENT_LOG_CAPACITY", DEFAULT_CAPACITY))
+        self._records = deque(maxlen=capacity)
+
+    @property
+    def capacity(self):
+        return self._records.maxlen
+
+    def log(self, agent, activity, status, duration_ns=None):
+        record = LogRecord(agent, activity, status, time.monotonic_ns(), duration_ns)
+        self._records.append(record)
+        spill = spill_logger()
+        if spill is not None:
+            spill.info(json.dumps(record.to_dict()))
+        return record
+
+    def tail(self, n):
+        """The `n` most recent records, oldest first"""
+        records = list(self._records)
+        return records[-n:] if n > 0 else []
+
+    def clear(self):
+        self._records.clear()
+
+    def __iter__(self):
+        return iter(list(self._records))
+
+    def __len__(self):
+        return len(self._records)
@@ -0,0 +1,541 @@
+"""
+Market research agents
+Scraper, Analyzer and Reporter agents plus the Groq / NewsAPI calls they
+make. Nothing here imports Streamlit: API keys, the activity log and
+warnings come in through an AgentContext, together with an AgentConfig
+(provider endpoints, model, fetch sizes) and a MarketDataSource (the news
+and time-series stores), so the same pipeline runs in the dashboard, the
+REST API, batch worker processes and from the command line.
+"""
+
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+
+from agent_log import AgentLog
+from http_client import get_http_client, parse_retry_after
+from insight_stream import IncrementalInsightParser, iter_completion_deltas, parse_insights
+from lazy_imports import lazy_import
+from llm_cache import get_response_cache, prompt_key
+from news_store import get_news_store
+from orchestrator import AgentPipeline, Stage
+from rate_limit import INTERACTIVE, RateLimitTimeout, get_scheduler
+from sentiment import get_lexicon, label, score_articles
+from timeseries_store import get_timeseries_store
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+requests = lazy_import("requests")
+
+logger = logging.getLogger(__name__)
+
+GROQ_MODEL = "llama3-8b-8192"  # Using Llama 3 8B model
+# Part of the response cache key; bump when the insights prompt changes
+INSIGHTS_PROMPT_VERSION = 1
+
+class AgentConfig:
+    """Provider endpoints, model and fetch sizes; unset values come from the environment"""
+
+    def __init__(self, groq_base_url=None, news_base_url=None, groq_model=None,
+                 news_max_pages=None, news_analysis_articles=None):
+        # GROQ_BASE_URL / NEWSAPI_BASE_URL point the agents at another host (e.g. mock_providers.py)
+        self.groq_base_url = (groq_base_url or os.environ.get("GROQ_BASE_URL", "https://api.groq.com")).rstrip('/')
+        self.news_base_url = (news_base_url or os.environ.get("NEWSAPI_BASE_URL", "https://newsapi.org")).rstrip('/')
+        self.groq_model = groq_model or GROQ_MODEL
+        self.news_max_pages = news_max_pages or int(os.environ.get("NEWS_MAX_PAGES", 3))
+        self.news_analysis_articles = news_analysis_articles or int(os.environ.get("NEWS_ANALYSIS_ARTICLES", 50))
+
+    @property
+    def groq_chat_url(self):
+        return self.groq_base_url + "/openai/v1/chat/completions"
+
+    @property
+    def news_everything_url(self):
+        return self.news_base_url + "/v2/everything"
+
+class MarketDataSource:
+    """Where agents read and keep market data: the news article store and
+    the time-series store. Defaults to the process-wide stores, looked up on
+    use, so a context can be pickled to a worker process and find that
+    process's own stores there."""
+
+    def __init__(self, news=None, timeseries=None):
+        self._news = news
+        self._timeseries = timeseries
+
+    @property
+    def news(self):
+        return self._news if self._news is not None else get_news_store()
+
+    @property
+    def timeseries(self):
+        return self._timeseries if self._timeseries is not None else get_timeseries_store()
+
+class AgentContext:
+    """What an agent needs from its caller: API keys, a log sink, a warning
+    sink, its scheduling priority for provider quotas, configuration, a
+    market data source and the shared HTTP client and sentiment lexicon.
+    The dashboard hands in the health-checked instances of its resource
+    registry; elsewhere the process-wide ones are looked up on use."""
+
+    def __init__(self, api_keys=None, logs=None, warn=None, priority=INTERACTIVE, wait_timeout=None,
+                 config=None, data=None, http=None, lexicon=None):
+        self.api_keys = api_keys if api_keys is not None else {}
+        self.logs = logs if logs is not None else AgentLog()
+        self.warn = warn or logger.warning
+        self.config = config or AgentConfig()
+        self.data = data or MarketDataSource()
+        self._http = http
+        self._lexicon = lexicon
+        self.priority = priority
+        # Interactive callers give up eventually; batch work waits as long as it takes
+        if wait_timeout is None and priority == INTERACTIVE:
+            wait_timeout = float(os.environ.get("RATE_LIMIT_WAIT_TIMEOUT", 120))
+        self.wait_timeout = wait_timeout
+
+    @property
+    def http(self):
+        return self._http if self._http is not None else get_http_client()
+
+    @property
+    def lexicon(self):
+        return self._lexicon if self._lexicon is not None else get_lexicon()
+
+    def acquire(self, provider, tokens=1):
+        """Queue on the process-wide quota scheduler for one provider request"""
+        get_scheduler().acquire(provider, tokens, self.priority, self.wait_timeout)
+
+class ProviderRateLimited(Exception):
+    """The provider answered 429 even after the HTTP client's own retries"""
+
+    def __init__(self, provider, retry_after=None):
+        super().__init__(f"{provider} rate limit reached")
+        self.provider = provider
+        self.retry_after = retry_after
+
+# How often a 429'd call is put back in the quota queue before giving up
+RATE_LIMIT_REQUEUES = 3
+DEFAULT_RATE_LIMIT_PAUSE = 30.0
+
+def call_with_quota(context, provider, request, tokens=1):
+    """Run `request` under the provider quota. A 429 pauses the provider for
+    every caller in the process and this call queues again"""
+    for attempt in range(RATE_LIMIT_REQUEUES):
+        context.acquire(provider, tokens)
+        try:
+            return request()
+        except ProviderRateLimited as e:
+            if attempt == RATE_LIMIT_REQUEUES - 1:
+                raise
+            get_scheduler().pause(provider, e.retry_after or DEFAULT_RATE_LIMIT_PAUSE)
+
+def _raise_for_rate_limit(provider, response):
+    if response.status_code == 429:
+        raise ProviderRateLimited(provider, parse_retry_after(response.headers.get('Retry-After')))
+
+# API Integration Functions
+# Fallback insights when Groq is unavailable
+DEFAULT_INSIGHTS = [
+    "Strong growth potential in emerging markets",
+    "Increasing adoption of AI technologies", 
+    "Competitive landscape is evolving rapidly"
+]
+
+class FallbackInsights(list):
+    """DEFAULT_INSIGHTS standing in for a Groq answer; `reason` says why.
+    Reports built from them are marked degraded."""
+
+    def __init__(self, reason):
+        super().__init__(DEFAULT_INSIGHTS)
+        self.reason = reason
+
+def get_groq_insights(query, market_data, context, on_insight=None):
+    """Generate AI insights using Groq API.
+
+    With `on_insight`, the completion is streamed and the callback receives
+    each insight as soon as its line is complete.
+    """
+    emitted = []
+    
+    def emit(insight):
+        if on_insight and insight not in emitted:
+            emitted.append(insight)
+            on_insight(insight)
+    
+    insights = _groq_insights(query, market_data, context, emit if on_insight else None)
+    if isinstance(insights, FallbackInsights):
+        # Defaults are not streamed: after a stream that broke partway they would
+        # trail the partial lines; the job takes the report's list once it is done
+        return insights
+    # Cached and coalesced answers arrive all at once
+    for insight in insights:
+        emit(insight)
+    return insights
+
+def _groq_insights(query, market_data, context, on_insight):
+    if not context.api_keys.get('groq'):
+        return FallbackInsights("No Groq API key")
+    
+    try:
+        # Groq API endpoint
+        url = context.config.groq_chat_url
+        
+        headers = {
+            "Authorization": f"Bearer {context.api_keys['groq']}",
+            "Content-Type": "application/json"
+        }
+        
+        # Create a concise market data summary for the prompt
+        data_summary = {
+            'query': query,
+            'trends': market_data.get('trends', {}),
+            'sentiment': market_data.get('news_sentiment', 'neutral'),
+            'articles_found': len(market_data.get('news', []))
+        }
+        
+        prompt = f"""
+        Analyze this market research query and provide 3 key actionable insights:
+
+        Query: {query}
+        Market Data Summary: {json.dumps(data_summary, indent=2)}
+
+        Please provide exactly 3 concise, actionable insights about this market. Each insight should be a single sentence focusing on opportunities, risks, or trends.
+
+        Format your response as 3 separate lines, each starting with a bullet point or dash.
+        """
+        
+        payload = {
+            "model": context.config.groq_model,
+            "messages": [
+                {
+                    "role": "system", 
+                    "content": "You are an expert market research analyst. Provide concise, actionable insights based on market data."
+                },
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ],
+            "max_tokens": 300,
+            "temperature": 0.7,
+            "top_p": 1,
+            "stream": on_insight is not None
+        }
+        
+        if on_insight is not None:
+            request = lambda: stream_groq_insights(context.http, url, headers, payload, on_insight)
+        else:
+            request = lambda: request_groq_insights(context.http, url, headers, payload)
+        
+        # Rough token estimate for the tokens/min budget: ~4 characters per token
+        tokens = len(prompt) // 4 + payload["max_tokens"]
+        
+        # The same question across sessions shares one cached (or in-flight) completion. The
+        # key leaves out the trend numbers and article counts: they change from run to run
+        # (random without an industry), so keying on them would make every run a miss
+        key = prompt_key(context.config.groq_model, INSIGHTS_PROMPT_VERSION,
+                         query=query, industry=market_data.get('industry'))
+        return list(get_response_cache().get_or_compute(
+            key, lambda: call_with_quota(context, 'groq', request, tokens)
+        ))
+        
+    except RateLimitTimeout as e:
+        context.warn(f"No Groq quota in time ({e}). Using default insights.")
+        return FallbackInsights("Groq quota exhausted")
+    except requests.exceptions.HTTPError as e:
+        context.warn(f"Groq API error: {e}")
+        return FallbackInsights(f"Groq API error: {e}")
+    except requests.exceptions.Timeout:
+        context.warn("Groq API request timed out. Using default insights.")
+        return FallbackInsights("Groq API request timed out")
+    except Exception as e:
+        context.warn(f"Groq API integration error: {e}")
+        return FallbackInsights(f"Groq API integration error: {e}")
+
+def request_groq_insights(client, url, headers, payload):
+    """Call Groq and parse exactly 3 insights; raises on API errors so they are never cached"""
+    response = client.post(url, headers=headers, json=payload, timeout=30)
+    
+    _raise_for_rate_limit('groq', response)
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(f"{response.status_code} - {response.text}")
+    
+    result = response.json()
+    content = result['choices'][0]['message']['content'].strip()
+    return parse_insights(content)
+
+def stream_groq_insights(client, url, headers, payload, on_insight):
+    """Consume Groq's SSE stream, handing each insight to `on_insight` as its line completes"""
+    parser = IncrementalInsightParser()
+    with client.stream('POST', url, headers=headers, json=payload, timeout=30) as response:
+        _raise_for_rate_limit('groq', response)
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(f"{response.status_code} - {response.text}")
+        
+        for fragment in iter_completion_deltas(response.iter_lines(decode_unicode=True)):
+            for insight in parser.feed(fragment):
+                on_insight(insight)
+    return parser.finish()
+
+# NewsAPI's largest page; most queries need a single request
+NEWS_PAGE_SIZE = 100
+# fetch_news_pages status when paging stopped before the oldest result: the page
+# budget ran out or a later page failed. The pages fetched so far are still returned.
+NEWS_PARTIAL = "partial"
+
+def fetch_news_pages(query, context, published_after=None, max_pages=3, published_before=None):
+    """Page through NewsAPI results newest first, between `published_after`
+    and `published_before`.
+
+    Returns (articles, requests made, status). Status is 'ok' only when
+    paging reached the oldest matching article; running out of pages or a
+    failure after the first page returns what was fetched as NEWS_PARTIAL.
+    """
+    params = {
+        'q': query,
+        'apiKey': context.api_keys['news'],
+        'language': 'en',
+        'sortBy': 'publishedAt',
+        'pageSize': NEWS_PAGE_SIZE
+    }
+    if published_after:
+        params['from'] = published_after
+    if published_before:
+        params['to'] = published_before
+    
+    url = context.config.news_everything_url
+    articles, requests_made = [], 0
+    for page in range(1, max_pages + 1):
+        def request():
+            response = context.http.get(url, params={**params, 'page': page}, timeout=10)
+            _raise_for_rate_limit('news', response)
+            return response
+        
+        try:
+            data = call_with_quota(context, 'news', request).json()
+        except Exception as e:
+            if page == 1:
+                raise
+            context.warn(f"NewsAPI page {page} failed, keeping {len(articles)} articles: {e}")
+            return articles, requests_made, NEWS_PARTIAL
+        requests_made += 1
+        if data.get('status') != 'ok':
+            status = f"API Error: {data.get('message', 'Unknown error')}"
+            return articles, requests_made, status if page == 1 else NEWS_PARTIAL
+        batch = data.get('articles', [])
+        articles.extend(batch)
+        if len(batch) < NEWS_PAGE_SIZE or len(articles) >= data.get('totalResults', 0):
+            return articles, requests_made, 'ok'
+    return articles, requests_made, NEWS_PARTIAL
+
+def get_news_data(query, context):
+    """News for `query` from the local store, topped up with articles
+    published since the last fetch of the same query (or, while an earlier
+    fetch left a gap, with the articles missing from it)"""
+    store = context.data.news
+    max_pages, limit = context.config.news_max_pages, context.config.news_analysis_articles
+    if not context.api_keys.get('news'):
+        return {"articles": store.articles(query, limit), "status": "No API key"}
+    
+    try:
+        fetched, requests_made, status = fetch_news_pages(
+            query, context, store.cursor(query), max_pages, published_before=store.backfill(query)
+        )
+        if status not in ('ok', NEWS_PARTIAL):
+            return {"articles": store.articles(query, limit), "status": status}
+        new_articles = store.ingest(query, fetched, requests_made, complete=status == 'ok')
+        return {"articles": store.articles(query, limit), "status": status,
+                "new_articles": new_articles, "requests": requests_made}
+            
+    except Exception as e:
+        context.warn(f"NewsAPI error: {e}")
+        return {"articles": store.articles(query, limit), "status": "API call failed"}
+
+def get_market_sentiment_analysis(data, context):
+    """Market sentiment from the lexicon scores of the scraped news articles"""
+    scores = data.get('news_scores') or []
+    if scores:
+        scores = np.asarray(scores)
+        mean = float(scores.mean())
+        spread = float(scores.std())
+        if spread > 0.5:
+            trend = 'Volatile'
+        else:
+            trend = {'positive': 'Bullish', 'negative': 'Bearish'}.get(label(mean), 'Neutral')
+        sentiment_data = {
+            'overall_score': round((mean + 1) / 2, 4),
+            'trend': trend,
+            'sources': ['News Articles'],
+            # More articles that agree with each other give a more confident reading
+            'confidence': round(min(1.0, len(scores) / 10) * (1 - spread / 2), 4)
+        }
+    else:
+        sentiment_data = {'overall_score': 0.5, 'trend': 'Neutral', 'sources': [], 'confidence': 0.0}
+    
+    # If Twitter API is available, integrate real sentiment
+    if context.api_keys.get('twitter'):
+        try:
+            # Placeholder for Twitter API integration
+            sentiment_data['twitter_enabled'] = True
+        except Exception as e:
+            sentiment_data['twitter_error'] = str(e)
+    
+    return sentiment_data
+
+# Multi-Agent System Classes
+class MarketResearchAgent:
+    def __init__(self, name, role, context=None):
+        self.name = name
+        self.role = role
+        self.status = "idle"
+        self.context = context or AgentContext()
+        self._started_ns = None
+    
+    def log_activity(self, activity, duration_ns=None):
+        return self.context.logs.log(self.name, activity, self.status, duration_ns)
+    
+    def start_activity(self, activity):
+        """Mark the agent active and remember when this step began"""
+        self.status = "active"
+        self._started_ns = time.monotonic_ns()
+        return self.log_activity(activity)
+    
+    def finish_activity(self, activity):
+        """Mark the agent completed and record how long the step took"""
+        self.status = "completed"
+        duration_ns = time.monotonic_ns() - self._started_ns if self._started_ns is not None else None
+        return self.log_activity(activity, duration_ns)
+
+class ScraperAgent(MarketResearchAgent):
+    def __init__(self, context=None):
+        super().__init__("Scraper Agent", "Data Collection", context)
+    
+    def scrape_market_data(self, query, industry=None):
+        self.start_activity(f"Scraping data for: {query}")
+        
+        # Get real news data if API is available
+        news_data = get_news_data(query, self.context)
+        
+        # Simulated data with real news integration
+        data = {
+            'query': query,
+            'news': news_data.get('articles', []),
+            'news_status': news_data.get('status', 'No API'),
+            'industry': industry,
+            'trends': generate_trend_data(industry, self.context.data.timeseries),
+            'competitors': ['Company A', 'Company B', 'Company C'],
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        # Add news sentiment if articles are available
+        if data['news']:
+            scores = score_articles(data['news'], self.context.lexicon)
+            data['news_scores'] = [round(float(score), 4) for score in scores]
+            data['news_sentiment'] = label(float(scores.mean()))
+        
+        self.finish_activity(f"Completed scraping for: {query} (Found {len(data['news'])} articles)")
+        return data
+
+class AnalyzerAgent(MarketResearchAgent):
+    def __init__(self, context=None):
+        super().__init__("Analyzer Agent", "Data Analysis", context)
+    
+    def analyze_data(self, data):
+        ai_insights = self.generate_insights(data)
+        sentiment_analysis = self.analyze_sentiment(data)
+        return self.compile_analysis(ai_insights, sentiment_analysis)
+    
+    def generate_insights(self, data, on_insight=None):
+        self.start_activity("Analyzing market data with Groq AI...")
+        
+        # Use Groq for insights, streamed when a callback is given
+        query = data.get('query', 'market analysis')
+        return get_groq_insights(query, data, self.context, on_insight)
+    
+    def analyze_sentiment(self, data):
+        # Scored from the scraped articles
+        return get_market_sentiment_analysis(data, self.context)
+    
+    def compile_analysis(self, ai_insights, sentiment_analysis):
+        analysis = {
+            'sentiment_score': sentiment_analysis['overall_score'],
+            'growth_potential': random.uniform(0.4, 0.95),
+            'risk_level': random.choice(['Low', 'Medium', 'High']),
+            'key_insights': ai_insights,
+            'sentiment_trend': sentiment_analysis['trend'],
+            'data_sources': sentiment_analysis['sources'],
+            'confidence': sentiment_analysis['confidence']
+        }
+        if isinstance(ai_insights, FallbackInsights):
+            analysis['degraded'] = ai_insights.reason
+        
+        self.finish_activity("Analysis completed with Groq AI integration")
+        return analysis
+
+class ReporterAgent(MarketResearchAgent):
+    def __init__(self, context=None):
+        super().__init__("Reporter Agent", "Report Generation", context)
+    
+    def generate_report(self, data, analysis):
+        self.start_activity("Generating comprehensive report...")
+        
+        report = {
+            'title': f"Market Research Report - {datetime.now().strftime('%Y-%m-%d')}",
+            'executive_summary': "This report provides comprehensive market analysis with AI-driven insights.",
+            'market_data': data,
+            'analysis': analysis,
+            'recommendations': [
+                "Invest in emerging technologies",
+                "Focus on customer experience", 
+                "Expand into new markets"
+            ],
+            'generated_at': datetime.now().isoformat(),
+            # Why the insights are placeholders, when they are; None for a full report
+            'degraded': analysis.get('degraded')
+        }
+        
+        self.finish_activity("Report generated successfully")
+        return report
+
+def research_pipeline(query, scraper, analyzer, reporter, stage_wrapper=None, on_insight=None, industry=None):
+    """Agent workflow as a DAG: sentiment scoring and the Groq call both
+    start as soon as the scraped data is ready"""
+    stages = [
+        Stage('scrape', lambda: scraper.scrape_market_data(query, industry)),
+        Stage('sentiment', analyzer.analyze_sentiment, deps=['scrape']),
+        Stage('insights', lambda data: analyzer.generate_insights(data, on_insight), deps=['scrape']),
+        Stage('analysis', analyzer.compile_analysis, deps=['insights', 'sentiment']),
+        Stage('report', reporter.generate_report, deps=['scrape', 'analysis'])
+    ]
+    return AgentPipeline(stages, stage_wrapper=stage_wrapper)
+
+# Data generation functions
+def generate_trend_data(industry=None, store=None):
+    """Trend indicators from the industry's stored market series over the
+    last year; random placeholders when the industry is unknown"""
+    if not industry:
+        return {
+            'ai_adoption': random.uniform(0.6, 0.95),
+            'market_growth': random.uniform(0.1, 0.3),
+            'innovation_index': random.uniform(0.5, 0.9),
+            'competition_level': random.uniform(0.4, 0.8)
+        }
+    
+    if store is None:
+        store = get_timeseries_store()
+    store.ensure_sample(industry)
+    last = store.span(industry)[1]
+    index = store.index_series(industry, 'D', start=last - pd.DateOffset(years=1))
+    returns = index.pct_change().dropna()
+    quarter = index[index.index >= last - pd.DateOffset(months=3)]
+    recent = store.query(industry, start=last - pd.DateOffset(days=30), columns=['sentiment'])
+    return {
+        'market_growth': round(float(index.iloc[-1] / index.iloc[0] - 1), 4),
+        'momentum_3m': round(float(quarter.iloc[-1] / quarter.iloc[0] - 1), 4),
+        'volatility': round(float(returns.std() * np.sqrt(252)), 4),
+        'sentiment': round(float(recent['sentiment'].mean()), 4),
+        'tickers': sorted(recent['ticker'].unique())
+    }
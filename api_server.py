@@ -0,0 +1,205 @@
+"""
+Headless research API
+JSON over HTTP for systems that request reports by machine. Queries run
+through the same Scraper -> Analyzer -> Reporter pipeline as the
+dashboard, on a background job pool (see jobs.py); finished reports land
+in the shared report store. Streamlit is never imported.
+
+Usage:
+    GROQ_API_KEY=... NEWS_API_KEY=... python api_server.py [--host 127.0.0.1] [--port 8000] [--workers 8]
+
+Endpoints:
+    POST /v1/reports                     {"query": "...", "industry": "..."} -> 202 with the job id
+    GET  /v1/jobs/{job_id}               status, progress, insights so far and, once done, the report id
+    GET  /v1/jobs/{job_id}/events        the same as Server-Sent Events until the job finishes; an
+                                         `insights` event replaces the streamed ones with the final list
+    GET  /v1/reports/{report_id}         a stored report (?market_data=1 adds its articles and trends)
+    GET  /v1/reports/{report_id}/export.pdf | export.docx
+    GET  /v1/health                      job pool, provider quota and export cache stats
+
+Set API_TOKEN to require `Authorization: Bearer <token>` on every endpoint.
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import os
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from exports import EXPORT_FORMATS, ExportCache, export_available
+from jobs import ACTIVE_STATUSES, JobQueue
+from rate_limit import BATCH, get_scheduler
+from report_store import get_report_store
+from storage import cache_path
+from timeseries_store import INDUSTRIES, canonical_industry
+
+MAX_QUERY_LENGTH = 500
+API_OWNER = "api"
+# Seconds between job table reads while streaming events
+EVENT_POLL_SECONDS = 0.25
+
+def error(status, message):
+    return JSONResponse({'error': message}, status_code=status)
+
+def job_view(job):
+    """Public fields of a job plus links to what can be fetched next"""
+    view = {key: value for key, value in job.items() if key not in ('owner', 'result_path')}
+    view['links'] = {'self': f"/v1/jobs/{job['id']}", 'events': f"/v1/jobs/{job['id']}/events"}
+    if job['report_id']:
+        report = f"/v1/reports/{job['report_id']}"
+        view['links'].update(report=report, pdf=f"{report}/export.pdf", docx=f"{report}/export.docx")
+    return view
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def api_job_queue(workers=None):
+    """Job pool with its own table, so the API and the dashboard never mark each other's jobs interrupted"""
+    return JobQueue(path=os.environ.get("API_JOB_STORE_PATH") or cache_path("api_jobs.sqlite3"), workers=workers)
+
+def create_app(queue=None, api_keys=None, token=None, exports=None):
+    """ASGI app; defaults read the job table, provider keys and token from the environment"""
+    queue = queue or api_job_queue()
+    api_keys = api_keys if api_keys is not None else {
+        'groq': os.environ.get("GROQ_API_KEY", ""),
+        'news': os.environ.get("NEWS_API_KEY", "")
+    }
+    token = token if token is not None else os.environ.get("API_TOKEN", "")
+    exports = exports or ExportCache()
+    # Job table, report store and export rendering all block (SQLite locks, CPU), so every
+    # handler calls them through run_in_threadpool and keeps the event loop free
+
+    def protected(handler):
+        async def check(request):
+            if token:
+                supplied = request.headers.get('authorization', '')
+                if not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+                    return error(401, "missing or invalid bearer token")
+            return await handler(request)
+        return check
+
+    async def submit_report(request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return error(400, "request body must be JSON")
+        if not isinstance(body, dict):
+            return error(400, "request body must be a JSON object")
+        query = body.get('query')
+        industry = body.get('industry') or None
+        if not isinstance(query, str) or not query.strip():
+            return error(422, "'query' must be a non-empty string")
+        if len(query) > MAX_QUERY_LENGTH:
+            return error(422, f"'query' is longer than {MAX_QUERY_LENGTH} characters")
+        if industry is not None:
+            industry = canonical_industry(industry) if isinstance(industry, str) else None
+            if industry is None:
+                return error(422, f"'industry' must be one of: {', '.join(INDUSTRIES)}")
+        # Same wait policy as batch runs; the dashboard has its own scheduler, so this does not defer to it
+        job_id = await run_in_threadpool(queue.submit, query.strip(), api_keys, API_OWNER,
+                                         industry=industry, priority=BATCH)
+        return JSONResponse(job_view(await run_in_threadpool(queue.get, job_id)), status_code=202,
+                            headers={'Location': f"/v1/jobs/{job_id}"})
+
+    async def get_job(request):
+        job = await run_in_threadpool(queue.get, request.path_params['job_id'])
+        if job is None:
+            return error(404, "job not found")
+        return JSONResponse(job_view(job))
+
+    async def job_events(request):
+        job_id = request.path_params['job_id']
+        if await run_in_threadpool(queue.get, job_id) is None:
+            return error(404, "job not found")
+
+        async def events():
+            sent_insights, last_progress = [], None
+            while True:
+                job = await run_in_threadpool(queue.get, job_id)
+                if job['insights'][:len(sent_insights)] != sent_insights:
+                    # Replaced once the job finished (a broken stream, or a failed job)
+                    yield sse('insights', {'items': job['insights']})
+                else:
+                    for insight in job['insights'][len(sent_insights):]:
+                        yield sse('insight', {'text': insight})
+                sent_insights = list(job['insights'])
+                if (job['status'], job['progress']) != last_progress:
+                    last_progress = (job['status'], job['progress'])
+                    yield sse('progress', {'status': job['status'], 'stage': job['stage'],
+                                           'progress': job['progress']})
+                if job['status'] not in ACTIVE_STATUSES:
+                    yield sse(job['status'], job_view(job))
+                    return
+                await asyncio.sleep(EVENT_POLL_SECONDS)
+
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={'Cache-Control': 'no-cache'})
+
+    async def get_report(request):
+        with_market_data = request.query_params.get('market_data') in ('1', 'true')
+        report = await run_in_threadpool(get_report_store().get, request.path_params['report_id'],
+                                         with_market_data=with_market_data)
+        if report is None:
+            return error(404, "report not found")
+        return JSONResponse(json.loads(json.dumps(report, default=str)))
+
+    async def export_report(request):
+        fmt = request.path_params['fmt']
+        if fmt not in EXPORT_FORMATS:
+            return error(404, f"unknown export format '{fmt}'")
+        if not export_available(fmt):
+            return error(501, f"{fmt} export needs an optional package that is not installed")
+        report_id = request.path_params['report_id']
+        report = await run_in_threadpool(get_report_store().get, report_id)
+        if report is None:
+            return error(404, "report not found")
+        data = await run_in_threadpool(exports.get_or_render, report, 'en', fmt)
+        spec = EXPORT_FORMATS[fmt]
+        return Response(data, media_type=spec['mime'], headers={
+            'Content-Disposition': f'attachment; filename="report_{report_id[:8]}.{spec["extension"]}"'
+        })
+
+    async def health(request):
+        return JSONResponse({
+            'jobs': await run_in_threadpool(queue.stats),
+            'quotas': get_scheduler().stats(),
+            'exports': exports.stats()
+        })
+
+    routes = [
+        Route("/v1/reports", protected(submit_report), methods=["POST"]),
+        Route("/v1/jobs/{job_id}", protected(get_job)),
+        Route("/v1/jobs/{job_id}/events", protected(job_events)),
+        Route("/v1/reports/{report_id}", protected(get_report)),
+        Route("/v1/reports/{report_id}/export.{fmt}", protected(export_report)),
+        Route("/v1/health", protected(health)),
+    ]
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        queue.close()
+
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.queue = queue
+    return app
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the research pipeline as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, help="concurrent research jobs (default JOB_WORKERS or 4)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    uvicorn.run(create_app(api_job_queue(args.workers)), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
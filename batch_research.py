@@ -0,0 +1,233 @@
+"""
+Batch research mode
+Runs the Scraper -> Analyzer -> Reporter pipeline for many queries on a
+bounded worker pool, enforcing per-provider rate limits and checkpointing
+every finished query to a JSONL file so an interrupted run can resume.
+With --processes the workers are separate processes, each with its own
+share of the per-minute provider limits (daily quotas are counted once in
+the shared quota store), so scoring and report building use every core.
+Finished reports are saved to the dashboard's report store, like batches
+run from the dashboard, unless --no-store is given.
+
+CLI usage:
+    GROQ_API_KEY=... NEWS_API_KEY=... python batch_research.py queries.csv \\
+        --checkpoint overnight.jsonl --workers 8 [--processes]
+
+The CSV needs either a `query` column or any of `industry`, `region` and
+`timeframe`, which are combined into the query text. An `industry` must be
+one of the dashboard's industries (any case); rows naming another one are
+recorded as failed instead of being researched against made-up market data.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from agents import AgentContext, ScraperAgent, AnalyzerAgent, ReporterAgent, research_pipeline
+from rate_limit import BATCH, get_scheduler
+from report_store import get_report_store
+from timeseries_store import INDUSTRIES, canonical_industry
+
+DEFAULT_WORKERS = 4
+
+QUERY_FIELDS = ('industry', 'region', 'timeframe')
+
+def query_id(query):
+    return hashlib.sha1(" ".join(query.lower().split()).encode('utf-8')).hexdigest()[:16]
+
+def read_queries(fileobj):
+    """Parse a CSV of queries into rows with `id` and `query`; duplicates are dropped"""
+    rows, seen = [], set()
+    for record in csv.DictReader(fileobj):
+        record = {(k or '').strip().lower(): (v or '').strip() for k, v in record.items()}
+        if record.get('industry'):
+            # Unknown names are kept as typed; research_query rejects them
+            record['industry'] = canonical_industry(record['industry']) or record['industry']
+        query = record.get('query') or " ".join(
+            record[field] for field in QUERY_FIELDS if record.get(field)
+        )
+        if not query:
+            continue
+        row_id = query_id(query)
+        if row_id in seen:
+            continue
+        seen.add(row_id)
+        record.update(id=row_id, query=query)
+        rows.append(record)
+    return rows
+
+def load_checkpoint(path):
+    """Completed records from a checkpoint file, keyed by query id"""
+    done = {}
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated last line
+                continue
+            if record.get('status') == 'done':
+                done[record['id']] = record
+    return done
+
+class BatchProgress:
+    def __init__(self, total, skipped):
+        self.total = total
+        self.skipped = skipped
+        self.completed = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    @property
+    def finished(self):
+        return self.skipped + self.completed + self.failed
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def queries_per_minute(self):
+        processed = self.completed + self.failed
+        return processed / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return (f"{self.finished}/{self.total} done ({self.failed} failed, {self.skipped} resumed) "
+                f"- {self.queries_per_minute:.1f} queries/min")
+
+def research_query(row, api_keys):
+    """Run one query through the agent pipeline and return a checkpoint record"""
+    warnings = []
+    # Batch priority: provider quota goes to interactive dashboard users first
+    context = AgentContext(api_keys=api_keys, warn=warnings.append, priority=BATCH)
+    started = time.monotonic()
+    industry = row.get('industry') or None
+    try:
+        if industry is not None and canonical_industry(industry) is None:
+            raise ValueError(f"unknown industry '{industry}' (expected one of: {', '.join(INDUSTRIES)})")
+        result = research_pipeline(
+            row['query'], ScraperAgent(context), AnalyzerAgent(context), ReporterAgent(context),
+            industry=industry
+        ).run()
+        record = {'status': 'done', 'report': result['report']}
+    except Exception as e:
+        record = {'status': 'failed', 'error': str(e)}
+    record.update(
+        id=row['id'],
+        query=row['query'],
+        fields={field: row[field] for field in QUERY_FIELDS if row.get(field)},
+        warnings=warnings,
+        duration=time.monotonic() - started,
+        finished_at=datetime.now().isoformat()
+    )
+    return record
+
+def _init_worker_process(limits, processes):
+    """Worker process setup: an equal share of the parent's provider limits"""
+    get_scheduler().share(limits, processes)
+
+def make_executor(workers, processes=False):
+    """Thread pool, or with `processes` a pool of fresh (spawned) worker processes"""
+    if not processes:
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+    # Spawned, not forked: the parent's SQLite connections and HTTP pools must not be shared
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_worker_process, initargs=(get_scheduler().limits(), workers))
+
+def run_batch(rows, api_keys, checkpoint_path=None, workers=DEFAULT_WORKERS, on_progress=None, processes=False,
+              report_store=None):
+    """Research every row, skipping ones already done in the checkpoint.
+
+    `on_progress(progress, record)` is called on the calling thread after
+    each query. Returns all done/failed records, including resumed ones.
+    With `processes`, queries run in `workers` worker processes. Reports
+    finished in this run are saved to `report_store` when given (resumed
+    ones were saved by the run that did them).
+    """
+    done = load_checkpoint(checkpoint_path)
+    pending = [row for row in rows if row['id'] not in done]
+    records = [done[row['id']] for row in rows if row['id'] in done]
+    progress = BatchProgress(len(rows), len(records))
+
+    write_lock = threading.Lock()
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+    try:
+        with make_executor(workers, processes) as executor:
+            futures = [executor.submit(research_query, row, api_keys) for row in pending]
+            for future in as_completed(futures):
+                record = future.result()
+                if report_store is not None and record['status'] == 'done':
+                    # Before checkpointing, so the record carries the stored report's id
+                    report_store.add(record['report'], industry=record['fields'].get('industry'))
+                if checkpoint is not None:
+                    with write_lock:
+                        checkpoint.write(json.dumps(record, default=str) + "\n")
+                        checkpoint.flush()
+                        os.fsync(checkpoint.fileno())
+                if record['status'] == 'done':
+                    progress.completed += 1
+                else:
+                    progress.failed += 1
+                records.append(record)
+                if on_progress:
+                    on_progress(progress, record)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    return records
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run market research for every query in a CSV file.")
+    parser.add_argument("csv", help="CSV with a 'query' column or industry/region/timeframe columns")
+    parser.add_argument("--checkpoint", default="batch_checkpoint.jsonl",
+                        help="JSONL file of finished queries; rerun with the same file to resume")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--processes", action="store_true",
+                        help="run the workers as processes, each with an equal share of the per-minute provider limits")
+    parser.add_argument("--groq-rpm", type=float, help="Override Groq requests per minute (GROQ_RPM)")
+    parser.add_argument("--news-rpm", type=float, help="Override NewsAPI requests per minute (NEWS_RPM)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="only write the checkpoint file, not the dashboard's report store")
+    args = parser.parse_args(argv)
+
+    with open(args.csv, newline='', encoding='utf-8') as f:
+        rows = read_queries(f)
+    api_keys = {
+        'groq': os.environ.get("GROQ_API_KEY", ""),
+        'news': os.environ.get("NEWS_API_KEY", "")
+    }
+    if not api_keys['groq']:
+        print("GROQ_API_KEY not set: reports will use default insights.", file=sys.stderr)
+
+    def report(progress, record):
+        status = "ok  " if record['status'] == 'done' else "FAIL"
+        print(f"[{status}] {record['query'][:60]:<60} {progress}", flush=True)
+
+    scheduler = get_scheduler()
+    if args.groq_rpm:
+        groq = scheduler.quotas['groq']
+        scheduler.configure('groq', args.groq_rpm,
+                            groq.tokens.rate * 60 if groq.tokens else None, groq.daily_quota)
+    if args.news_rpm:
+        scheduler.configure('news', args.news_rpm, daily_quota=scheduler.quotas['news'].daily_quota)
+
+    store = None if args.no_store else get_report_store()
+    records = run_batch(rows, api_keys, args.checkpoint, args.workers, report, processes=args.processes,
+                        report_store=store)
+    failed = sum(1 for record in records if record['status'] != 'done')
+    saved = "" if store is None else " and the Reports page"
+    print(f"Finished {len(records)} queries ({failed} failed); results in {args.checkpoint}{saved}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Benchmark: headless research API
+Serves api_server.create_app() with uvicorn in-process, against the mock
+providers (mock_providers.MockProviderServer), and drives it over HTTP
+from a pool of client threads. Reports requests/s and latency
+percentiles for report submission and job polling, end-to-end reports/s,
+and export downloads both cold (rendered) and warm (export cache).
+
+Usage: python benchmarks/bench_api.py [--reports 200] [--clients 32] [--workers 16] [--polls 2000]
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_providers import MockProviderServer, add_profile_arguments, profile_from_args
+
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Retail", "Manufacturing"]
+TOPICS = ["AI chips", "telehealth", "digital payments", "grocery delivery", "industrial robots",
+          "cloud security", "wearables", "battery storage"]
+
+_sessions = threading.local()
+
+def session():
+    if not hasattr(_sessions, 'session'):
+        _sessions.session = requests.Session()
+    return _sessions.session
+
+def percentiles(values):
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]) * 1000
+    return f"p50 {p50:7.1f}  p90 {p90:7.1f}  p99 {p99:7.1f} ms"
+
+def timed(method, url, **kwargs):
+    start = time.perf_counter()
+    response = session().request(method, url, timeout=60, **kwargs)
+    response.raise_for_status()
+    return time.perf_counter() - start, response
+
+def burst(clients, calls):
+    """Run (method, url, kwargs) calls on `clients` threads; returns (wall seconds, latencies, responses)"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda call: timed(call[0], call[1], **call[2]), calls))
+    return time.perf_counter() - start, [seconds for seconds, _ in results], [response for _, response in results]
+
+def report(label, wall, latencies):
+    print(f"{label:<16}{len(latencies) / wall:9.1f} req/s   {percentiles(latencies)}")
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent HTTP client threads")
+    parser.add_argument("--workers", type=int, default=16, help="API job workers")
+    parser.add_argument("--polls", type=int, default=2000, help="job status requests in the polling burst")
+    parser.add_argument("--exports", type=int, default=20, help="reports downloaded as PDF, cold then warm")
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=1)
+    add_profile_arguments(parser, "groq", "lognormal:400:0.5")
+    add_profile_arguments(parser, "news", "lognormal:150:0.4")
+    args = parser.parse_args()
+
+    mock = MockProviderServer(
+        groq=profile_from_args(args, "groq", token_ms=args.token_ms),
+        news=profile_from_args(args, "news"),
+        seed=args.seed
+    )
+    mock_url = mock.start()
+    os.environ["GROQ_BASE_URL"] = mock_url
+    os.environ["NEWSAPI_BASE_URL"] = mock_url
+    os.environ.setdefault("MARKET_ANALYZER_CACHE_DIR", tempfile.mkdtemp(prefix="api-bench-"))
+    os.environ.setdefault("HTTP_POOL_MAXSIZE", str(max(20, args.workers)))
+
+    import uvicorn
+
+    import agents
+    from api_server import api_job_queue, create_app
+
+    # Provider limits are the mock's business here; the client-side quotas would cap throughput
+    scheduler = agents.get_scheduler()
+    scheduler.configure('groq', 0)
+    scheduler.configure('news', 0)
+    for industry in INDUSTRIES:
+        agents.get_timeseries_store().ensure_sample(industry)
+
+    app = create_app(api_job_queue(args.workers), api_keys={'groq': 'mock-key', 'news': 'mock-key'}, token="")
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    base = f"http://127.0.0.1:{port}"
+
+    submits = [("POST", f"{base}/v1/reports",
+                {'json': {'query': f"{TOPICS[n % len(TOPICS)]} {n}", 'industry': INDUSTRIES[n % len(INDUSTRIES)]}})
+               for n in range(args.reports)]
+    started = time.perf_counter()
+    wall, latencies, responses = burst(args.clients, submits)
+    job_ids = [response.json()['id'] for response in responses]
+    print(f"API on {base}, {args.workers} job workers, {args.clients} client threads, mock providers at {mock_url}")
+    report("submit", wall, latencies)
+
+    polls = [("GET", f"{base}/v1/jobs/{job_ids[n % len(job_ids)]}", {}) for n in range(args.polls)]
+    wall, latencies, _ = burst(args.clients, polls)
+    report("poll status", wall, latencies)
+
+    pending, jobs = set(job_ids), {}
+    while pending:
+        for job_id in list(pending):
+            job = session().get(f"{base}/v1/jobs/{job_id}", timeout=60).json()
+            if job['status'] not in ('queued', 'running'):
+                jobs[job_id] = job
+                pending.discard(job_id)
+        time.sleep(0.2)
+    total = time.perf_counter() - started
+    done = [job for job in jobs.values() if job['status'] == 'done']
+    print(f"{'end to end':<16}{len(done) / total:9.2f} reports/s over {total:.1f} s "
+          f"({len(done)} done, {len(jobs) - len(done)} failed)")
+    durations = [job['finished_at'] - job['submitted_at'] for job in done]
+    if durations:
+        print(f"{'job latency':<16}{'':>15}{percentiles(durations)}")
+
+    exports = [("GET", f"{base}{job['links']['pdf']}", {}) for job in done[:args.exports]]
+    if exports:
+        for label in ("pdf cold", "pdf cached"):
+            wall, latencies, _ = burst(args.clients, exports)
+            report(label, wall, latencies)
+
+    print(session().get(f"{base}/v1/health", timeout=60).json()['jobs'])
+    server.should_exit = True
+    thread.join()
+    mock.stop()
+
+if __name__ == "__main__":
+    main()
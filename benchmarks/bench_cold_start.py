@@ -0,0 +1,82 @@
+"""
+Benchmark: dashboard cold start
+Runs the landing page in fresh interpreters via Streamlit's AppTest and
+times the first script run (module imports plus the first paint), with
+Streamlit itself already imported as it is in a server worker. `--eager`
+pre-imports the heavy and optional libraries first, which is what every
+cold start paid when marketAnalyzer.py imported them at module level.
+`-X importtime` output is summarized to show the slowest imports.
+
+Usage: python benchmarks/bench_cold_start.py [--runs 5] [--top 12]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "plotly.express", "plotly.graph_objects", "requests",
+                 "reportlab.platypus", "docx", "googletrans")
+
+CHILD = """
+import importlib, json, sys, time
+from streamlit.testing.v1 import AppTest
+eager = {eager!r}
+sys.stderr.write("--- first run ---\\n")
+start = time.perf_counter()
+for name in eager:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        pass
+at = AppTest.from_file({script!r}, default_timeout=120)
+at.run()
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'exceptions': len(at.exception), 'loaded': loaded}}))
+"""
+
+def run_child(eager, importtime=False):
+    code = CHILD.format(eager=list(HEAVY_MODULES) if eager else [],
+                        script=os.path.join(ROOT, "marketAnalyzer.py"), heavy=list(HEAVY_MODULES))
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    done = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(done.stdout.strip().splitlines()[-1]), done.stderr
+
+def slowest_imports(stderr, top):
+    """Top-level imports made during the first run, by cumulative microseconds"""
+    lines = stderr.splitlines()
+    marker = next(i for i, line in enumerate(lines) if line.startswith("--- first run"))
+    rows = []
+    for line in lines[marker:]:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # One level below the script's own imports
+        if len(name) - len(name.lstrip()) <= 3:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'median s':>10}{'min s':>9}  heavy modules loaded")
+    for label, eager in (("eager", True), ("lazy", False)):
+        results = [run_child(eager)[0] for _ in range(args.runs)]
+        times = [result['seconds'] for result in results]
+        print(f"{label:<8}{statistics.median(times):>10.3f}{min(times):>9.3f}  {', '.join(results[0]['loaded']) or '-'}"
+              + (f"  ({results[0]['exceptions']} exceptions)" if results[0]['exceptions'] else ""))
+
+    _, stderr = run_child(False, importtime=True)
+    print("\nslowest imports during the lazy first run (-X importtime):")
+    for cumulative, name in slowest_imports(stderr, args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
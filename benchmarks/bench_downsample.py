@@ -0,0 +1,54 @@
+"""
+Benchmark: trend chart payload with and without downsampling
+Builds a random-walk series (1M points by default), reduces it with LTTB
+and min/max decimation, and compares time plus the figure JSON that
+Streamlit would send to the browser.
+
+Usage: python benchmarks/bench_downsample.py [--points 1000000] [--budget 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsample import lttb_indices, minmax_indices
+
+def figure_json(x, y):
+    fig = go.Figure(go.Scatter(x=x, y=y, mode='lines'))
+    return pio.to_json(fig, validate=False)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--budget", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    x = pd.date_range("2000-01-01", periods=args.points, freq="min").to_numpy()
+    y = 1000 * np.exp(np.cumsum(rng.normal(0, 0.001, args.points)))
+
+    full_json, full_ms = timed(lambda: figure_json(x, y))
+    print(f"{'method':<10}{'points':>10}{'reduce ms':>12}{'figure ms':>12}{'JSON KB':>12}")
+    print(f"{'none':<10}{args.points:>10}{0:>12.1f}{full_ms:>12.1f}{len(full_json) / 1024:>12.0f}")
+
+    for name, reduce in (("lttb", lambda: lttb_indices(x, y, args.budget)),
+                         ("minmax", lambda: minmax_indices(y, args.budget))):
+        indices, reduce_ms = timed(reduce)
+        spec, figure_ms = timed(lambda: figure_json(x[indices], y[indices]))
+        print(f"{name:<10}{len(indices):>10}{reduce_ms:>12.1f}{figure_ms:>12.1f}{len(spec) / 1024:>12.0f}")
+
+if __name__ == "__main__":
+    main()
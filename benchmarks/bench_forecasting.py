@@ -0,0 +1,58 @@
+"""
+Benchmark: batch forecasting throughput
+Fits Holt-Winters (grid search) and AR models to 10k synthetic monthly
+series in one call each, then repeats the Holt-Winters call against a warm
+parameter cache.
+
+Usage: python benchmarks/bench_forecasting.py [--series 10000] [--length 48]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forecasting import FitCache, forecast
+
+def make_series(count, length, rng):
+    t = np.arange(length)
+    trend = rng.normal(1.0, 0.5, (count, 1)) * t
+    season = rng.uniform(0, 10, (count, 1)) * np.sin(2 * np.pi * t / 12 + rng.uniform(0, 6, (count, 1)))
+    noise = np.cumsum(rng.normal(0, 1, (count, length)), axis=1)
+    return 100 + trend + season + noise
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--series", type=int, default=10000)
+    parser.add_argument("--length", type=int, default=48)
+    parser.add_argument("--horizon", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    Y = make_series(args.series, args.length, rng)
+    history, actual = Y[:, :-args.horizon], Y[:, -args.horizon:]
+    cache = FitCache(max_entries=args.series)
+
+    cases = [
+        ("holt-winters (seasonal)", lambda: forecast(history, args.horizon, season_length=12, cache=cache)),
+        ("holt-winters (cached)", lambda: forecast(history, args.horizon, season_length=12, cache=cache)),
+        ("AR(3) on differences", lambda: forecast(history, args.horizon, model='ar', order=3)),
+    ]
+    print(f"{len(Y)} series x {history.shape[1]} observations, horizon {args.horizon}")
+    print(f"{'model':<26}{'seconds':>9}{'series/s':>11}{'95% PI coverage':>17}")
+    for name, fn in cases:
+        result, seconds = timed(fn)
+        coverage = ((actual >= result.lower) & (actual <= result.upper)).mean()
+        print(f"{name:<26}{seconds:>9.2f}{len(Y) / seconds:>11.0f}{coverage:>17.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: per-request latency with and without connection pooling
+Starts a local keep-alive stub server and compares bare `requests.get`
+(new TCP connection per call, as get_news_data used to do) with the shared
+pooled HttpClient. Against real HTTPS providers the gap is larger, since
+every unpooled call also pays a TLS handshake.
+
+Usage: python benchmarks/bench_http_pool.py [--requests 500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from http_client import HttpClient
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    flaky_remaining = 0
+
+    def do_GET(self):
+        if self.path.startswith("/flaky") and StubHandler.flaky_remaining > 0:
+            StubHandler.flaky_remaining -= 1
+            self._reply(429, {"status": "error", "message": "rate limited"}, {"Retry-After": "0.05"})
+            return
+        self._reply(200, {"status": "ok", "articles": []})
+
+    def _reply(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def measure(get, url, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = get(url, timeout=5)
+        response.json()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def summarize(label, latencies):
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"{label:<22} mean {statistics.mean(latencies) * 1e3:7.3f} ms   "
+          f"p50 {ordered[len(ordered) // 2] * 1e3:7.3f} ms   p99 {p99 * 1e3:7.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server()
+    client = HttpClient(http2=False)
+    try:
+        url = f"{base_url}/v2/everything"
+        summarize("unpooled requests.get", measure(requests.get, url, args.requests))
+        summarize("pooled HttpClient", measure(client.get, url, args.requests))
+
+        # Retry path: two 429s with Retry-After, then success
+        StubHandler.flaky_remaining = 2
+        start = time.perf_counter()
+        response = client.get(f"{base_url}/flaky", timeout=5)
+        print(f"retry after 2x429     status {response.status_code} in {(time.perf_counter() - start) * 1e3:.0f} ms")
+    finally:
+        client.close()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Load test: research pipelines against the mock providers
+Starts mock_providers.MockProviderServer in-process (or targets a running
+one with --base-url), points the agents at it through GROQ_BASE_URL /
+NEWSAPI_BASE_URL and runs full research pipelines from a pool of
+concurrent workers. Reports throughput, end-to-end and per-stage latency
+percentiles, degraded runs (fallback insights or news) and what the
+providers answered.
+
+Usage: python benchmarks/bench_pipeline_load.py [--runs 200] [--concurrency 16] [--stream]
+                                               [--groq-latency lognormal:400:0.5] [--groq-429-rate 0.05]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents
+from mock_providers import MockProviderServer, add_profile_arguments, profile_from_args
+from rate_limit import BATCH
+
+INDUSTRIES = ["Technology", "Healthcare", "Finance", "Retail", "Manufacturing"]
+TOPICS = ["AI chips", "telehealth", "digital payments", "grocery delivery", "industrial robots",
+          "cloud security", "wearables", "battery storage"]
+API_KEYS = {'groq': 'mock-key', 'news': 'mock-key'}
+STAGES = ('scrape', 'sentiment', 'insights', 'analysis', 'report')
+
+def percentiles(values):
+    if not values:
+        return "n/a"
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]) * 1000
+    return f"p50 {p50:8.0f}  p90 {p90:8.0f}  p99 {p99:8.0f}  max {max(values) * 1000:8.0f} ms"
+
+def run_once(query, industry, stream):
+    warnings = []
+    context = agents.AgentContext(api_keys=API_KEYS, warn=warnings.append, priority=BATCH)
+    pipeline = agents.research_pipeline(
+        query, agents.ScraperAgent(context), agents.AnalyzerAgent(context), agents.ReporterAgent(context),
+        on_insight=(lambda insight: None) if stream else None, industry=industry
+    )
+    start = time.perf_counter()
+    result = pipeline.run()
+    return time.perf_counter() - start, result, warnings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--distinct-queries", type=int, default=None,
+                        help="distinct research queries (default: one per run, so the LLM cache never hits)")
+    parser.add_argument("--stream", action="store_true", help="stream Groq completions (SSE)")
+    parser.add_argument("--base-url", help="use an already running mock_providers.py instead of starting one")
+    parser.add_argument("--groq-rpm", type=int, default=0, help="client-side Groq requests/min (0 = unlimited)")
+    parser.add_argument("--news-rpm", type=int, default=0, help="client-side NewsAPI requests/min (0 = unlimited)")
+    parser.add_argument("--token-ms", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=1)
+    add_profile_arguments(parser, "groq", "lognormal:400:0.5")
+    add_profile_arguments(parser, "news", "lognormal:150:0.4")
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        server = MockProviderServer(
+            groq=profile_from_args(args, "groq", token_ms=args.token_ms),
+            news=profile_from_args(args, "news"),
+            seed=args.seed
+        )
+        base_url = server.start()
+    os.environ["GROQ_BASE_URL"] = base_url
+    os.environ["NEWSAPI_BASE_URL"] = base_url
+    # Fresh stores so the news cursor and caches start cold
+    os.environ.setdefault("MARKET_ANALYZER_CACHE_DIR", tempfile.mkdtemp(prefix="load-test-"))
+    os.environ.setdefault("HTTP_POOL_MAXSIZE", str(max(20, args.concurrency)))
+
+    scheduler = agents.get_scheduler()
+    scheduler.configure('groq', args.groq_rpm)
+    scheduler.configure('news', args.news_rpm)
+    for industry in INDUSTRIES:
+        agents.get_timeseries_store().ensure_sample(industry)
+
+    distinct = args.distinct_queries or args.runs
+    queries = [f"{TOPICS[i % len(TOPICS)]} {i // len(TOPICS)}" for i in range(distinct)]
+    jobs = [(queries[n % distinct], INDUSTRIES[n % len(INDUSTRIES)]) for n in range(args.runs)]
+
+    latencies, stage_times, degraded, failures = [], {stage: [] for stage in STAGES}, 0, []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(run_once, query, industry, args.stream) for query, industry in jobs]
+        for future in futures:
+            try:
+                seconds, result, warnings = future.result()
+            except Exception as e:
+                failures.append(repr(e))
+                continue
+            latencies.append(seconds)
+            degraded += bool(warnings)
+            for stage in STAGES:
+                stage_times[stage].append(result.timings[stage]['duration'])
+    wall = time.perf_counter() - start
+
+    print(f"{args.runs} pipelines, {args.concurrency} concurrent, {'streaming' if args.stream else 'plain'} Groq, "
+          f"mock at {base_url}")
+    print(f"throughput  {len(latencies) / wall:8.2f} pipelines/s over {wall:.1f} s")
+    print(f"{'pipeline':<12}{percentiles(latencies)}")
+    for stage in STAGES:
+        print(f"{stage:<12}{percentiles(stage_times[stage])}")
+    print(f"degraded runs (fallback answers) {degraded}, failed runs {len(failures)}")
+    for failure in sorted(set(failures))[:5]:
+        print(f"  {failure}")
+    if server is not None:
+        for provider, outcomes in server.stats().items():
+            print(f"{provider:<6} " + ", ".join(f"{outcome} {count}" for outcome, count in outcomes.items()))
+        server.stop()
+
+if __name__ == "__main__":
+    main()
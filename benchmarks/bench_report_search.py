@@ -0,0 +1,79 @@
+"""
+Benchmark: full-text report search latency vs. store size
+Fills a temporary report store with synthetic reports, then times ranked
+searches, search + date filter and the plain newest-first page.
+
+Usage: python benchmarks/bench_report_search.py [--reports 20000] [--repeat 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_store import ReportStore
+
+TOPICS = ["electric vehicles", "cloud security", "telehealth", "fintech lending", "retail analytics",
+          "semiconductors", "renewable energy", "edtech platforms", "supply chain", "biotech"]
+REGIONS = ["Europe", "India", "North America", "Southeast Asia", "Latin America"]
+
+def make_report(i, rng):
+    topic, region = rng.choice(TOPICS), rng.choice(REGIONS)
+    generated_at = datetime(2025, 1, 1) + timedelta(minutes=37 * i)
+    return {
+        'title': f"Market Research Report - {generated_at.strftime('%Y-%m-%d')}",
+        'executive_summary': f"Analysis of {topic} demand in {region} with AI-driven insights.",
+        'market_data': {
+            'query': f"{topic} in {region}",
+            'news': [{'title': f"{topic.title()} funding rises in {region}"}]
+        },
+        'analysis': {
+            'key_insights': [f"{topic} adoption accelerating", "Pricing pressure from new entrants"],
+            'risk_level': rng.choice(['Low', 'Medium', 'High']),
+            'growth_potential': rng.random()
+        },
+        'recommendations': ["Invest in emerging technologies", f"Partner locally in {region}"],
+        'generated_at': generated_at.isoformat()
+    }
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ReportStore(os.path.join(tmp, "reports.sqlite3"))
+        start = time.perf_counter()
+        for i in range(args.reports):
+            store.add(make_report(i, rng), industry=rng.choice(["Technology", "Healthcare", "Finance"]))
+        print(f"Inserted {args.reports} reports in {time.perf_counter() - start:.1f} s")
+
+        day = (datetime(2025, 1, 1) + timedelta(minutes=37 * args.reports // 2)).date()
+        cases = [
+            ("newest page", lambda: store.page(limit=10)),
+            ("search 'telehealth india'", lambda: store.search("telehealth india", limit=10)),
+            ("search 'semi' (prefix)", lambda: store.search("semi", limit=10)),
+            ("search + industry", lambda: store.search("cloud", limit=10, industry="Finance")),
+            ("search + one day", lambda: store.search("energy", limit=10, date_from=day, date_to=day)),
+            ("count for search", lambda: store.count(text="supply chain")),
+        ]
+        print(f"{'case':<28}{'ms/op':>10}")
+        for name, fn in cases:
+            print(f"{name:<28}{timed(fn, args.repeat):>10.2f}")
+        store.close()
+
+if __name__ == "__main__":
+    main()
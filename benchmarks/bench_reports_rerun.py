@@ -0,0 +1,80 @@
+"""
+Benchmark: reports page rerun latency vs. number of reports
+Compares the old eager behaviour (render every PDF and DOCX on each rerun)
+with lazy exports (hash each report, render only the one that is clicked).
+
+Usage: python benchmarks/bench_reports_rerun.py [--counts 10 50 100 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exports import ExportCache, RENDERERS, export_available, report_hash
+
+def make_report(i):
+    return {
+        'title': f"Market Research Report #{i} - {datetime.now().strftime('%Y-%m-%d')}",
+        'executive_summary': "This report provides comprehensive market analysis with AI-driven insights.",
+        'analysis': {
+            'key_insights': [
+                f"Insight {i}: strong growth potential in emerging markets",
+                "Increasing adoption of AI technologies",
+                "Competitive landscape is evolving rapidly"
+            ],
+            'risk_level': 'Medium',
+            'growth_potential': 0.42
+        },
+        'recommendations': [
+            "Invest in emerging technologies",
+            "Focus on customer experience",
+            "Expand into new markets"
+        ],
+        'generated_at': datetime.now().isoformat()
+    }
+
+def eager_rerun(reports, formats):
+    for report in reports:
+        for fmt in formats:
+            RENDERERS[fmt](report)
+
+def lazy_rerun(reports, cache, formats, clicked=0):
+    # Each rerun only computes cache keys; one download click renders one document
+    for report in reports:
+        report_hash(report)
+    cache.get_or_render(reports[clicked], "English", formats[0])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    formats = [fmt for fmt in RENDERERS if export_available(fmt)]
+    if not formats:
+        sys.exit("Neither reportlab nor python-docx is installed; nothing to benchmark.")
+
+    print(f"formats: {', '.join(formats)}")
+    print(f"{'reports':>8} {'eager ms':>12} {'lazy cold ms':>14} {'lazy warm ms':>14}")
+    for count in args.counts:
+        reports = [make_report(i) for i in range(count)]
+
+        eager = min(_timed(eager_rerun, reports, formats) for _ in range(args.repeat))
+
+        cache = ExportCache()
+        cold = _timed(lazy_rerun, reports, cache, formats)
+        warm = min(_timed(lazy_rerun, reports, cache, formats) for _ in range(args.repeat))
+
+        print(f"{count:>8} {eager * 1000:>12.1f} {cold * 1000:>14.1f} {warm * 1000:>14.2f}")
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    main()
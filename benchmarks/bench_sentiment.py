@@ -0,0 +1,88 @@
+"""
+Benchmark: news sentiment scoring throughput
+Scores synthetic headline + description pairs with the batch scorer and
+with a per-article Python loop over the same lexicon, checks that both
+agree, and reports articles per second on one core.
+
+Usage: python benchmarks/bench_sentiment.py [--articles 20000] [--batch 1000]
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sentiment
+from sentiment import article_text, score_articles
+
+FILLER = ("the company said quarter revenue market analysts investors shares sector "
+          "new report year chief executive global customers products update plans").split()
+
+def make_articles(count, rng):
+    vocabulary = list(sentiment.LEXICON) + list(sentiment.BOOSTERS) + list(sentiment.NEGATIONS[:5]) + ['but']
+    articles = []
+    for _ in range(count):
+        def sentence(length):
+            words = [rng.choice(vocabulary) if rng.random() < 0.25 else rng.choice(FILLER) for _ in range(length)]
+            return " ".join(words).capitalize() + ("!" if rng.random() < 0.1 else "")
+        articles.append({'title': sentence(int(rng.integers(6, 14))),
+                         'description': sentence(int(rng.integers(15, 35)))})
+    return articles
+
+def score_loop(text):
+    """Reference: the same rules applied token by token"""
+    tokens = re.findall(r"!|[a-z]+(?:[-'][a-z]+)*", text.lower())
+    valences = []
+    for i, token in enumerate(tokens):
+        valence = sentiment.LEXICON.get(token, 0.0)
+        if valence:
+            negated = False
+            for k, decay in enumerate(sentiment.BOOSTER_DECAY, start=1):
+                if i - k < 0:
+                    break
+                valence += math.copysign(1.0, valence) * sentiment.BOOSTERS.get(tokens[i - k], 0.0) * decay
+                negated = negated or tokens[i - k] in sentiment.NEGATIONS
+            if negated:
+                valence *= sentiment.NEGATION_SCALAR
+        valences.append(valence)
+    if 'but' in tokens:
+        last_but = len(tokens) - 1 - tokens[::-1].index('but')
+        first_but = tokens.index('but')
+        valences = [v * sentiment.BUT_AFTER if i > first_but else v * sentiment.BUT_BEFORE if i < last_but else v
+                    for i, v in enumerate(valences)]
+    total = sum(valences)
+    if total:
+        total += math.copysign(min(tokens.count('!'), sentiment.MAX_EXCLAMATIONS) * sentiment.EXCLAMATION_BOOST, total)
+    return total / math.sqrt(total * total + sentiment.ALPHA)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles, np.random.default_rng(11))
+    sentiment.get_lexicon()
+
+    start = time.perf_counter()
+    batched = np.concatenate([score_articles(articles[i:i + args.batch])
+                              for i in range(0, len(articles), args.batch)])
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    looped = np.array([score_loop(article_text(article)) for article in articles])
+    loop_seconds = time.perf_counter() - start
+
+    print(f"{len(articles)} articles, batches of {args.batch}; max |difference| {np.abs(batched - looped).max():.2e}")
+    print(f"{'scorer':<16}{'seconds':>9}{'articles/s':>13}")
+    print(f"{'batch':<16}{batch_seconds:>9.2f}{len(articles) / batch_seconds:>13.0f}")
+    print(f"{'python loop':<16}{loop_seconds:>9.2f}{len(articles) / loop_seconds:>13.0f}")
+
+if __name__ == "__main__":
+    main()
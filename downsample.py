@@ -0,0 +1,89 @@
+"""
+Series downsampling for charts
+Largest-Triangle-Three-Buckets (LTTB) and min/max decimation. Both return
+indices of the points to keep, so any columns of the original rows can be
+plotted. Long series are reduced to roughly the chart's pixel budget before
+they are sent to the browser.
+"""
+
+import os
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+DEFAULT_POINT_BUDGET = 1000
+
+def point_budget():
+    """Points per trace worth sending; about one per horizontal pixel"""
+    return int(os.environ.get("CHART_POINT_BUDGET", DEFAULT_POINT_BUDGET))
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype('datetime64[ns]').astype(np.int64)
+    return values.astype(np.float64)
+
+def lttb_indices(x, y, threshold):
+    """Indices of `threshold` points that best preserve the series' visual shape"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+
+    # First and last points are always kept; the rest is split into threshold - 2 buckets
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Third vertex: average of the next bucket (or the last point)
+        if i + 1 < threshold - 2:
+            cx, cy = mean_x[i + 1], mean_y[i + 1]
+        else:
+            cx, cy = x[-1], y[-1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def minmax_indices(y, threshold):
+    """Indices of each bucket's minimum and maximum; keeps every spike"""
+    n = len(y)
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return np.arange(n)
+    y = _as_float(y)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(buckets, size)
+    valid = ~np.isnan(rows).all(axis=1)
+    offsets = np.arange(buckets)[valid] * size
+    lows = np.nanargmin(rows[valid], axis=1) + offsets
+    highs = np.nanargmax(rows[valid], axis=1) + offsets
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+def downsample_frame(df, x, y, threshold=None, by=None, method='lttb'):
+    """Rows of `df` reduced to `threshold` points per `by` group (e.g. per ticker)"""
+    threshold = threshold or point_budget()
+    groups = df.groupby(by, sort=False) if by else [(None, df)]
+    kept = []
+    for _, group in groups:
+        if method == 'minmax':
+            indices = minmax_indices(group[y].to_numpy(), threshold)
+        else:
+            indices = lttb_indices(group[x].to_numpy(), group[y].to_numpy(), threshold)
+        kept.append(group.iloc[indices])
+    if not kept:
+        return df
+    return pd.concat(kept) if len(kept) > 1 else kept[0]
@@ -0,0 +1,208 @@
+"""
+Report export rendering and caching
+Renders PDF/Word documents only when a download is requested and keeps
+the bytes in a content-addressed LRU cache with a byte budget.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from lazy_imports import module_available
+
+# Optional dependencies are probed here and imported by the renderers on first use
+REPORTLAB_AVAILABLE = module_available("reportlab")
+DOCX_AVAILABLE = module_available("docx")
+
+EXPORT_FORMATS = {
+    'pdf': {
+        'extension': 'pdf',
+        'mime': 'application/pdf'
+    },
+    'docx': {
+        'extension': 'docx',
+        'mime': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+    }
+}
+
+# Default byte budget for rendered exports, overridable via EXPORT_CACHE_MAX_MB
+DEFAULT_EXPORT_CACHE_MB = 64
+
+def report_hash(report):
+    """Content hash of the report fields that end up in an export"""
+    analysis = report.get("analysis", {})
+    exported = {
+        'title': report.get("title", ""),
+        'executive_summary': report.get("executive_summary", ""),
+        'key_insights': analysis.get("key_insights", []),
+        'recommendations': report.get("recommendations", []),
+        'generated_at': report.get("generated_at", ""),
+        'risk_level': analysis.get("risk_level"),
+        'growth_potential': analysis.get("growth_potential")
+    }
+    payload = json.dumps(exported, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def render_pdf(report):
+    """Render a report to PDF bytes"""
+    if not REPORTLAB_AVAILABLE:
+        raise RuntimeError("PDF generation not available. Please install reportlab.")
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer)
+    styles = getSampleStyleSheet()
+    content = []
+
+    content.append(Paragraph(report.get("title", "Market Research Report"), styles['Heading1']))
+    content.append(Spacer(1, 12))
+    content.append(Paragraph("Executive Summary", styles['Heading2']))
+    content.append(Paragraph(report.get("executive_summary", ""), styles['Normal']))
+    content.append(Spacer(1, 12))
+
+    content.append(Paragraph("Key Insights", styles['Heading2']))
+    if "analysis" in report and "key_insights" in report["analysis"]:
+        for insight in report["analysis"]["key_insights"]:
+            content.append(Paragraph(f"• {insight}", styles['Normal']))
+    content.append(Spacer(1, 12))
+
+    content.append(Paragraph("Recommendations", styles['Heading2']))
+    if "recommendations" in report:
+        for rec in report["recommendations"]:
+            content.append(Paragraph(f"• {rec}", styles['Normal']))
+    content.append(Spacer(1, 12))
+
+    content.append(Paragraph(f"Generated: {report.get('generated_at', '')}", styles['Normal']))
+    if "analysis" in report:
+        content.append(Paragraph(f"Risk Level: {report['analysis'].get('risk_level', 'N/A')}", styles['Normal']))
+        content.append(Paragraph(f"Growth Potential: {report['analysis'].get('growth_potential', 0):.1%}", styles['Normal']))
+
+    doc.build(content)
+    return buffer.getvalue()
+
+def render_word(report):
+    """Render a report to Word (.docx) bytes"""
+    if not DOCX_AVAILABLE:
+        raise RuntimeError("Word generation not available. Please install python-docx.")
+    from docx import Document
+
+    buffer = BytesIO()
+    doc = Document()
+
+    doc.add_heading(report.get("title", "Market Research Report"), 0)
+    doc.add_heading("Executive Summary", level=1)
+    doc.add_paragraph(report.get("executive_summary", ""))
+
+    doc.add_heading("Key Insights", level=1)
+    if "analysis" in report and "key_insights" in report["analysis"]:
+        for insight in report["analysis"]["key_insights"]:
+            doc.add_paragraph(f"• {insight}")
+
+    doc.add_heading("Recommendations", level=1)
+    if "recommendations" in report:
+        for rec in report["recommendations"]:
+            doc.add_paragraph(f"• {rec}")
+
+    doc.add_paragraph(f"Generated: {report.get('generated_at', '')}")
+    if "analysis" in report:
+        doc.add_paragraph(f"Risk Level: {report['analysis'].get('risk_level', 'N/A')}")
+        doc.add_paragraph(f"Growth Potential: {report['analysis'].get('growth_potential', 0):.1%}")
+
+    doc.save(buffer)
+    return buffer.getvalue()
+
+RENDERERS = {
+    'pdf': render_pdf,
+    'docx': render_word
+}
+
+def export_available(fmt):
+    """Check whether the library behind an export format is installed"""
+    if fmt == 'pdf':
+        return REPORTLAB_AVAILABLE
+    if fmt == 'docx':
+        return DOCX_AVAILABLE
+    return False
+
+class ExportCache:
+    """Thread-safe LRU cache of rendered export bytes bounded by total size"""
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_mb = float(os.environ.get("EXPORT_CACHE_MAX_MB", DEFAULT_EXPORT_CACHE_MB))
+            max_bytes = int(max_mb * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content_hash, language, fmt):
+        return (content_hash, language, fmt)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        size = len(data)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= len(self._entries.pop(key))
+            # Documents larger than the whole budget are served but never stored
+            if size > self.max_bytes:
+                return
+            self._entries[key] = data
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, report, language, fmt, prepare=None):
+        """Return cached export bytes, rendering them on a miss.
+
+        `prepare` is an optional callable applied to the report before rendering
+        (e.g. translation), so it is skipped entirely on a cache hit.
+        """
+        key = self.make_key(report_hash(report), language, fmt)
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        source = prepare(report) if prepare else report
+        data = RENDERERS[fmt](source)
+        self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,64 @@
+"""
+Plotly figure cache
+Serialized figure JSON keyed by chart name and the version of the data it
+was drawn from, so reruns reuse figures until the data changes.
+Rehydrating trusted JSON skips plotly's validation, which is most of the
+cost of building a figure.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from lazy_imports import lazy_import
+
+go = lazy_import("plotly.graph_objects")
+
+DEFAULT_MAX_ENTRIES = 256
+
+class FigureCache:
+    """Thread-safe LRU of figure JSON"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or int(os.environ.get("FIGURE_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, name, version, build):
+        """Figure for (name, version), calling `build()` only on a miss.
+
+        Every call returns a fresh Figure, so callers may modify it freely.
+        """
+        key = (name, version)
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if spec is None:
+            spec = build().to_json()
+            with self._lock:
+                self._entries[key] = spec
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        # The JSON came from plotly itself, so validation can be skipped
+        return go.Figure(json.loads(spec), _validate=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(len(spec) for spec in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,273 @@
+"""
+Forecasting engine
+Additive Holt-Winters (ETS(A,A,A), or ETS(A,A,N) without a season) and
+AR(p) on first differences, fitted to many series at once. Every series
+is a row of a 2-D array, so fitting and forecasting are NumPy operations
+across rows. Holt-Winters smoothing parameters are picked by a grid search
+that runs every candidate for every series in the same pass. Fitted
+parameters are cached by series content.
+"""
+
+import hashlib
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from statistics import NormalDist
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+ALPHAS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9)
+BETAS = (0.0, 0.01, 0.05, 0.1, 0.2)
+GAMMAS = (0.0, 0.05, 0.1, 0.3)
+
+# Upper bound on series x candidates evaluated together (keeps memory flat for 10k+ series)
+GRID_CHUNK_ROWS = 200_000
+DEFAULT_CACHE_ENTRIES = 50_000
+
+class Forecast:
+    """Point forecasts and prediction intervals, one row per input series"""
+
+    def __init__(self, mean, lower, upper, level, model, params):
+        self.mean = mean
+        self.lower = lower
+        self.upper = upper
+        self.level = level
+        self.model = model
+        self.params = params
+
+def _z(level):
+    return NormalDist().inv_cdf(0.5 + level / 2)
+
+def _grid(seasonal):
+    gammas = GAMMAS if seasonal else (0.0,)
+    # ETS admissibility: beta <= alpha and gamma <= 1 - alpha
+    return np.array([
+        (alpha, beta, gamma)
+        for alpha, beta, gamma in itertools.product(ALPHAS, BETAS, gammas)
+        if beta <= alpha and gamma <= 1 - alpha
+    ])
+
+def _initial_states(Y, m):
+    """Classical starting level, trend and seasonal indices"""
+    if m:
+        first, second = Y[:, :m].mean(axis=1), Y[:, m:2 * m].mean(axis=1)
+        trend = (second - first) / m
+        # The first season's mean sits mid-season; step back to just before t=0
+        level = first - trend * (m + 1) / 2
+        season = Y[:, :m] - (level[:, None] + trend[:, None] * np.arange(1, m + 1))
+        return level, trend, season
+    trend = Y[:, 1] - Y[:, 0]
+    return Y[:, 0] - trend, trend, np.zeros((len(Y), 1))
+
+def _smooth(Y, alpha, beta, gamma, m):
+    """Run the error-correction recursions for each row; returns SSE and final states"""
+    level, trend, season = _initial_states(Y, m)
+    season = season.copy()
+    period = m or 1
+    sse = np.zeros(len(Y))
+    rows = np.arange(len(Y))
+    for t in range(Y.shape[1]):
+        s = t % period
+        error = Y[:, t] - (level + trend + season[rows, s])
+        level = level + trend + alpha * error
+        trend = trend + beta * error
+        season[rows, s] = season[rows, s] + gamma * error
+        sse += error * error
+    return sse, level, trend, season
+
+def fit_holt_winters(Y, season_length=None):
+    """Grid-searched additive Holt-Winters for each row of Y (n_series, n_obs)"""
+    Y = np.asarray(Y, dtype=np.float64)
+    n, T = Y.shape
+    m = season_length if season_length and T >= 2 * season_length else 0
+    grid = _grid(bool(m))
+    G = len(grid)
+
+    best_sse = np.full(n, np.inf)
+    best = {
+        'alpha': np.zeros(n), 'beta': np.zeros(n), 'gamma': np.zeros(n),
+        'level': np.zeros(n), 'trend': np.zeros(n), 'season': np.zeros((n, max(m, 1)))
+    }
+    chunk = max(1, GRID_CHUNK_ROWS // G)
+    for start in range(0, n, chunk):
+        block = Y[start:start + chunk]
+        rows = len(block)
+        # Every (series, candidate) pair becomes one row of the recursion
+        repeated = np.repeat(block, G, axis=0)
+        alpha, beta, gamma = (np.tile(grid[:, i], rows) for i in range(3))
+        sse, level, trend, season = _smooth(repeated, alpha, beta, gamma, m)
+        pick = sse.reshape(rows, G).argmin(axis=1)
+        chosen = np.arange(rows) * G + pick
+        target = slice(start, start + rows)
+        best_sse[target] = sse[chosen]
+        best['alpha'][target], best['beta'][target], best['gamma'][target] = alpha[chosen], beta[chosen], gamma[chosen]
+        best['level'][target], best['trend'][target] = level[chosen], trend[chosen]
+        best['season'][target] = season[chosen]
+
+    dof = max(T - (3 + m), 1)
+    best['sigma'] = np.sqrt(best_sse / dof)
+    best['season_length'] = np.full(n, m)
+    best['n_obs'] = np.full(n, T)
+    return best
+
+def forecast_holt_winters(params, horizon, level=0.95):
+    n = len(params['alpha'])
+    m = int(params['season_length'][0]) if n else 0
+    h = np.arange(1, horizon + 1)
+    mean = params['level'][:, None] + h[None, :] * params['trend'][:, None]
+    if m:
+        positions = (params['n_obs'][:, None] + h[None, :] - 1) % m
+        mean = mean + np.take_along_axis(params['season'], positions, axis=1)
+
+    # Var(h) = sigma^2 * (1 + sum_{j<h} c_j^2), c_j = alpha + beta*j + gamma*[j % m == 0]
+    j = np.arange(1, horizon)
+    c = params['alpha'][:, None] + params['beta'][:, None] * j[None, :]
+    if m:
+        c = c + params['gamma'][:, None] * (j % m == 0)[None, :]
+    variance = np.concatenate([np.zeros((n, 1)), np.cumsum(c * c, axis=1)], axis=1) + 1
+    spread = _z(level) * params['sigma'][:, None] * np.sqrt(variance)
+    return Forecast(mean, mean - spread, mean + spread, level, 'holt_winters', params)
+
+def fit_ar(Y, order=3):
+    """AR(order) with intercept on first differences, least squares per row"""
+    Y = np.asarray(Y, dtype=np.float64)
+    D = np.diff(Y, axis=1)
+    n, T = D.shape
+    order = max(1, min(order, T // 2 - 1))
+    # Design matrices (n, T - order, order + 1): intercept plus lags 1..order
+    lags = np.stack([D[:, order - k:T - k] for k in range(1, order + 1)], axis=2)
+    X = np.concatenate([np.ones((n, T - order, 1)), lags], axis=2)
+    target = D[:, order:]
+    XtX = np.einsum('nti,ntj->nij', X, X) + 1e-8 * np.eye(order + 1)
+    Xty = np.einsum('nti,nt->ni', X, target)
+    coef = np.linalg.solve(XtX, Xty[..., None])[..., 0]
+    residuals = target - np.einsum('nti,ni->nt', X, coef)
+    dof = max(T - order - (order + 1), 1)
+    return {
+        'intercept': coef[:, 0],
+        'phi': coef[:, 1:],
+        'sigma': np.sqrt((residuals ** 2).sum(axis=1) / dof),
+        'last_value': Y[:, -1],
+        'recent_diffs': D[:, -order:][:, ::-1]
+    }
+
+def forecast_ar(params, horizon, level=0.95):
+    phi = params['phi']
+    n, order = phi.shape
+    history = params['recent_diffs'].copy()
+    diffs = np.empty((n, horizon))
+    for step in range(horizon):
+        diffs[:, step] = params['intercept'] + (phi * history).sum(axis=1)
+        history = np.concatenate([diffs[:, step:step + 1], history[:, :-1]], axis=1)
+    mean = params['last_value'][:, None] + np.cumsum(diffs, axis=1)
+
+    # psi weights of the differenced AR process, accumulated for the integrated level
+    psi = np.zeros((n, horizon))
+    psi[:, 0] = 1.0
+    for j in range(1, horizon):
+        k = min(j, order)
+        psi[:, j] = (phi[:, :k] * psi[:, j - 1::-1][:, :k]).sum(axis=1)
+    level_psi = np.cumsum(psi, axis=1)
+    spread = _z(level) * params['sigma'][:, None] * np.sqrt(np.cumsum(level_psi ** 2, axis=1))
+    return Forecast(mean, mean - spread, mean + spread, level, 'ar', params)
+
+MODELS = {
+    'holt_winters': (fit_holt_winters, forecast_holt_winters),
+    'ar': (fit_ar, forecast_ar)
+}
+
+class FitCache:
+    """LRU of fitted parameters per series, keyed by model, options and series content"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or int(os.environ.get("FORECAST_CACHE_ENTRIES", DEFAULT_CACHE_ENTRIES))
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def keys(model, options, Y):
+        prefix = f"{model}:{sorted(options.items())}".encode('utf-8')
+        return [hashlib.sha1(prefix + row.tobytes()).hexdigest() for row in Y]
+
+    def get(self, key):
+        with self._lock:
+            params = self._entries.get(key)
+            if params is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return params
+
+    def put(self, key, params):
+        with self._lock:
+            self._entries[key] = params
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+def _fit_cached(model, Y, options, cache):
+    fit = MODELS[model][0]
+    if cache is None:
+        return fit(Y, **options)
+    keys = cache.keys(model, options, Y)
+    rows = [cache.get(key) for key in keys]
+    missing = [i for i, row in enumerate(rows) if row is None]
+    if missing:
+        # Only series that were never fitted (or changed) are fitted, together
+        fitted = fit(Y[missing], **options)
+        for position, i in enumerate(missing):
+            rows[i] = {name: values[position] for name, values in fitted.items()}
+            cache.put(keys[i], rows[i])
+    return {name: np.stack([row[name] for row in rows]) for name in rows[0]}
+
+def forecast(Y, horizon, model='holt_winters', level=0.95, cache=None, **options):
+    """Fit `model` to every row of Y and forecast `horizon` steps ahead"""
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    params = _fit_cached(model, Y, options, cache)
+    return MODELS[model][1](params, horizon, level)
+
+def forecast_series(series, horizon, freq, model='holt_winters', level=0.95, cache=None, **options):
+    """Forecast several pandas Series (e.g. one index per industry) in one fit.
+
+    Series are aligned on their common trailing length. Returns
+    {name: DataFrame(timestamp, mean, lower, upper)}.
+    """
+    length = min(len(values) for values in series.values())
+    names = list(series)
+    result = forecast(
+        np.stack([series[name].to_numpy()[-length:] for name in names]),
+        horizon, model, level, cache, **options
+    )
+    frames = {}
+    for i, name in enumerate(names):
+        last = series[name].index[-1]
+        frames[name] = pd.DataFrame({
+            'timestamp': pd.date_range(last, periods=horizon + 1, freq=freq)[1:],
+            'mean': result.mean[i],
+            'lower': result.lower[i],
+            'upper': result.upper[i]
+        })
+    return frames
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_fit_cache():
+    """Process-wide cache of fitted forecast parameters"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FitCache()
+    return _cache
@@ -0,0 +1,216 @@
+"""
+Shared HTTP client
+One process-wide client for the Groq and NewsAPI calls: per-host
+keep-alive connection pools, optional HTTP/2 (via httpx + h2) and retries
+with jittered exponential backoff that honour Retry-After.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from lazy_imports import lazy_import
+
+requests = lazy_import("requests")
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+# httpx exception names present across versions: 0.13 (pinned by googletrans) has no
+# TimeoutException / TransportError base classes, newer releases have both
+HTTPX_TIMEOUTS = ('TimeoutException', 'ConnectTimeout', 'ReadTimeout', 'WriteTimeout', 'PoolTimeout')
+HTTPX_TRANSPORT_ERRORS = ('TransportError', 'NetworkError', 'ProtocolError', 'ProxyError')
+
+def _httpx_errors(httpx, names):
+    return tuple(getattr(httpx, name) for name in names if isinstance(getattr(httpx, name, None), type))
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+class HttpClient:
+    """Pooled keep-alive client with retry and backoff"""
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, max_retry_after=None, http2=None):
+        self.pool_connections = pool_connections or _env_int("HTTP_POOL_CONNECTIONS", 10)
+        self.pool_maxsize = pool_maxsize or _env_int("HTTP_POOL_MAXSIZE", 20)
+        self.max_retries = max_retries if max_retries is not None else _env_int("HTTP_MAX_RETRIES", 3)
+        self.backoff_base = backoff_base if backoff_base is not None else _env_float("HTTP_BACKOFF_BASE", 0.5)
+        self.backoff_max = backoff_max if backoff_max is not None else _env_float("HTTP_BACKOFF_MAX", 8.0)
+        # Never sleep longer than this for a single Retry-After, whatever the server asks
+        self.max_retry_after = max_retry_after if max_retry_after is not None else _env_float("HTTP_MAX_RETRY_AFTER", 60.0)
+        if http2 is None:
+            http2 = os.environ.get("HTTP2_ENABLED", "1") == "1"
+
+        self.closed = False
+        self._httpx = self._make_httpx_client() if http2 else None
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def http2(self):
+        return self._httpx is not None
+
+    def _make_httpx_client(self):
+        """HTTP/2 client when httpx and h2 are installed, otherwise None (logged)"""
+        try:
+            import httpx
+            import h2  # noqa: F401
+        except ImportError as e:
+            logger.info("HTTP/2 disabled, using HTTP/1.1 via requests: %s", e)
+            return None
+        if hasattr(httpx, 'Limits'):
+            pool = {'limits': httpx.Limits(max_connections=self.pool_maxsize,
+                                           max_keepalive_connections=self.pool_maxsize)}
+        elif hasattr(httpx, 'PoolLimits'):
+            # httpx < 0.18
+            pool = {'pool_limits': httpx.PoolLimits(max_connections=self.pool_maxsize,
+                                                    max_keepalive=self.pool_maxsize)}
+        else:
+            logger.warning("HTTP/2 disabled: httpx %s has no connection pool limits API",
+                           getattr(httpx, '__version__', '?'))
+            return None
+        self._httpx_timeouts = _httpx_errors(httpx, HTTPX_TIMEOUTS)
+        self._httpx_transport_errors = _httpx_errors(httpx, HTTPX_TRANSPORT_ERRORS)
+        return httpx.Client(http2=True, **pool)
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, or the server's Retry-After when given"""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _send(self, method, url, **kwargs):
+        if self._httpx is not None:
+            return self._send_httpx(method, url, **kwargs)
+        return self._session.request(method, url, **kwargs)
+
+    def _send_httpx(self, method, url, **kwargs):
+        # Translate httpx errors so callers only need to handle requests' exceptions
+        try:
+            return self._httpx.request(method, url, **kwargs)
+        except self._httpx_timeouts as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self._httpx_transport_errors as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def request(self, method, url, **kwargs):
+        return self._request_with_retries(self._send, method, url, **kwargs)
+
+    @contextmanager
+    def stream(self, method, url, **kwargs):
+        """Streaming request; retries apply only until the response body starts.
+
+        Always uses the pooled requests session, whose iter_lines() reads
+        chunked/SSE bodies incrementally.
+        """
+        response = self._request_with_retries(self._session.request, method, url, stream=True, **kwargs)
+        if response.encoding is None:
+            response.encoding = 'utf-8'
+        try:
+            yield response
+        finally:
+            response.close()
+
+    def _request_with_retries(self, send, method, url, **kwargs):
+        method = method.upper()
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = send(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if last_attempt:
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                continue
+            except requests.exceptions.Timeout:
+                # A timed-out POST may still have been processed upstream
+                if last_attempt or method not in IDEMPOTENT_METHODS:
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            # Release the pooled connection before waiting
+            response.close()
+            time.sleep(self.backoff_delay(attempt, retry_after))
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def health(self):
+        """None while the client can send requests, otherwise why it cannot"""
+        if self.closed:
+            return "closed"
+        # httpx clients closed elsewhere (e.g. by a failed shutdown) refuse every request
+        if self._httpx is not None and getattr(self._httpx, 'is_closed', False):
+            return "HTTP/2 pool closed"
+        if not self._session.adapters:
+            return "no connection adapters mounted"
+        return None
+
+    def close(self):
+        self.closed = True
+        self._session.close()
+        if self._httpx is not None:
+            self._httpx.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Process-wide HttpClient shared by every session and agent"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+def reset_http_client(client=None):
+    """Close the process-wide client so the next get_http_client() builds a new one.
+
+    With `client`, only acts if that client is still the shared one.
+    """
+    global _client
+    with _client_lock:
+        if _client is None or (client is not None and client is not _client):
+            return
+        old, _client = _client, None
+    old.close()
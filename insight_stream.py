@@ -0,0 +1,102 @@
+"""
+Streaming insight parsing
+Reads an OpenAI-compatible SSE completion stream and turns it into
+bullet-point insights as soon as each line of the answer is complete.
+"""
+
+import json
+
+# Used to pad the answer when the model returns fewer than 3 insights
+PADDING_INSIGHTS = [
+    "Market shows potential for strategic investment opportunities",
+    "Digital transformation trends are accelerating in this sector",
+    "Consumer behavior patterns indicate shift towards innovative solutions"
+]
+
+BULLETS = ('-', '•', '*')
+
+def iter_sse_data(lines):
+    """Yield the decoded JSON payload of each `data:` event until [DONE]"""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        # Blank lines separate events; lines starting with ':' are comments/keep-alives
+        if not line or line.startswith(':') or not line.startswith('data:'):
+            continue
+        data = line[len('data:'):].strip()
+        if data == '[DONE]':
+            return
+        yield json.loads(data)
+
+def iter_completion_deltas(lines):
+    """Yield the text fragments of a streamed chat completion"""
+    for event in iter_sse_data(lines):
+        if 'error' in event:
+            raise RuntimeError(event['error'].get('message', 'stream error'))
+        for choice in event.get('choices', []):
+            content = choice.get('delta', {}).get('content')
+            if content:
+                yield content
+
+class IncrementalInsightParser:
+    """Line-oriented parser fed with arbitrary text fragments.
+
+    `feed()` returns the bullet insights completed by that fragment;
+    `finish()` applies the same fallbacks as a full-response parse.
+    """
+
+    def __init__(self, limit=3):
+        self.limit = limit
+        self.insights = []
+        self.lines = []
+        self._buffer = ""
+
+    def feed(self, text):
+        self._buffer += text
+        completed = []
+        while '\n' in self._buffer:
+            line, self._buffer = self._buffer.split('\n', 1)
+            insight = self._parse_line(line)
+            if insight is not None:
+                completed.append(insight)
+        return completed
+
+    def _parse_line(self, line):
+        line = line.strip()
+        if not line:
+            return None
+        self.lines.append(line)
+        if line.startswith(BULLETS) and len(self.insights) < self.limit:
+            # Remove bullet points and clean up
+            insight = line.lstrip('-•* ').strip()
+            if insight:
+                self.insights.append(insight)
+                return insight
+        return None
+
+    def finish(self):
+        """Flush the last line and return exactly `limit` insights"""
+        if self._buffer:
+            self._parse_line(self._buffer)
+            self._buffer = ""
+
+        insights = list(self.insights)
+        # Too few bullets: top up with the other non-empty lines, after the insights already
+        # streamed so the final list extends what callers have seen; "Here are...:" preambles are skipped
+        for line in self.lines:
+            if len(insights) >= self.limit:
+                break
+            line = line.lstrip('-•* ').strip()
+            if line and not line.endswith(':') and line not in insights:
+                insights.append(line)
+        # Ensure we have enough insights
+        if len(insights) < self.limit:
+            insights.extend(PADDING_INSIGHTS[:self.limit - len(insights)])
+        return insights[:self.limit]
+
+def parse_insights(content, limit=3):
+    """Parse a complete (non-streamed) answer"""
+    parser = IncrementalInsightParser(limit)
+    parser.feed(content)
+    return parser.finish()
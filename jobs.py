@@ -0,0 +1,279 @@
+"""
+Background report jobs
+Research requests from the dashboard run on a process-wide worker pool
+instead of the Streamlit script thread. Every job has a row in a SQLite
+job table (queued -> running -> done/failed/cancelled) holding its
+progress, the insights streamed so far, stage timings and, once done,
+the id of its report in the report store. Sessions poll the table, so a
+job keeps running when its user navigates away or reloads the page.
+A batch research run (see batch_research.py) is one job too: its progress
+is the share of rows finished and its results file is kept with the job.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from agents import AgentContext, ScraperAgent, AnalyzerAgent, ReporterAgent, research_pipeline
+from batch_research import run_batch
+from rate_limit import INTERACTIVE
+from report_store import get_report_store
+from storage import cache_path, connect_sqlite
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+DEFAULT_WORKERS = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    query TEXT NOT NULL,
+    industry TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    stage TEXT,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    first_insight REAL,
+    insights TEXT NOT NULL DEFAULT '[]',
+    warnings TEXT NOT NULL DEFAULT '[]',
+    timings TEXT,
+    report_id TEXT,
+    error TEXT,
+    result_path TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, submitted_at);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+# Columns stored as JSON text
+JSON_COLUMNS = ('insights', 'warnings', 'timings')
+
+# Columns added after the table was first created: (name, declaration)
+ADDED_COLUMNS = (('result_path', 'TEXT'),)
+
+# Failed queries of a batch job listed in its warnings; the results file has all of them
+BATCH_WARNINGS = 10
+
+# Job tables already checked for jobs orphaned by a previous process
+_recovered_paths = set()
+
+class JobQueue:
+    """Worker pool plus the job table that tracks every research job"""
+
+    def __init__(self, path=None, workers=None):
+        self.path = path or os.environ.get("JOB_STORE_PATH") or cache_path("jobs.sqlite3")
+        self.workers = workers or int(os.environ.get("JOB_WORKERS", DEFAULT_WORKERS))
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(SCHEMA)
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, declaration in ADDED_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {declaration}")
+        if self.path not in _recovered_paths:
+            # Workers died with the previous process; API keys are never stored, so they cannot be resumed
+            _recovered_paths.add(self.path)
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = 'Interrupted by a server restart', finished_at = ?"
+                " WHERE status IN (?, ?)", (FAILED, time.time()) + ACTIVE_STATUSES
+            )
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        self._futures = {}
+        self.closed = False
+
+    def submit(self, query, api_keys, owner, industry=None, logs=None, priority=INTERACTIVE,
+               http=None, lexicon=None):
+        """Queue a research job and return its id; `logs` receives the agents' activity,
+        `priority` is the job's place in the provider quota queues and `http` / `lexicon`
+        override the process-wide client and sentiment lexicon"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, owner, query, industry, status, submitted_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, owner, query, industry, QUEUED, time.time())
+            )
+            self._conn.commit()
+        resources = {'http': http, 'lexicon': lexicon}
+        future = self._executor.submit(self._run, job_id, query, industry, dict(api_keys), logs, priority, resources)
+        self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(job_id, None))
+        return job_id
+
+    def _run(self, job_id, query, industry, api_keys, logs, priority, resources):
+        started = time.time()
+        self._update(job_id, status=RUNNING, started_at=started)
+        insights, warnings, completed = [], [], []
+        context = AgentContext(api_keys=api_keys, logs=logs, warn=warnings.append, priority=priority, **resources)
+
+        def on_insight(insight):
+            insights.append(insight)
+            fields = {'insights': insights}
+            if len(insights) == 1:
+                fields['first_insight'] = time.time() - started
+            self._update(job_id, **fields)
+
+        pipeline = research_pipeline(
+            query, ScraperAgent(context), AnalyzerAgent(context), ReporterAgent(context),
+            on_insight=on_insight, industry=industry
+        )
+
+        def on_stage_done(name, timing):
+            completed.append(name)
+            self._update(job_id, stage=name, progress=len(completed) / len(pipeline.stages))
+
+        try:
+            result = pipeline.run(on_stage_done)
+            report_id = get_report_store().add(result['report'], industry=industry)
+        except Exception as e:
+            # No report: drop insights streamed before the failure
+            self._update(job_id, status=FAILED, error=str(e) or type(e).__name__, warnings=warnings,
+                         insights=[], finished_at=time.time())
+            return
+        # The report's list replaces the streamed one, which may hold lines of a stream that broke partway
+        self._update(job_id, status=DONE, progress=1.0, report_id=report_id, warnings=warnings,
+                     insights=result['report']['analysis']['key_insights'],
+                     timings=dict(result.timings, total=result.total), finished_at=time.time())
+
+    def submit_batch(self, rows, api_keys, owner, title, checkpoint_path, workers):
+        """Queue a batch research run over `rows` as one job and return its id.
+
+        Records go to `checkpoint_path` (rerunning the same file resumes), and
+        each report is stored as its query finishes.
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, owner, query, status, submitted_at, result_path) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, owner, title, QUEUED, time.time(), checkpoint_path)
+            )
+            self._conn.commit()
+        future = self._executor.submit(self._run_batch, job_id, rows, dict(api_keys), checkpoint_path, workers)
+        self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(job_id, None))
+        return job_id
+
+    def _run_batch(self, job_id, rows, api_keys, checkpoint_path, workers):
+        started = time.time()
+        self._update(job_id, status=RUNNING, started_at=started)
+
+        def on_progress(progress, record):
+            self._update(job_id, stage=str(progress), progress=progress.finished / progress.total)
+
+        try:
+            records = run_batch(rows, api_keys, checkpoint_path, workers, on_progress=on_progress,
+                                report_store=get_report_store())
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e) or type(e).__name__, finished_at=time.time())
+            return
+        failed = [record for record in records if record['status'] != 'done']
+        warnings = [f"{record['query']}: {record['error']}" for record in failed[:BATCH_WARNINGS]]
+        if len(failed) > BATCH_WARNINGS:
+            warnings.append(f"... and {len(failed) - BATCH_WARNINGS} more failed queries in the results file")
+        self._update(job_id, status=DONE, progress=1.0, warnings=warnings,
+                     timings={'total': time.time() - started}, finished_at=time.time())
+
+    def _update(self, job_id, **fields):
+        columns = ", ".join(f"{column} = ?" for column in fields)
+        values = [json.dumps(value) if column in JSON_COLUMNS else value for column, value in fields.items()]
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", values + [job_id])
+            self._conn.commit()
+
+    def cancel(self, job_id):
+        """Cancel a job that has not started yet; returns whether it was cancelled"""
+        future = self._futures.get(job_id)
+        if future is None or not future.cancel():
+            return False
+        self._update(job_id, status=CANCELLED, finished_at=time.time())
+        return True
+
+    def get(self, job_id):
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+        return self._load(cursor.description, row) if row is not None else None
+
+    def jobs(self, owner=None, limit=20, status=None):
+        """Jobs newest first, optionally for one owner or in the given statuses"""
+        clauses, params = [], []
+        if owner is not None:
+            clauses.append("owner = ?")
+            params.append(owner)
+        if status:
+            statuses = (status,) if isinstance(status, str) else tuple(status)
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT * FROM jobs{where} ORDER BY submitted_at DESC LIMIT ?", params + [limit]
+            )
+            rows = cursor.fetchall()
+        return [self._load(cursor.description, row) for row in rows]
+
+    @staticmethod
+    def _load(description, row):
+        job = {column[0]: value for column, value in zip(description, row)}
+        for column in JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        stats = {'workers': self.workers}
+        stats.update((status, counts.get(status, 0)) for status in ACTIVE_STATUSES + (DONE, FAILED))
+        return stats
+
+    def health(self):
+        """None while jobs can be queued and tracked, otherwise why not"""
+        if self.closed:
+            return "closed"
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error as e:
+            return f"job table unavailable: {e}"
+        return None
+
+    def close(self):
+        """Stop taking jobs; queued ones are cancelled, running ones finish"""
+        self.closed = True
+        for job_id, future in list(self._futures.items()):
+            if future.cancel():
+                self._update(job_id, status=CANCELLED, finished_at=time.time())
+        self._executor.shutdown(wait=False)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """Process-wide job queue shared by all sessions"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+def reset_job_queue(queue=None):
+    """Close the process-wide queue so the next get_job_queue() starts a new one.
+
+    With `queue`, only acts if that queue is still the shared one.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None or (queue is not None and queue is not _queue):
+            return
+        old, _queue = _queue, None
+    old.close()
@@ -0,0 +1,57 @@
+"""
+Deferred imports
+Heavy third-party packages (pandas, numpy, plotly, pyarrow, requests) are
+bound to module stand-ins that import the real module on first attribute
+access. A Streamlit worker that only renders the landing or about page
+never loads them. Optional packages are probed through the import system's
+finders, which locate a package without executing it.
+"""
+
+import importlib
+import importlib.util
+import sys
+
+class LazyModule:
+    """Stand-in for a module, imported on first attribute access.
+
+    Attributes are copied onto the stand-in as they are used, so later
+    lookups (e.g. `np.arange` in a loop) cost a plain attribute read.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            # import_module holds the per-module import lock, so concurrent first uses are safe
+            module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name):
+    """The module if it is already imported, otherwise a LazyModule for it"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+def module_available(name):
+    """True if `name` can be found on the import path; does not import it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
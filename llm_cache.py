@@ -0,0 +1,187 @@
+"""
+LLM response cache
+TTL + LRU cache for Groq completions keyed by a hash of the model, the
+prompt template version and the normalized inputs the prompt is built from,
+with single-flight coalescing so concurrent identical requests share one
+upstream call. Optionally backed by a local SQLite store.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from storage import cache_path, connect_sqlite
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_ENTRIES = 512
+
+def _normalize(value):
+    """Round floats and fold case and whitespace so equivalent inputs hash identically"""
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value).strip().lower()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+def prompt_key(model, template_version, **inputs):
+    """Hash of model, prompt template version and the stable inputs of the prompt.
+
+    Only pass inputs that identify the question (query, industry): volatile
+    context such as live trend numbers would give every run its own key.
+    Bump the template version whenever the prompt wording changes.
+    """
+    payload = json.dumps({
+        'model': model,
+        'template': template_version,
+        'inputs': _normalize(inputs)
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache with single-flight computation"""
+
+    def __init__(self, ttl=None, max_entries=None, disk_path=None):
+        self.ttl = ttl if ttl is not None else float(os.environ.get("LLM_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        self.max_entries = max_entries or int(os.environ.get("LLM_CACHE_ENTRIES", DEFAULT_MAX_ENTRIES))
+        if disk_path is None and os.environ.get("LLM_CACHE_DISK") == "1":
+            disk_path = os.environ.get("LLM_CACHE_PATH") or cache_path("llm_cache.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        if disk_path:
+            self._conn = connect_sqlite(disk_path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value or run `compute` once for all concurrent callers.
+
+        Exceptions from `compute` reach every waiting caller and nothing is cached.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._store(key, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    def _lookup(self, key):
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        if self._conn is not None:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                value = json.loads(row[0])
+                self._remember(key, value, row[1])
+                return value
+        return None
+
+    def _store(self, key, value):
+        expires_at = time.time() + self.ttl
+        self._remember(key, value, expires_at)
+        if self._conn is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def _remember(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'inflight': len(self._inflight)
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Process-wide response cache shared by all Streamlit sessions"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -6,44 +6,37 @@ Modified to use Groq API instead of OpenAI
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import json
-import requests
 import hashlib
+import math
+import os
 import time
 from typing import Dict, List, Any
 import random
 import base64
-from io import BytesIO
-import numpy as np
+from functools import partial
+import io
+import uuid
 
-# Conditional imports for optional dependencies
-try:
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    st.warning("ReportLab not available. PDF export will be disabled.")
-
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-    st.warning("python-docx not available. Word export will be disabled.")
-
-try:
-    from googletrans import Translator
-    TRANSLATION_AVAILABLE = True
-except ImportError:
-    TRANSLATION_AVAILABLE = False
-    st.warning("Google Translate not available. Translation features will be disabled.")
+from agent_log import AgentLog
+from batch_research import DEFAULT_WORKERS, read_queries
+from downsample import downsample_frame, point_budget
+from figure_cache import FigureCache
+from forecasting import forecast_series
+from jobs import ACTIVE_STATUSES, DONE, FAILED, QUEUED
+from lazy_imports import lazy_import, module_available
+from llm_cache import get_response_cache
+from rate_limit import get_scheduler
+from report_store import get_report_store
+from resources import (
+    get_forecast_models, get_sentiment_lexicon, get_shared_http_client, get_shared_job_queue, get_translators,
+    resource_health, shared_resource
+)
+from storage import cache_path
+from timeseries_store import INDUSTRIES, get_timeseries_store
+from translation_memory import TranslationMemory
+from exports import ExportCache, EXPORT_FORMATS, export_available
 
-# Page configuration
+# Page configuration; must be the first Streamlit call of every run
 st.set_page_config(
     page_title="AI Market Research & Trend Analyst",
     page_icon="📊",
@@ -51,6 +44,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Plotly loads on first use, so pages without charts never import it
+go = lazy_import("plotly.graph_objects")
+
+# Optional dependencies: probed without importing; missing ones are reported where the feature is shown
+TRANSLATION_AVAILABLE = module_available("googletrans")
+
 # Multi-language support - COMPLETE TRANSLATIONS
 TRANSLATIONS = {
     'en': {
@@ -283,169 +282,15 @@ def init_session_state():
             'twitter': '',
             'google_translate': ''
         }
-    if 'reports' not in st.session_state:
-        st.session_state.reports = []
-    if 'market_data' not in st.session_state:
-        st.session_state.market_data = generate_sample_data()
     if 'agent_logs' not in st.session_state:
-        st.session_state.agent_logs = []
+        st.session_state.agent_logs = AgentLog()
     if 'translation_mode' not in st.session_state:
         st.session_state.translation_mode = 'auto'
-
-# API Integration Functions
-def get_groq_insights(query, market_data):
-    """Generate AI insights using Groq API"""
-    if not st.session_state.api_keys.get('groq'):
-        return [
-            "Strong growth potential in emerging markets",
-            "Increasing adoption of AI technologies", 
-            "Competitive landscape is evolving rapidly"
-        ]
-    
-    try:
-        # Groq API endpoint
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        
-        headers = {
-            "Authorization": f"Bearer {st.session_state.api_keys['groq']}",
-            "Content-Type": "application/json"
-        }
-        
-        # Create a concise market data summary for the prompt
-        data_summary = {
-            'query': query,
-            'trends': market_data.get('trends', {}),
-            'sentiment': market_data.get('news_sentiment', 'neutral'),
-            'articles_found': len(market_data.get('news', []))
-        }
-        
-        prompt = f"""
-        Analyze this market research query and provide 3 key actionable insights:
-
-        Query: {query}
-        Market Data Summary: {json.dumps(data_summary, indent=2)}
-
-        Please provide exactly 3 concise, actionable insights about this market. Each insight should be a single sentence focusing on opportunities, risks, or trends.
-
-        Format your response as 3 separate lines, each starting with a bullet point or dash.
-        """
-        
-        payload = {
-            "model": "llama3-8b-8192",  # Using Llama 3 8B model
-            "messages": [
-                {
-                    "role": "system", 
-                    "content": "You are an expert market research analyst. Provide concise, actionable insights based on market data."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ],
-            "max_tokens": 300,
-            "temperature": 0.7,
-            "top_p": 1,
-            "stream": False
-        }
-        
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            content = result['choices'][0]['message']['content'].strip()
-            
-            # Parse the insights from the response
-            insights = []
-            for line in content.split('\n'):
-                line = line.strip()
-                if line and (line.startswith('-') or line.startswith('•') or line.startswith('*')):
-                    # Remove bullet points and clean up
-                    insight = line.lstrip('-•* ').strip()
-                    if insight:
-                        insights.append(insight)
-            
-            # If parsing failed, split by lines and take first 3 non-empty ones
-            if len(insights) < 3:
-                insights = [line.strip() for line in content.split('\n') if line.strip()][:3]
-            
-            # Ensure we have at least 3 insights
-            if len(insights) < 3:
-                insights.extend([
-                    "Market shows potential for strategic investment opportunities",
-                    "Digital transformation trends are accelerating in this sector", 
-                    "Consumer behavior patterns indicate shift towards innovative solutions"
-                ][:3-len(insights)])
-            
-            return insights[:3]  # Return exactly 3 insights
-            
-        else:
-            st.warning(f"Groq API error: {response.status_code} - {response.text}")
-            return [
-                "Strong growth potential in emerging markets",
-                "Increasing adoption of AI technologies", 
-                "Competitive landscape is evolving rapidly"
-            ]
-            
-    except requests.exceptions.Timeout:
-        st.warning("Groq API request timed out. Using default insights.")
-        return [
-            "Strong growth potential in emerging markets",
-            "Increasing adoption of AI technologies", 
-            "Competitive landscape is evolving rapidly"
-        ]
-    except Exception as e:
-        st.warning(f"Groq API integration error: {e}")
-        return [
-            "Strong growth potential in emerging markets",
-            "Increasing adoption of AI technologies", 
-            "Competitive landscape is evolving rapidly"
-        ]
-
-def get_news_data(query):
-    """Fetch news data using NewsAPI"""
-    if not st.session_state.api_keys.get('news'):
-        return {"articles": [], "status": "No API key"}
-    
-    try:
-        url = f"https://newsapi.org/v2/everything"
-        params = {
-            'q': query,
-            'apiKey': st.session_state.api_keys['news'],
-            'language': 'en',
-            'sortBy': 'relevancy',
-            'pageSize': 5
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
-        
-        if data.get('status') == 'ok':
-            return data
-        else:
-            return {"articles": [], "status": f"API Error: {data.get('message', 'Unknown error')}"}
-            
-    except Exception as e:
-        st.warning(f"NewsAPI error: {e}")
-        return {"articles": [], "status": "API call failed"}
-
-def get_market_sentiment_analysis(query):
-    """Get enhanced market sentiment analysis"""
-    sentiment_data = {
-        'overall_score': random.uniform(0.3, 0.9),
-        'trend': random.choice(['Bullish', 'Bearish', 'Neutral', 'Volatile']),
-        'sources': ['News Articles', 'Social Media', 'Market Data'],
-        'confidence': random.uniform(0.7, 0.95)
-    }
-    
-    # If Twitter API is available, integrate real sentiment
-    if st.session_state.api_keys.get('twitter'):
-        try:
-            # Placeholder for Twitter API integration
-            sentiment_data['twitter_enabled'] = True
-        except Exception as e:
-            sentiment_data['twitter_error'] = str(e)
-    
-    return sentiment_data
+    if 'job_owner' not in st.session_state:
+        # Identifies this session's jobs in the shared job table
+        st.session_state.job_owner = uuid.uuid4().hex
+    if 'active_jobs' not in st.session_state:
+        st.session_state.active_jobs = set()
 
 def t(key):
     """Translation helper function with fallback"""
@@ -454,45 +299,64 @@ def t(key):
     except KeyError:
         return TRANSLATIONS['en'].get(key, key)
 
+# Export language names to Google Translate codes
+EXPORT_LANGUAGE_CODES = {
+    "English": "en",
+    "Spanish": "es",
+    "French": "fr",
+    "German": "de",
+    "Hindi": "hi",
+    "Chinese": "zh-cn"
+}
+
+@shared_resource("translation_memory", health=TranslationMemory.health, release=TranslationMemory.close)
+def get_translation_memory():
+    """Process-wide translation memory, pre-seeded with the offline phrases"""
+    memory = TranslationMemory()
+    for language, phrases in OFFLINE_TRANSLATIONS.items():
+        memory.seed(EXPORT_LANGUAGE_CODES[language], phrases)
+    return memory
+
 def safe_translate_text(text, target_lang):
     """Safe translation function with enhanced error handling"""
-    if not TRANSLATION_AVAILABLE:
-        return text
-    
-    if target_lang == "English" or target_lang == "en":
+    if target_lang == "English" or target_lang == "en" or not text:
         return text
     
-    lang_codes = {
-        "English": "en",
-        "Spanish": "es", 
-        "French": "fr",
-        "German": "de",
-        "Hindi": "hi",
-        "Chinese": "zh-cn"
-    }
-    
     try:
-        target_code = lang_codes.get(target_lang, "en")
+        target_code = EXPORT_LANGUAGE_CODES.get(target_lang, target_lang)
         if target_code == "en":
             return text
         
-        # Create a new translator instance for each translation to avoid session issues
-        translator = Translator()
+        # Translation memory first: seeded phrases, in-process LRU, then SQLite
+        memory = get_translation_memory()
+        cached = memory.get(text, target_code)
+        if cached is not None:
+            return cached
+        
+        if not TRANSLATION_AVAILABLE:
+            return text
         
         # Add retry logic
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                result = translator.translate(text, dest=target_code)
+                # A pooled client, used by this call alone
+                with get_translators().client() as translator:
+                    result = translator.translate(text, dest=target_code)
                 
                 # Handle different return types
                 if hasattr(result, 'text'):
-                    return result.text
+                    translated = result.text
                 elif isinstance(result, str):
-                    return result
+                    translated = result
                 else:
                     # If it's a coroutine or other unexpected type, return original text
                     return text
+                
+                if translated:
+                    memory.put(text, target_code, translated)
+                    return translated
+                return text
                     
             except Exception as retry_error:
                 if attempt == max_retries - 1:  # Last attempt
@@ -543,210 +407,145 @@ def offline_translate(text, target_lang):
         return OFFLINE_TRANSLATIONS[target_lang].get(text, text)
     return text
 
-def translate_report(report, target_lang):
-    """Translate report content with enhanced error handling and fallback"""
-    if target_lang == "English":
-        return report
-    
-    try:
-        translated = report.copy()
-        
-        # Use online translation first, fall back to offline if it fails
-        def safe_field_translate(text, field_name=""):
-            try:
-                # Try online translation first
-                if TRANSLATION_AVAILABLE:
-                    online_result = safe_translate_text(text, target_lang)
-                    if online_result != text:  # If translation actually happened
-                        return online_result
-                
-                # Fallback to offline translation
-                offline_result = offline_translate(text, target_lang)
-                return offline_result
-                
-            except Exception as e:
-                st.warning(f"Translation failed for {field_name}: {e}")
-                return text
-        
-        # Translate main fields with fallback
-        translated["executive_summary"] = safe_field_translate(
-            report.get("executive_summary", ""), "executive_summary"
-        )
-        
-        # Translate key insights
-        if "analysis" in report and "key_insights" in report["analysis"]:
-            translated["analysis"] = report["analysis"].copy()
-            translated_insights = []
-            for i, insight in enumerate(report["analysis"]["key_insights"]):
-                translated_insight = safe_field_translate(insight, f"insight_{i}")
-                translated_insights.append(translated_insight)
-            translated["analysis"]["key_insights"] = translated_insights
-        
-        # Translate recommendations
-        if "recommendations" in report:
-            translated_recs = []
-            for i, rec in enumerate(report["recommendations"]):
-                translated_rec = safe_field_translate(rec, f"recommendation_{i}")
-                translated_recs.append(translated_rec)
-            translated["recommendations"] = translated_recs
-        
-        return translated
-        
-    except Exception as e:
-        st.error(f"Report translation error: {e}")
-        st.info("Showing report in English due to translation issues.")
-        return report
+# Google Translate rejects requests above ~5000 characters
+TRANSLATION_BATCH_CHARS = 4500
 
-# Multi-Agent System Classes
-class MarketResearchAgent:
-    def __init__(self, name, role):
-        self.name = name
-        self.role = role
-        self.status = "idle"
-    
-    def log_activity(self, activity):
-        log_entry = {
-            'timestamp': datetime.now().strftime('%H:%M:%S'),
-            'agent': self.name,
-            'activity': activity,
-            'status': self.status
-        }
-        st.session_state.agent_logs.append(log_entry)
-        return log_entry
+def _translation_chunks(texts):
+    """Group texts into newline-joined chunks under the request size limit"""
+    chunk, size = [], 0
+    for text in texts:
+        if chunk and size + len(text) + 1 > TRANSLATION_BATCH_CHARS:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(text)
+        size += len(text) + 1
+    if chunk:
+        yield chunk
 
-class ScraperAgent(MarketResearchAgent):
-    def __init__(self):
-        super().__init__("Scraper Agent", "Data Collection")
+def safe_translate_batch(texts, target_code):
+    """Translate many strings with one request per chunk; returns {text: translation}"""
+    if not TRANSLATION_AVAILABLE or not texts:
+        return {}
     
-    def scrape_market_data(self, query):
-        self.status = "active"
-        self.log_activity(f"Scraping data for: {query}")
-        
-        # Get real news data if API is available
-        news_data = get_news_data(query)
-        
-        # Simulated data with real news integration
-        data = {
-            'query': query,
-            'news': news_data.get('articles', []),
-            'news_status': news_data.get('status', 'No API'),
-            'trends': generate_trend_data(),
-            'competitors': ['Company A', 'Company B', 'Company C'],
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Add news sentiment if articles are available
-        if data['news']:
-            positive_count = sum(1 for article in data['news'] 
-                               if 'growth' in article.get('title', '').lower() 
-                               or 'positive' in article.get('description', '').lower())
-            data['news_sentiment'] = 'positive' if positive_count > len(data['news'])/2 else 'neutral'
+    translators = get_translators()
+    results = {}
+    max_retries = 3
+    for chunk in _translation_chunks(texts):
+        lines = None
+        # Strings containing newlines would break the line-based split
+        if not any('\n' in text for text in chunk):
+            for attempt in range(max_retries):
+                try:
+                    with translators.client() as translator:
+                        result = translator.translate('\n'.join(chunk), dest=target_code)
+                    lines = getattr(result, 'text', '').split('\n')
+                    break
+                except Exception as retry_error:
+                    if attempt == max_retries - 1:
+                        st.warning(f"Batch translation failed after {max_retries} attempts: {retry_error}")
+                    else:
+                        time.sleep(0.5)
         
-        self.status = "completed"
-        self.log_activity(f"Completed scraping for: {query} (Found {len(data['news'])} articles)")
-        return data
+        if lines is not None and len(lines) == len(chunk):
+            results.update((text, line.strip()) for text, line in zip(chunk, lines) if line.strip())
+        else:
+            # The translator merged or dropped lines: fall back to one call per string
+            for text in chunk:
+                translated = safe_translate_text(text, target_code)
+                if translated != text:
+                    results[text] = translated
+    return results
 
-class AnalyzerAgent(MarketResearchAgent):
-    def __init__(self):
-        super().__init__("Analyzer Agent", "Data Analysis")
+def translate_texts(texts, target_lang):
+    """Translate unique strings via translation memory, then one batch request per language"""
+    target_code = EXPORT_LANGUAGE_CODES.get(target_lang, target_lang)
+    unique = [text for text in dict.fromkeys(texts) if text]
+    if target_code == "en" or not unique:
+        return {}
     
-    def analyze_data(self, data):
-        self.status = "active"
-        self.log_activity("Analyzing market data with Groq AI...")
-        
-        # Use Groq for insights
-        query = data.get('query', 'market analysis')
-        ai_insights = get_groq_insights(query, data)
-        
-        # Get enhanced sentiment analysis
-        sentiment_analysis = get_market_sentiment_analysis(query)
-        
-        analysis = {
-            'sentiment_score': sentiment_analysis['overall_score'],
-            'growth_potential': random.uniform(0.4, 0.95),
-            'risk_level': random.choice(['Low', 'Medium', 'High']),
-            'key_insights': ai_insights,
-            'sentiment_trend': sentiment_analysis['trend'],
-            'data_sources': sentiment_analysis['sources'],
-            'confidence': sentiment_analysis['confidence']
-        }
-        
-        self.status = "completed"
-        self.log_activity("Analysis completed with Groq AI integration")
-        return analysis
-
-class ReporterAgent(MarketResearchAgent):
-    def __init__(self):
-        super().__init__("Reporter Agent", "Report Generation")
+    memory = get_translation_memory()
+    translations = memory.get_many(unique, target_code)
+    missing = [text for text in unique if text not in translations]
     
-    def generate_report(self, data, analysis):
-        self.status = "active"
-        self.log_activity("Generating comprehensive report...")
-        
-        report = {
-            'title': f"Market Research Report - {datetime.now().strftime('%Y-%m-%d')}",
-            'executive_summary': "This report provides comprehensive market analysis with AI-driven insights.",
-            'market_data': data,
-            'analysis': analysis,
-            'recommendations': [
-                "Invest in emerging technologies",
-                "Focus on customer experience", 
-                "Expand into new markets"
-            ],
-            'generated_at': datetime.now().isoformat()
-        }
-        
-        self.status = "completed"
-        self.log_activity("Report generated successfully")
-        return report
+    if missing:
+        fetched = safe_translate_batch(missing, target_code)
+        if fetched:
+            memory.put_many(target_code, fetched)
+            translations.update(fetched)
+    
+    # Offline dictionary as the last resort for anything still untranslated
+    for text in missing:
+        if text not in translations:
+            translations[text] = offline_translate(text, target_lang)
+    return translations
+
+def _report_texts(report):
+    yield report.get("executive_summary", "")
+    yield from report.get("analysis", {}).get("key_insights", [])
+    yield from report.get("recommendations", [])
 
-class VisualizerAgent(MarketResearchAgent):
-    def __init__(self):
-        super().__init__("Visualizer Agent", "Data Visualization")
+def translate_reports(reports, target_lang):
+    """Translate all reports together: collect, deduplicate, translate once, scatter back"""
+    if target_lang == "English":
+        return list(reports)
     
-    def create_visualizations(self, data):
-        self.status = "active"
-        self.log_activity("Creating visualizations...")
+    try:
+        translations = translate_texts(
+            [text for report in reports for text in _report_texts(report)], target_lang
+        )
+        lookup = lambda text: translations.get(text, text)
         
-        charts = {
-            'trend_chart': create_trend_chart(data),
-            'sentiment_radar': create_sentiment_radar(),
-            'growth_forecast': create_growth_forecast()
-        }
+        translated_reports = []
+        for report in reports:
+            translated = report.copy()
+            translated["executive_summary"] = lookup(report.get("executive_summary", ""))
+            
+            if "analysis" in report and "key_insights" in report["analysis"]:
+                translated["analysis"] = report["analysis"].copy()
+                translated["analysis"]["key_insights"] = [
+                    lookup(insight) for insight in report["analysis"]["key_insights"]
+                ]
+            
+            if "recommendations" in report:
+                translated["recommendations"] = [lookup(rec) for rec in report["recommendations"]]
+            
+            translated_reports.append(translated)
+        return translated_reports
         
-        self.status = "completed"
-        self.log_activity("Visualizations created")
-        return charts
+    except Exception as e:
+        st.error(f"Report translation error: {e}")
+        st.info("Showing reports in English due to translation issues.")
+        return list(reports)
+
+def translate_report(report, target_lang):
+    """Translate report content with enhanced error handling and fallback"""
+    return translate_reports([report], target_lang)[0]
 
-# Data generation functions
-def generate_sample_data():
-    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='M')
-    return pd.DataFrame({
-        'date': dates,
-        'market_value': np.random.randint(1000, 5000, len(dates)),
-        'growth_rate': np.random.uniform(-0.1, 0.3, len(dates)),
-        'sentiment': np.random.uniform(0.3, 0.9, len(dates))
-    })
+# Market data comes from the time-series store; industries without data get sample history
+FORECAST_HORIZON = 12
+TREND_RESOLUTIONS = {'D': "Daily", 'W': "Weekly", 'M': "Monthly"}
 
-def generate_trend_data():
-    return {
-        'ai_adoption': random.uniform(0.6, 0.95),
-        'market_growth': random.uniform(0.1, 0.3),
-        'innovation_index': random.uniform(0.5, 0.9),
-        'competition_level': random.uniform(0.4, 0.8)
-    }
+def market_series(industry, freq='W', window=None):
+    """Stored series for the chart, downsampled (LTTB) to the point budget per ticker"""
+    store = get_timeseries_store()
+    store.ensure_sample(industry)
+    start, end = window or (None, None)
+    series = store.query(industry, start=start, end=end, columns=['market_value'], freq=freq)
+    return downsample_frame(series, 'timestamp', 'market_value', by='ticker')
 
 # Visualization functions
 def create_trend_chart(data):
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=st.session_state.market_data['date'],
-        y=st.session_state.market_data['market_value'],
-        mode='lines+markers',
-        name='Market Value',
-        line=dict(color='#667eea', width=3)
-    ))
+    colors = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b']
+    for i, (ticker, series) in enumerate(data.groupby('ticker')):
+        fig.add_trace(go.Scatter(
+            x=series['timestamp'],
+            y=series['market_value'],
+            mode='lines+markers' if len(series) <= 60 else 'lines',
+            name=ticker,
+            line=dict(color=colors[i % len(colors)], width=3)
+        ))
     
     fig.update_layout(
         title='Market Trend Analysis',
@@ -783,127 +582,107 @@ def create_sentiment_radar():
     
     return fig
 
-def create_growth_forecast():
-    future_dates = pd.date_range(start='2025-01-01', end='2025-12-31', freq='M')
-    forecast_values = [3000 + i * 100 + random.randint(-200, 200) for i in range(len(future_dates))]
-    
+def industry_forecasts(horizon=FORECAST_HORIZON):
+    """Monthly index forecasts for every industry, fitted together in one batch"""
+    store = get_timeseries_store()
+    history = {}
+    for industry in INDUSTRIES:
+        store.ensure_sample(industry)
+        # Rebase to 100 and drop the current, still incomplete month
+        history[industry] = store.index_series(industry, 'M').iloc[:-1] * 100
+    forecasts = forecast_series(history, horizon, 'MS', season_length=12, cache=get_forecast_models())
+    return history, forecasts
+
+def create_growth_forecast(history, forecast):
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=future_dates,
-        y=forecast_values,
+        x=history.index,
+        y=history.values,
+        mode='lines',
+        name='History',
+        line=dict(color='#667eea', width=3)
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=forecast['timestamp'],
+        y=forecast['mean'],
         mode='lines',
         name='Forecast',
         line=dict(color='#764ba2', width=3, dash='dash')
     ))
     
     fig.add_trace(go.Scatter(
-        x=future_dates,
-        y=[v + 300 for v in forecast_values],
+        x=forecast['timestamp'],
+        y=forecast['upper'],
         mode='lines',
-        name='Upper Bound',
+        name='Upper Bound (95%)',
         line=dict(color='rgba(118, 75, 162, 0.3)'),
         fill=None
     ))
     
     fig.add_trace(go.Scatter(
-        x=future_dates,
-        y=[v - 300 for v in forecast_values],
+        x=forecast['timestamp'],
+        y=forecast['lower'],
         mode='lines',
-        name='Lower Bound',
+        name='Lower Bound (95%)',
         line=dict(color='rgba(118, 75, 162, 0.3)'),
         fill='tonexty',
         fillcolor='rgba(118, 75, 162, 0.1)'
     ))
     
     fig.update_layout(
-        title='Growth Forecast 2025',
+        title='Growth Forecast (Holt-Winters, next 12 months)',
         xaxis_title='Date',
-        yaxis_title='Projected Value',
+        yaxis_title='Industry Index (start = 100)',
         template='plotly_white',
         height=400
     )
     
     return fig
 
-# Export functions with error handling
-def generate_pdf(report):
-    """Generate PDF with error handling"""
-    if not REPORTLAB_AVAILABLE:
-        st.error("PDF generation not available. Please install reportlab.")
-        return None
-    
-    try:
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer)
-        styles = getSampleStyleSheet()
-        content = []
-
-        content.append(Paragraph(report.get("title", "Market Research Report"), styles['Heading1']))
-        content.append(Spacer(1, 12))
-        content.append(Paragraph("Executive Summary", styles['Heading2']))
-        content.append(Paragraph(report.get("executive_summary", ""), styles['Normal']))
-        content.append(Spacer(1, 12))
-
-        content.append(Paragraph("Key Insights", styles['Heading2']))
-        if "analysis" in report and "key_insights" in report["analysis"]:
-            for insight in report["analysis"]["key_insights"]:
-                content.append(Paragraph(f"• {insight}", styles['Normal']))
-        content.append(Spacer(1, 12))
-
-        content.append(Paragraph("Recommendations", styles['Heading2']))
-        if "recommendations" in report:
-            for rec in report["recommendations"]:
-                content.append(Paragraph(f"• {rec}", styles['Normal']))
-        content.append(Spacer(1, 12))
-
-        content.append(Paragraph(f"Generated: {report.get('generated_at', '')}", styles['Normal']))
-        if "analysis" in report:
-            content.append(Paragraph(f"Risk Level: {report['analysis'].get('risk_level', 'N/A')}", styles['Normal']))
-            content.append(Paragraph(f"Growth Potential: {report['analysis'].get('growth_potential', 0):.1%}", styles['Normal']))
-
-        doc.build(content)
-        buffer.seek(0)
-        return buffer
-    except Exception as e:
-        st.error(f"PDF generation failed: {e}")
-        return None
-
-def generate_word(report):
-    """Generate Word document with error handling"""
-    if not DOCX_AVAILABLE:
-        st.error("Word generation not available. Please install python-docx.")
-        return None
-    
-    try:
-        buffer = BytesIO()
-        doc = Document()
+CHART_BUILDERS = {
+    'trend_chart': lambda industry, freq, window: create_trend_chart(market_series(industry, freq, window)),
+    'sentiment_radar': lambda industry, freq, window: create_sentiment_radar(),
+    'growth_forecast': lambda industry, freq, window: growth_forecast_figure(industry)
+}
 
-        doc.add_heading(report.get("title", "Market Research Report"), 0)
-        doc.add_heading("Executive Summary", level=1)
-        doc.add_paragraph(report.get("executive_summary", ""))
+def growth_forecast_figure(industry):
+    history, forecasts = industry_forecasts()
+    return create_growth_forecast(history[industry].iloc[-24:], forecasts[industry])
 
-        doc.add_heading("Key Insights", level=1)
-        if "analysis" in report and "key_insights" in report["analysis"]:
-            for insight in report["analysis"]["key_insights"]:
-                doc.add_paragraph(f"• {insight}")
+@shared_resource("figure_cache")
+def get_figure_cache():
+    """Process-wide cache of dashboard figures, keyed by data version"""
+    return FigureCache()
 
-        doc.add_heading("Recommendations", level=1)
-        if "recommendations" in report:
-            for rec in report["recommendations"]:
-                doc.add_paragraph(f"• {rec}")
+def market_figure(name, industry, freq='W', window=None):
+    """Dashboard figure for an industry, rebuilt only when its stored series changes"""
+    store = get_timeseries_store()
+    store.ensure_sample(industry)
+    version = f"{industry}:{freq}:{window}:{point_budget()}:{store.version(industry)}"
+    return get_figure_cache().get_or_build(name, version, lambda: CHART_BUILDERS[name](industry, freq, window))
 
-        doc.add_paragraph(f"Generated: {report.get('generated_at', '')}")
-        if "analysis" in report:
-            doc.add_paragraph(f"Risk Level: {report['analysis'].get('risk_level', 'N/A')}")
-            doc.add_paragraph(f"Growth Potential: {report['analysis'].get('growth_potential', 0):.1%}")
+# Export functions
+@shared_resource("export_cache")
+def get_export_cache():
+    """Process-wide cache of rendered PDF/Word exports"""
+    return ExportCache()
 
-        doc.save(buffer)
-        buffer.seek(0)
-        return buffer
-    except Exception as e:
-        st.error(f"Word generation failed: {e}")
-        return None
+def export_download_button(cache, report, translated_report, export_lang, fmt):
+    """Download button that renders the export only when it is clicked"""
+    labels = {'pdf': "📥 Download PDF", 'docx': "📄 Download Word"}
+    spec = EXPORT_FORMATS[fmt]
+    st.download_button(
+        label=labels[fmt],
+        # Streamlit calls this on click, off the script thread; cache hits skip rendering
+        data=partial(cache.get_or_render, report, export_lang, fmt, lambda _: translated_report),
+        file_name=f"report_{report['generated_at'][:10]}_{report['id'][:8]}.{spec['extension']}",
+        mime=spec['mime'],
+        # Keyed by report id so widget state follows the report across pages
+        key=f"{fmt}_{report['id']}",
+        on_click="ignore"
+    )
 
 # Page functions
 def landing_page():
@@ -967,12 +746,6 @@ def dashboard_page():
     </div>
     """, unsafe_allow_html=True)
     
-    # Initialize agents
-    scraper = ScraperAgent()
-    analyzer = AnalyzerAgent()
-    reporter = ReporterAgent()
-    visualizer = VisualizerAgent()
-    
     # Metrics Row
     col1, col2, col3, col4 = st.columns(4)
     
@@ -983,7 +756,8 @@ def dashboard_page():
     with col3:
         st.metric(t('risk_level'), "Medium", "→ Stable")
     with col4:
-        st.metric(t('reports_generated'), len(st.session_state.reports), f"→ {len(st.session_state.reports)}")
+        report_count = get_report_store().count()
+        st.metric(t('reports_generated'), report_count, f"→ {report_count}")
     
     # Main Dashboard Layout
     col1, col2 = st.columns([2, 1])
@@ -998,7 +772,7 @@ def dashboard_page():
         col_a, col_b = st.columns(2)
         with col_a:
             industry = st.selectbox(t('industry'), 
-                                   ["Technology", "Healthcare", "Finance", "Retail", "Manufacturing"])
+                                   INDUSTRIES)
         with col_b:
             timeframe = st.selectbox(t('timeframe'), 
                                     ["Last Month", "Last Quarter", "Last Year", "Custom"])
@@ -1007,31 +781,17 @@ def dashboard_page():
             if not query.strip():
                 st.warning("Please enter a market research query to generate a report.")
             else:
-                with st.spinner("Multi-agent system working with Groq AI..."):
-                    # Agent workflow
-                    progress = st.progress(0)
-                    
-                    # Step 1: Scraping
-                    progress.progress(25)
-                    data = scraper.scrape_market_data(query)
-                    time.sleep(1)
-                    
-                    # Step 2: Analysis with Groq AI
-                    progress.progress(50)
-                    analysis = analyzer.analyze_data(data)
-                    time.sleep(1)
-                    
-                    # Step 3: Report Generation
-                    progress.progress(75)
-                    report = reporter.generate_report(data, analysis)
-                    st.session_state.reports.append(report)
-                    time.sleep(1)
-                    
-                    # Step 4: Visualization
-                    progress.progress(100)
-                    charts = visualizer.create_visualizations(data)
-                    
-                    st.success("✅ Report generated successfully with Groq AI insights!")
+                # The pipeline runs on the job pool; this script run returns straight away
+                # Registry lookups health-check the client and lexicon the job's agents will use
+                job_id = get_shared_job_queue().submit(
+                    query, st.session_state.api_keys, st.session_state.job_owner, industry=industry,
+                    logs=st.session_state.agent_logs, http=get_shared_http_client(), lexicon=get_sentiment_lexicon()
+                )
+                st.session_state.active_jobs.add(job_id)
+        
+        report_jobs_panel()
+        
+        batch_research_panel()
         
         # Visualizations
         st.markdown("### 📈 Market Visualizations")
@@ -1039,13 +799,20 @@ def dashboard_page():
         tab1, tab2, tab3 = st.tabs(["Trend Analysis", "Sentiment Radar", "Growth Forecast"])
         
         with tab1:
-            st.plotly_chart(create_trend_chart(None), use_container_width=True)
+            freq = st.radio("Resolution", list(TREND_RESOLUTIONS), index=1, horizontal=True,
+                            format_func=TREND_RESOLUTIONS.get, key="trend_resolution")
+            # Narrowing the range re-queries the store, so the same point budget shows more detail
+            get_timeseries_store().ensure_sample(industry)
+            first, last = get_timeseries_store().span(industry)
+            window = st.slider("Date range", min_value=first.date(), max_value=last.date(),
+                               value=(first.date(), last.date()), key=f"trend_window_{industry}")
+            st.plotly_chart(market_figure('trend_chart', industry, freq, window), use_container_width=True)
         
         with tab2:
-            st.plotly_chart(create_sentiment_radar(), use_container_width=True)
+            st.plotly_chart(market_figure('sentiment_radar', industry), use_container_width=True)
         
         with tab3:
-            st.plotly_chart(create_growth_forecast(), use_container_width=True)
+            st.plotly_chart(market_figure('growth_forecast', industry), use_container_width=True)
     
     with col2:
         # API Integration Status
@@ -1072,12 +839,13 @@ def dashboard_page():
         # Agent Status Panel
         st.markdown(f"### 🤖 {t('agent_status')}")
         
-        for log in st.session_state.agent_logs[-5:]:
+        for log in st.session_state.agent_logs.tail(5):
+            took = f" · {log.duration:.2f}s" if log.duration is not None else ""
             st.markdown(f"""
             <div class="agent-status">
-                <strong>{log['agent']}</strong><br>
-                <small>{log['timestamp']}</small><br>
-                {log['activity']}
+                <strong>{log.agent}</strong><br>
+                <small>{log.timestamp}{took}</small><br>
+                {log.activity}
             </div>
             """, unsafe_allow_html=True)
         
@@ -1099,7 +867,8 @@ def dashboard_page():
         st.markdown(f"### ⚡ {t('quick_actions')}")
         
         if st.button(f"🔄 {t('refresh_data')}", use_container_width=True):
-            st.session_state.market_data = generate_sample_data()
+            # Append the days since the last stored point; the new version invalidates the charts
+            get_timeseries_store().extend_sample(industry)
             st.rerun()
         
         if st.button(f"📥 {t('export_dashboard')}", use_container_width=True):
@@ -1108,6 +877,132 @@ def dashboard_page():
         if st.button(f"🤖 {t('compare_industries')}", use_container_width=True):
             st.info("Industry comparison feature coming soon!")
 
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", 1.5))
+JOB_PANEL_SIZE = 5
+JOB_ICONS = {QUEUED: "⏳", 'running': "⚙️", DONE: "✅", FAILED: "❌", 'cancelled': "🚫"}
+
+def report_jobs_panel():
+    """This session's report jobs; polls the job table while any is still queued or running"""
+    run_every = JOB_POLL_SECONDS if st.session_state.active_jobs else None
+    st.fragment(run_every=run_every)(render_report_jobs)()
+
+def render_report_jobs():
+    jobs = get_shared_job_queue().jobs(owner=st.session_state.job_owner, limit=JOB_PANEL_SIZE)
+    if not jobs:
+        return
+    active = {job['id'] for job in jobs if job['status'] in ACTIVE_STATUSES}
+    finished = st.session_state.active_jobs - active
+    st.session_state.active_jobs = active
+    if finished:
+        # Full rerun: the report count changes and polling stops once nothing is left running
+        st.rerun()
+    
+    st.markdown("#### 🗂️ Report jobs")
+    for job in jobs:
+        with st.container(border=True):
+            industry = f" · {job['industry']}" if job['industry'] else ""
+            st.markdown(f"{JOB_ICONS.get(job['status'], '')} **{job['query']}**{industry} — {job['status']}")
+            if job['status'] in ACTIVE_STATUSES:
+                stage = f"{job['stage']} done" if job['stage'] else "waiting for a worker"
+                st.progress(job['progress'], text=stage)
+                # Insights appear as soon as each streamed line completes
+                for insight in job['insights']:
+                    st.info(f"💡 {insight}")
+                if job['status'] == QUEUED and st.button("Cancel", key=f"cancel_{job['id']}"):
+                    get_shared_job_queue().cancel(job['id'])
+                    st.rerun()
+            elif job['status'] == DONE and job['result_path']:
+                # Batch run: the final progress line sums it up
+                st.caption(f"{job['stage'] or ''} · reports saved to Reports")
+                if os.path.exists(job['result_path']):
+                    with open(job['result_path'], encoding='utf-8') as f:
+                        st.download_button("📥 Download results (JSONL)", f.read(),
+                                           file_name=os.path.basename(job['result_path']),
+                                           mime="application/json", key=f"results_{job['id']}")
+            elif job['status'] == DONE:
+                st.caption("Saved to Reports")
+                with st.expander("⏱️ Pipeline timings"):
+                    timings = dict(job['timings'] or {})
+                    total = timings.pop('total', None)
+                    for name, timing in sorted(timings.items(), key=lambda item: item[1]['start']):
+                        st.write(f"**{name}**: {timing['duration'] * 1000:.0f} ms "
+                                 f"(started at +{timing['start'] * 1000:.0f} ms)")
+                    if job['first_insight'] is not None:
+                        st.write(f"**Time to first insight**: {job['first_insight'] * 1000:.0f} ms")
+                    if total is not None:
+                        st.write(f"**Total**: {total * 1000:.0f} ms")
+            elif job['status'] == FAILED:
+                st.error(job['error'])
+            for warning in job['warnings']:
+                st.warning(warning)
+
+def batch_research_panel():
+    """Upload a CSV of queries and research them all as one background job"""
+    with st.expander("📦 Batch Research"):
+        st.caption("CSV with a `query` column, or `industry`, `region` and `timeframe` columns. "
+                   "Headless: `python batch_research.py queries.csv`")
+        uploaded = st.file_uploader("Queries CSV", type=["csv"])
+        workers = st.slider("Parallel workers", 1, 16, DEFAULT_WORKERS)
+        
+        if uploaded is None or not st.button("🚀 Run Batch", use_container_width=True):
+            return
+        
+        rows = read_queries(io.StringIO(uploaded.getvalue().decode('utf-8-sig')))
+        if not rows:
+            st.warning("No queries found in the uploaded file.")
+            return
+        
+        # Same file -> same checkpoint, so rerunning after a crash resumes
+        digest = hashlib.sha1(uploaded.getvalue()).hexdigest()[:12]
+        checkpoint = cache_path(f"batch_{digest}.jsonl")
+        # Runs on the job pool like a report; the jobs list above shows its progress
+        job_id = get_shared_job_queue().submit_batch(
+            rows, st.session_state.api_keys, st.session_state.job_owner,
+            f"📦 Batch: {len(rows)} queries from {uploaded.name}", checkpoint, workers
+        )
+        st.session_state.active_jobs.add(job_id)
+        st.rerun()
+
+REPORTS_PAGE_SIZE = int(os.environ.get("REPORTS_PAGE_SIZE", 10))
+REPORTS_PAGE_SIZES = sorted({5, 10, 25, 50, REPORTS_PAGE_SIZE})
+
+def reset_reports_page():
+    st.session_state.reports_page = 1
+
+def step_reports_page(delta):
+    st.session_state.reports_page += delta
+
+def report_pagination(total, filter_key):
+    """Page navigation for the report list; returns (offset, limit)"""
+    # Any change to the filters starts again from the first page
+    if st.session_state.get('reports_filter_key') != filter_key:
+        st.session_state.reports_filter_key = filter_key
+        reset_reports_page()
+    page_size = st.session_state.get('reports_page_size', REPORTS_PAGE_SIZE)
+    page_count = max(1, math.ceil(total / page_size))
+    st.session_state.reports_page = min(max(1, st.session_state.get('reports_page', 1)), page_count)
+    page = st.session_state.reports_page
+
+    col1, col2, col3, col4 = st.columns([1, 2, 1, 2])
+    with col1:
+        st.button("◀ Previous", key="reports_prev", disabled=page <= 1,
+                  on_click=step_reports_page, args=(-1,), use_container_width=True)
+    with col2:
+        st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count,
+                        key='reports_page', label_visibility="collapsed")
+    with col3:
+        st.button("Next ▶", key="reports_next", disabled=page >= page_count,
+                  on_click=step_reports_page, args=(1,), use_container_width=True)
+    with col4:
+        st.selectbox("Reports per page", REPORTS_PAGE_SIZES, key='reports_page_size',
+                     index=REPORTS_PAGE_SIZES.index(page_size), on_change=reset_reports_page,
+                     label_visibility="collapsed", format_func=lambda size: f"{size} per page")
+
+    offset = (page - 1) * page_size
+    st.caption(f"Showing {offset + 1}–{min(offset + page_size, total)} of {total} reports "
+               f"· page {page} of {page_count}")
+    return offset, page_size
+
 def reports_page():
     st.markdown(f"""
     <div class="main-header">
@@ -1126,17 +1021,25 @@ def reports_page():
         export_lang = st.selectbox(f"🌍 {t('export_language')}", 
                                   ["English", "Spanish", "French", "German", "Hindi", "Chinese"])
 
-    # Display reports
-    if not st.session_state.reports:
-        st.info(t('no_reports'))
+    # Display reports: only the visible page is loaded, translated and rendered
+    store = get_report_store()
+    filters = {'text': search, 'date_from': filter_date, 'date_to': filter_date}
+    total = store.count(**filters)
+    if not total:
+        st.info(t('no_reports') if not (search or filter_date) else "No reports match these filters.")
     else:
-        for i, report in enumerate(st.session_state.reports):
-            translated_report = translate_report(report, export_lang)
+        offset, limit = report_pagination(total, (search, str(filter_date)))
+        reports = store.page(offset=offset, limit=limit, **filters)
+        export_cache = get_export_cache()
+        translated_reports = translate_reports(reports, export_lang)
+        for i, (report, translated_report) in enumerate(zip(reports, translated_reports)):
 
             with st.expander(f"📊 {translated_report.get('title', 'Report')}", expanded=i==0):
                 col1, col2 = st.columns([3, 1])
 
                 with col1:
+                    if report.get('degraded'):
+                        st.warning(f"Default insights, not an AI analysis: {report['degraded']}")
                     st.markdown("**Executive Summary:**")
                     st.write(translated_report.get("executive_summary", "No summary available"))
 
@@ -1164,35 +1067,18 @@ def reports_page():
 
                     st.markdown("**Actions:**")
                     
-                    # PDF Download
-                    if REPORTLAB_AVAILABLE:
-                        pdf_buffer = generate_pdf(translated_report)
-                        if pdf_buffer:
-                            st.download_button(
-                                label="📥 Download PDF",
-                                data=pdf_buffer,
-                                file_name=f"report_{i+1}.pdf",
-                                mime="application/pdf",
-                                key=f"pdf_{i}"
-                            )
+                    # Exports are rendered lazily on click and cached by content hash
+                    if export_available('pdf'):
+                        export_download_button(export_cache, report, translated_report, export_lang, 'pdf')
                     else:
                         st.info("PDF export not available")
 
-                    # Word Download
-                    if DOCX_AVAILABLE:
-                        word_buffer = generate_word(translated_report)
-                        if word_buffer:
-                            st.download_button(
-                                label="📄 Download Word",
-                                data=word_buffer,
-                                file_name=f"report_{i+1}.docx",
-                                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                key=f"word_{i}"
-                            )
+                    if export_available('docx'):
+                        export_download_button(export_cache, report, translated_report, export_lang, 'docx')
                     else:
                         st.info("Word export not available")
 
-                    if st.button(f"🔄 Regenerate", key=f"regen_{i}"):
+                    if st.button(f"🔄 Regenerate", key=f"regen_{report['id']}"):
                         st.info("Regenerating report...")
 
 def about_page():
@@ -1343,6 +1229,25 @@ def main():
         st.markdown(f"**Groq AI:** {groq_status}")
         st.markdown(f"**NewsAPI:** {news_status}")
         
+        llm_stats = get_response_cache().stats()
+        st.markdown(f"**LLM cache:** {llm_stats['hits']} hits · {llm_stats['misses']} misses"
+                    f" · {llm_stats['coalesced']} coalesced")
+        
+        for provider, quota in get_scheduler().stats().items():
+            daily = f"/{quota['daily_quota']:g}" if quota['daily_quota'] else ""
+            paused = f" · paused {quota['paused_for']:.0f}s" if quota['paused_for'] else ""
+            st.caption(f"{provider}: {quota['queue_depth']} queued"
+                       f" ({quota['batch_waiting']} batch) · {quota['used_today']}{daily} today{paused}")
+        
+        with st.expander("🩺 Shared Resources"):
+            for resource in resource_health():
+                age = f" · {resource['age'] / 60:.0f} min old" if resource['age'] is not None else ""
+                stats = resource['stats'] if isinstance(resource['stats'], dict) else {}
+                details = " · ".join(f"{key} {value}" for key, value in stats.items())
+                # Read-only: these instances serve every session, so no single session may release them
+                st.caption(f"**{resource['name']}**: {resource['status']}{age}"
+                           + (f" · {details}" if details else ""))
+        
         # Translation Settings
         with st.expander("🌍 Translation Settings"):
             translation_options = {
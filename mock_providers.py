@@ -0,0 +1,389 @@
+"""
+Mock Groq and NewsAPI server
+Local stand-in for both providers for load testing: the OpenAI-compatible
+/openai/v1/chat/completions endpoint (plain JSON and SSE streaming) and
+NewsAPI's /v2/everything, with configurable latency distributions, 5xx
+errors, 429s with Retry-After and requests that hang past the client
+timeout. Point the app at it with GROQ_BASE_URL and NEWSAPI_BASE_URL.
+
+Usage: python mock_providers.py [--port 8787] [--groq-latency lognormal:400:0.5] [--groq-429-rate 0.05]
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+NEWS_MAX_PAGE_SIZE = 100
+# NewsAPI's developer plan only searches the last month
+NEWS_WINDOW_SECONDS = 30 * 24 * 3600
+
+POSITIVE_EVENTS = ["profits surge", "demand climbs", "shares rally", "wins major contract",
+                   "reports record growth", "upgrade lifts outlook", "expansion accelerates"]
+NEGATIVE_EVENTS = ["shares plunge", "sales decline", "faces lawsuit", "warns of slowdown",
+                   "misses estimates", "layoffs deepen concerns", "supply shortage delays launch"]
+NEUTRAL_EVENTS = ["holds annual meeting", "names new chief executive", "publishes quarterly update",
+                  "announces conference schedule", "files regulatory report"]
+SOURCES = ["Market Wire", "Business Daily", "Tech Ledger", "Finance Post", "Industry Journal"]
+
+def parse_latency(spec):
+    """Latency sampler in seconds from 'fixed:MS', 'uniform:LO:HI' or 'lognormal:MEDIAN:SIGMA' (milliseconds)"""
+    kind, *args = spec.split(':')
+    values = [float(arg) for arg in args]
+    if kind == 'fixed':
+        return lambda rng: values[0] / 1000
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == 'lognormal':
+        return lambda rng: values[0] * math.exp(rng.gauss(0, values[1])) / 1000
+    raise ValueError(f"Unknown latency distribution '{spec}'")
+
+class ProviderProfile:
+    """Behaviour of one mocked provider; rates are fractions of all requests"""
+
+    def __init__(self, latency='fixed:0', error_rate=0.0, rate_limit_rate=0.0, timeout_rate=0.0,
+                 retry_after=1.0, hang_seconds=35.0, token_ms=0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self.retry_after = retry_after
+        # How long a "timeout" request hangs before answering 504; above the client's timeout
+        self.hang_seconds = hang_seconds
+        # Delay between streamed completion chunks
+        self.token_ms = token_ms
+        self._sample = parse_latency(latency)
+
+    def draw(self, rng):
+        """(fault, latency in seconds) for one request; fault is None, 'timeout', 'rate_limit' or 'error'"""
+        roll = rng.random()
+        fault = None
+        for name, rate in (('timeout', self.timeout_rate), ('rate_limit', self.rate_limit_rate),
+                           ('error', self.error_rate)):
+            if roll < rate:
+                fault = name
+                break
+            roll -= rate
+        return fault, self._sample(rng)
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _parse_iso(value):
+    when = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+def synthetic_article(query, slot, interval):
+    """Deterministic article for `query` published at `slot * interval`.
+
+    Every seventh slot re-publishes the previous story under another
+    outlet and URL, like a syndicated copy.
+    """
+    story = slot - 1 if slot % 7 == 0 else slot
+    rng = random.Random(f"{query.lower()}:{story}")
+    events = rng.choice((POSITIVE_EVENTS, NEGATIVE_EVENTS, NEUTRAL_EVENTS))
+    title = f"{query.title()} {rng.choice(events)}"
+    description = f"Analysts say {query.lower()} {rng.choice(events)} after {rng.choice(events)}."
+    source = SOURCES[slot % len(SOURCES)]
+    slug = re.sub(r'\W+', '-', title.lower()).strip('-')
+    return {
+        'source': {'id': None, 'name': source},
+        'author': f"{source} staff",
+        'title': title,
+        'description': description,
+        'url': f"https://{source.lower().replace(' ', '')}.example.com/{slug}-{slot}",
+        'urlToImage': None,
+        'publishedAt': _iso(slot * interval),
+        'content': description
+    }
+
+def insights_text(query):
+    return "\n".join([
+        f"- Demand for {query} is growing fastest among mid-market buyers.",
+        f"- Pricing pressure from new entrants is the main near-term risk for {query}.",
+        f"- Partnerships with distribution platforms could accelerate {query} adoption."
+    ])
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real providers
+    disable_nagle_algorithm = True
+
+    @property
+    def mock(self):
+        return self.server.mock
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/v2/everything':
+            self._news(parse_qs(url.query))
+        elif url.path == '/__stats':
+            self._reply(200, self.mock.stats())
+        else:
+            self._reply(404, {'status': 'error', 'code': 'notFound', 'message': url.path})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if urlparse(self.path).path == '/openai/v1/chat/completions':
+            self._chat(json.loads(body or b'{}'))
+        else:
+            self._reply(404, {'error': {'message': f"Unknown path {self.path}"}})
+
+    def _chat(self, payload):
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self.mock.record('groq', 'unauthorized')
+            self._reply(401, {'error': {'message': 'Invalid API Key', 'type': 'invalid_request_error'}})
+            return
+        profile = self.mock.groq
+        if not self._before_reply('groq', profile, {
+            'rate_limit': {'error': {'message': 'Rate limit reached for requests', 'type': 'requests',
+                                     'code': 'rate_limit_exceeded'}},
+            'error': {'error': {'message': 'Service unavailable', 'type': 'internal_server_error'}}
+        }):
+            return
+
+        prompt = " ".join(m.get('content', '') for m in payload.get('messages', []) if m.get('role') == 'user')
+        match = re.search(r'Query:\s*(.+)', prompt)
+        content = insights_text(match.group(1).strip() if match else 'this market')
+        model = payload.get('model', 'mock')
+        created = int(time.time())
+        if payload.get('stream'):
+            try:
+                self._stream_chat(content, model, created, profile)
+            except (BrokenPipeError, ConnectionResetError):
+                self.mock.record('groq', 'disconnected')
+                return
+        else:
+            self._reply(200, {
+                'id': f"chatcmpl-mock-{created}",
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                             'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(content) // 4,
+                          'total_tokens': (len(prompt) + len(content)) // 4}
+            })
+        self.mock.record('groq', 'ok')
+
+    def _stream_chat(self, content, model, created, profile):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        def event(delta, finish_reason=None):
+            chunk = {'id': f"chatcmpl-mock-{created}", 'object': 'chat.completion.chunk', 'created': created,
+                     'model': model, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+
+        event({'role': 'assistant'})
+        # Roughly one token per chunk, as the real API streams
+        for piece in re.findall(r'\S+\s*', content):
+            if profile.token_ms:
+                time.sleep(profile.token_ms / 1000)
+            event({'content': piece})
+        event({}, 'stop')
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _news(self, params):
+        def param(name, default=None):
+            return params.get(name, [default])[0]
+
+        if not (param('apiKey') or self.headers.get('X-Api-Key')):
+            self.mock.record('news', 'unauthorized')
+            self._reply(401, {'status': 'error', 'code': 'apiKeyMissing',
+                              'message': 'Your API key is missing.'})
+            return
+        if not self._before_reply('news', self.mock.news, {
+            'rate_limit': {'status': 'error', 'code': 'rateLimited',
+                           'message': 'You have made too many requests recently.'},
+            'error': {'status': 'error', 'code': 'unexpectedError', 'message': 'Something went wrong.'}
+        }):
+            return
+
+        query = param('q', '')
+        page = max(1, int(param('page', 1)))
+        page_size = min(NEWS_MAX_PAGE_SIZE, max(1, int(param('pageSize', NEWS_MAX_PAGE_SIZE))))
+        interval = self.mock.news_interval
+        now = time.time()
+        oldest = now - NEWS_WINDOW_SECONDS
+        if param('from'):
+            oldest = max(oldest, _parse_iso(param('from')))
+        newest = min(now, _parse_iso(param('to'))) if param('to') else now
+        newest_slot = int(newest // interval)
+        oldest_slot = math.ceil(oldest / interval)
+        total = max(0, newest_slot - oldest_slot + 1)
+        first = newest_slot - (page - 1) * page_size
+        slots = range(first, max(first - page_size, oldest_slot - 1), -1)
+        self._reply(200, {
+            'status': 'ok',
+            'totalResults': total,
+            'articles': [synthetic_article(query, slot, interval) for slot in slots]
+        })
+        self.mock.record('news', 'ok')
+
+    def _before_reply(self, provider, profile, fault_bodies):
+        """Wait out the sampled latency and inject a fault; False when a fault was sent"""
+        fault, delay = self.mock.draw(profile)
+        if fault == 'timeout':
+            self.mock.record(provider, 'timeout')
+            # Hang past the client's timeout; the eventual 504 usually finds the socket closed
+            self.mock.wait(profile.hang_seconds)
+            self._reply(504, {'error': {'message': 'Gateway timeout'}})
+            return False
+        self.mock.wait(delay)
+        if fault == 'rate_limit':
+            self.mock.record(provider, 'rate_limited')
+            self._reply(429, fault_bodies['rate_limit'], {'Retry-After': f"{profile.retry_after:g}"})
+            return False
+        if fault == 'error':
+            self.mock.record(provider, 'error')
+            self._reply(503, fault_bodies['error'])
+            return False
+        return True
+
+    def _write_chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _reply(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Clients that hang up mid-response (timeouts, cancelled streams) are expected under load;
+    only other handler errors are printed"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+class MockProviderServer:
+    """Threaded mock of both providers; `start()` returns the base URL"""
+
+    def __init__(self, groq=None, news=None, host="127.0.0.1", port=0, seed=None, news_interval=3600):
+        self.groq = groq or ProviderProfile()
+        self.news = news or ProviderProfile()
+        self.host = host
+        self.port = port
+        # Seconds between synthetic articles for each query
+        self.news_interval = news_interval
+        self._rng = random.Random(seed)
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def start(self):
+        self._server = QuietHTTPServer((self.host, self.port), MockHandler)
+        self._server.mock = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self):
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def draw(self, profile):
+        with self._lock:
+            return profile.draw(self._rng)
+
+    def wait(self, seconds):
+        """Sleep that ends early when the server stops"""
+        if seconds > 0:
+            self._stopping.wait(seconds)
+
+    def record(self, provider, outcome):
+        with self._lock:
+            self._counts[(provider, outcome)] += 1
+
+    def stats(self):
+        """{provider: {outcome: count}}"""
+        with self._lock:
+            result = {}
+            for (provider, outcome), count in sorted(self._counts.items()):
+                result.setdefault(provider, {})[outcome] = count
+            return result
+
+def add_profile_arguments(parser, provider, latency):
+    parser.add_argument(f"--{provider}-latency", default=latency,
+                        help="fixed:MS, uniform:LO:HI or lognormal:MEDIAN:SIGMA (milliseconds)")
+    parser.add_argument(f"--{provider}-error-rate", type=float, default=0.0, help="fraction answered 503")
+    parser.add_argument(f"--{provider}-429-rate", type=float, default=0.0, help="fraction answered 429")
+    parser.add_argument(f"--{provider}-timeout-rate", type=float, default=0.0,
+                        help="fraction that hang past the client timeout")
+    parser.add_argument(f"--{provider}-retry-after", type=float, default=1.0)
+
+def profile_from_args(args, provider, **extra):
+    values = vars(args)
+    return ProviderProfile(
+        latency=values[f"{provider}_latency"],
+        error_rate=values[f"{provider}_error_rate"],
+        rate_limit_rate=values[f"{provider}_429_rate"],
+        timeout_rate=values[f"{provider}_timeout_rate"],
+        retry_after=values[f"{provider}_retry_after"],
+        **extra
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Groq and NewsAPI endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--token-ms", type=float, default=15.0, help="delay between streamed chunks")
+    parser.add_argument("--news-interval", type=float, default=3600, help="seconds between articles per query")
+    add_profile_arguments(parser, "groq", "lognormal:400:0.5")
+    add_profile_arguments(parser, "news", "lognormal:150:0.4")
+    args = parser.parse_args()
+
+    server = MockProviderServer(
+        groq=profile_from_args(args, "groq", token_ms=args.token_ms),
+        news=profile_from_args(args, "news"),
+        host=args.host, port=args.port, seed=args.seed, news_interval=args.news_interval
+    )
+    base_url = server.start()
+    print(f"Mock providers on {base_url}")
+    print(f"  GROQ_BASE_URL={base_url} NEWSAPI_BASE_URL={base_url} streamlit run marketAnalyzer.py")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
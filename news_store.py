@@ -0,0 +1,179 @@
+"""
+News article store
+Local SQLite store for NewsAPI articles, deduplicated by URL and by a hash
+of the normalized headline and description, so syndicated copies of the
+same story are kept once. Each query remembers the newest publishedAt it
+has seen; the next fetch for that query only asks NewsAPI for articles
+from that point on. A fetch that stops before reaching the cursor (page
+budget spent or a later page failed) leaves the cursor where it was and
+records the oldest article it got as a backfill marker; the next fetch
+pages back from the marker until the gap is closed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from storage import cache_path, connect_sqlite
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT UNIQUE,
+    content_hash TEXT NOT NULL UNIQUE,
+    published_at TEXT NOT NULL DEFAULT '',
+    fetched_at REAL NOT NULL,
+    article TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at);
+CREATE TABLE IF NOT EXISTS query_articles (
+    query_key TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    PRIMARY KEY (query_key, article_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS news_cursors (
+    query_key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    published_after TEXT,
+    fetched_at REAL NOT NULL,
+    requests INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS news_backfill (
+    query_key TEXT PRIMARY KEY,
+    published_before TEXT NOT NULL
+);
+"""
+
+# NewsAPI keeps the slot of deleted articles with this placeholder text
+REMOVED_PLACEHOLDER = "[Removed]"
+
+def query_key(query):
+    """Case- and whitespace-insensitive key for a search query"""
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+def content_hash(article):
+    """Hash of the normalized headline and description"""
+    text = f"{article.get('title') or ''}\n{article.get('description') or ''}"
+    normalized = re.sub(r'\W+', ' ', text).strip().lower()
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+class NewsStore:
+    """Deduplicated articles per query plus each query's since-cursor"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("NEWS_STORE_PATH") or cache_path("news.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def cursor(self, query):
+        """publishedAt of the newest stored article for `query`, or None before the first fetch"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT published_after FROM news_cursors WHERE query_key = ?", (query_key(query),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def backfill(self, query):
+        """publishedAt down to which the last incomplete fetch got, or None when there is no gap"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT published_before FROM news_backfill WHERE query_key = ?", (query_key(query),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def ingest(self, query, articles, requests=1, complete=True):
+        """Store fetched articles for `query`; returns how many were new to it.
+
+        `complete` means paging reached the cursor (or the backfill marker's
+        gap was closed): the cursor then moves to the newest stored article.
+        Otherwise the cursor stays and the oldest fetched article becomes the
+        backfill marker, so the articles between them are fetched next time.
+        """
+        key = query_key(query)
+        now = time.time()
+        added = 0
+        with self._lock:
+            for article in articles:
+                if (article.get('title') or '') == REMOVED_PLACEHOLDER:
+                    continue
+                url = article.get('url') or None
+                digest = content_hash(article)
+                row = self._conn.execute(
+                    "SELECT id FROM articles WHERE url = ? OR content_hash = ?", (url, digest)
+                ).fetchone()
+                if row is None:
+                    article_id = self._conn.execute(
+                        "INSERT INTO articles (url, content_hash, published_at, fetched_at, article)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (url, digest, article.get('publishedAt') or '', now, json.dumps(article))
+                    ).lastrowid
+                else:
+                    article_id = row[0]
+                added += self._conn.execute(
+                    "INSERT OR IGNORE INTO query_articles VALUES (?, ?)", (key, article_id)
+                ).rowcount
+            if complete:
+                cursor = self._conn.execute(
+                    "SELECT MAX(a.published_at) FROM articles a JOIN query_articles q ON q.article_id = a.id"
+                    " WHERE q.query_key = ?", (key,)
+                ).fetchone()[0]
+                self._conn.execute("DELETE FROM news_backfill WHERE query_key = ?", (key,))
+            else:
+                row = self._conn.execute(
+                    "SELECT published_after FROM news_cursors WHERE query_key = ?", (key,)
+                ).fetchone()
+                cursor = row[0] if row else None
+                oldest = min((article.get('publishedAt') for article in articles
+                              if article.get('publishedAt')), default=None)
+                if oldest:
+                    self._conn.execute(
+                        "INSERT INTO news_backfill VALUES (?, ?) ON CONFLICT (query_key)"
+                        " DO UPDATE SET published_before = excluded.published_before", (key, oldest)
+                    )
+            self._conn.execute(
+                "INSERT INTO news_cursors VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (query_key) DO UPDATE SET published_after = excluded.published_after,"
+                " fetched_at = excluded.fetched_at, requests = requests + excluded.requests",
+                (key, query, cursor or None, now, requests)
+            )
+            self._conn.commit()
+        return added
+
+    def articles(self, query, limit=50):
+        """Stored articles for `query`, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT a.article FROM articles a JOIN query_articles q ON q.article_id = a.id"
+                " WHERE q.query_key = ? ORDER BY a.published_at DESC LIMIT ?",
+                (query_key(query), limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def stats(self):
+        with self._lock:
+            articles = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            queries, requests = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(requests), 0) FROM news_cursors"
+            ).fetchone()
+        return {'articles': articles, 'queries': queries, 'requests': requests}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_news_store():
+    """Process-wide news store shared by all sessions and batch workers"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = NewsStore()
+    return _store
@@ -0,0 +1,100 @@
+"""
+Async agent orchestrator
+Runs the multi-agent workflow as a dependency DAG: each stage starts as
+soon as the stages it depends on have finished, so independent work (news
+fetch, sentiment, the Groq call) overlaps instead of queueing.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class Stage:
+    """One unit of pipeline work; `fn` receives the results of `deps` in order"""
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+class PipelineResult:
+    def __init__(self, results, timings, total):
+        self.results = results
+        self.timings = timings
+        self.total = total
+
+    def __getitem__(self, name):
+        return self.results[name]
+
+class AgentPipeline:
+    """Dependency-ordered, concurrent runner for blocking agent stages"""
+
+    def __init__(self, stages, max_workers=None, stage_wrapper=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers or len(self.stages)
+        # Hook applied to every stage callable before it runs on a worker thread
+        self.stage_wrapper = stage_wrapper
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Depth-first walk to reject cycles before anything is scheduled
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def run_async(self, on_stage_done=None):
+        """Run all stages; `on_stage_done(name, timing)` fires on the event loop thread"""
+        loop = asyncio.get_running_loop()
+        results, timings, tasks = {}, {}, {}
+        started = time.perf_counter()
+
+        async def run_stage(stage):
+            if stage.deps:
+                await asyncio.gather(*(tasks[dep] for dep in stage.deps))
+            fn = self.stage_wrapper(stage.fn) if self.stage_wrapper else stage.fn
+            args = [results[dep] for dep in stage.deps]
+
+            stage_start = time.perf_counter()
+            results[stage.name] = await loop.run_in_executor(executor, lambda: fn(*args))
+            stage_end = time.perf_counter()
+
+            timings[stage.name] = {
+                'start': stage_start - started,
+                'end': stage_end - started,
+                'duration': stage_end - stage_start
+            }
+            if on_stage_done:
+                on_stage_done(stage.name, timings[stage.name])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="agent") as executor:
+            for name, stage in self.stages.items():
+                tasks[name] = asyncio.ensure_future(run_stage(stage))
+            try:
+                await asyncio.gather(*tasks.values())
+            except BaseException:
+                for task in tasks.values():
+                    task.cancel()
+                raise
+
+        return PipelineResult(results, timings, time.perf_counter() - started)
+
+    def run(self, on_stage_done=None):
+        """Blocking entry point for callers without an event loop (e.g. a Streamlit script)"""
+        return asyncio.run(self.run_async(on_stage_done))
@@ -0,0 +1,282 @@
+"""
+Client-side rate limiting for external providers
+Token buckets plus a process-wide quota scheduler that makes Groq and
+NewsAPI calls queue (interactive before batch) instead of running into
+provider 429s. Daily request counts are kept in SQLite, so they survive
+restarts and every process using the same cache directory (dashboard, API,
+batch worker processes) draws on one daily budget.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from storage import cache_path, connect_sqlite
+
+# Scheduling priorities: lower runs first
+INTERACTIVE = 0
+BATCH = 1
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller's wait for quota exceeds its timeout"""
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_minute`"""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 60.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, tokens=1):
+        """Seconds until `tokens` are available, without taking them"""
+        with self._lock:
+            self._refill(time.monotonic())
+            # Requests bigger than the bucket wait for a full bucket rather than forever
+            tokens = min(tokens, self.capacity)
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    def consume(self, tokens=1):
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= min(tokens, self.capacity)
+
+class DailyUsage:
+    """Requests per provider and UTC day, shared by every process using the same file"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("QUOTA_STORE_PATH") or cache_path("quota.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota_usage ("
+            " provider TEXT NOT NULL, day TEXT NOT NULL, used INTEGER NOT NULL,"
+            " PRIMARY KEY (provider, day)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def used(self, provider, day):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT used FROM quota_usage WHERE provider = ? AND day = ?", (provider, day.isoformat())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def claim(self, provider, day, limit=None):
+        """Count one request unless `limit` is already reached; returns whether it was counted.
+
+        One UPDATE, so two processes can never both take the last request of the day.
+        """
+        day = day.isoformat()
+        with self._lock:
+            if self._conn.execute("INSERT OR IGNORE INTO quota_usage VALUES (?, ?, 0)", (provider, day)).rowcount:
+                # First request of a new day: earlier days are no longer needed
+                self._conn.execute("DELETE FROM quota_usage WHERE provider = ? AND day < ?", (provider, day))
+            counted = self._conn.execute(
+                "UPDATE quota_usage SET used = used + 1 WHERE provider = ? AND day = ? AND (? IS NULL OR used < ?)",
+                (provider, day, limit, limit)
+            ).rowcount
+            self._conn.commit()
+        return counted == 1
+
+_usage = None
+_usage_lock = threading.Lock()
+
+def get_daily_usage():
+    """Process-wide handle on the shared daily request counts"""
+    global _usage
+    if _usage is None:
+        with _usage_lock:
+            if _usage is None:
+                _usage = DailyUsage()
+    return _usage
+
+def _seconds_until_utc_midnight():
+    now = datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+class ProviderQuota:
+    """Requests/min and tokens/min buckets, a daily quota and a priority wait queue.
+
+    With `usage` (a DailyUsage) the daily count is shared with other processes
+    and restarts; without it the count lives in this object only.
+    """
+
+    def __init__(self, name, requests_per_minute, tokens_per_minute=None, daily_quota=None, usage=None):
+        self.name = name
+        self.daily_quota = daily_quota
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        # Token budgets are spent in large chunks, so allow a full minute's burst
+        self.tokens = TokenBucket(tokens_per_minute, capacity=tokens_per_minute) if tokens_per_minute else None
+        self.usage = usage
+        self._used_today = 0
+        self._day = datetime.now(timezone.utc).date()
+        self._paused_until = 0.0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _roll_day(self):
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            self._day, self._used_today = today, 0
+        return today
+
+    @property
+    def used_today(self):
+        today = self._roll_day()
+        return self.usage.used(self.name, today) if self.usage is not None else self._used_today
+
+    def _count_request(self):
+        """Add one request to today's count; False if another process took the last one first"""
+        if self.usage is None:
+            self._used_today += 1
+            return True
+        return self.usage.claim(self.name, self._roll_day(), self.daily_quota)
+
+    def _ready_in(self, tokens):
+        """Seconds until a request of `tokens` could go out (0 = now)"""
+        waits = [self._paused_until - time.monotonic()]
+        if self.requests is not None:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens is not None:
+            waits.append(self.tokens.wait_time(tokens))
+        if self.daily_quota is not None and self.used_today >= self.daily_quota:
+            waits.append(_seconds_until_utc_midnight())
+        return max(waits)
+
+    def acquire(self, tokens=1, priority=INTERACTIVE, timeout=None):
+        """Queue until quota allows a request; higher-priority callers go first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ticket = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    wait = None
+                    # Only the head of the queue may take quota; everyone else waits for a notify
+                    if self._waiters[0] == ticket:
+                        wait = self._ready_in(tokens)
+                        if wait <= 0:
+                            if not self._count_request():
+                                # Another process took the day's last request; look again
+                                continue
+                            if self.requests is not None:
+                                self.requests.consume(1)
+                            if self.tokens is not None:
+                                self.tokens.consume(tokens)
+                            return
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        # Fail fast when quota (e.g. the daily one) can't come back in time
+                        if remaining <= 0 or (wait is not None and wait > remaining):
+                            raise RateLimitTimeout(f"{self.name}: no quota within {timeout:g}s")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Hold every caller back, e.g. after the provider answered 429"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def limits(self):
+        """(requests/min, tokens/min, requests/day) as configured; None where unlimited"""
+        return (self.requests.rate * 60 if self.requests else None,
+                self.tokens.rate * 60 if self.tokens else None,
+                self.daily_quota)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'queue_depth': len(self._waiters),
+                'interactive_waiting': sum(1 for priority, _ in self._waiters if priority == INTERACTIVE),
+                'batch_waiting': sum(1 for priority, _ in self._waiters if priority != INTERACTIVE),
+                'used_today': self.used_today,
+                'daily_quota': self.daily_quota,
+                'paused_for': max(0.0, self._paused_until - time.monotonic())
+            }
+
+def _env_limit(name, default):
+    value = os.environ.get(name, default)
+    return float(value) if value not in (None, "", "0") else None
+
+def default_quotas(usage=None):
+    """Provider limits from the environment; defaults follow the free tiers"""
+    return {
+        'groq': ProviderQuota(
+            'groq',
+            requests_per_minute=_env_limit("GROQ_RPM", 30),
+            tokens_per_minute=_env_limit("GROQ_TPM", 6000),
+            daily_quota=_env_limit("GROQ_DAILY_QUOTA", 14400),
+            usage=usage
+        ),
+        'news': ProviderQuota(
+            'news',
+            requests_per_minute=_env_limit("NEWS_RPM", 30),
+            daily_quota=_env_limit("NEWS_DAILY_QUOTA", 100),
+            usage=usage
+        )
+    }
+
+class QuotaScheduler:
+    """Process-wide registry of provider quotas"""
+
+    def __init__(self, quotas=None, usage=None):
+        self.usage = usage
+        self.quotas = quotas if quotas is not None else default_quotas(usage)
+
+    def acquire(self, provider, tokens=1, priority=INTERACTIVE, timeout=None):
+        quota = self.quotas.get(provider)
+        if quota is not None:
+            quota.acquire(tokens, priority, timeout)
+
+    def pause(self, provider, seconds):
+        quota = self.quotas.get(provider)
+        if quota is not None:
+            quota.pause(seconds)
+
+    def configure(self, provider, requests_per_minute, tokens_per_minute=None, daily_quota=None):
+        """Replace a provider's limits (e.g. from CLI flags) before work starts"""
+        self.quotas[provider] = ProviderQuota(provider, requests_per_minute, tokens_per_minute, daily_quota,
+                                              usage=self.usage)
+
+    def limits(self):
+        return {name: quota.limits() for name, quota in self.quotas.items()}
+
+    def share(self, limits, parts):
+        """Take 1/`parts` of each provider's per-minute `limits`, for one of `parts`
+        worker processes that each keep their own scheduler. The daily quota is not
+        divided: the count is shared, so every process checks the same remaining budget."""
+        for provider, (requests_per_minute, tokens_per_minute, daily_quota) in limits.items():
+            self.configure(provider, requests_per_minute / parts if requests_per_minute else None,
+                           tokens_per_minute / parts if tokens_per_minute else None, daily_quota)
+
+    def stats(self):
+        return {name: quota.stats() for name, quota in self.quotas.items()}
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Process-wide quota scheduler shared by all sessions, batch runs and workers"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = QuotaScheduler(usage=get_daily_usage())
+    return _scheduler
@@ -0,0 +1,215 @@
+"""
+Report store
+Durable SQLite store for generated reports. Each report is kept as JSON
+with its bulky market_data (news articles, trends) in a separate column, so
+listing pages only reads the small part. Indexed on generated_at, query,
+industry and risk level, plus an FTS5 full-text index over the report text
+that is updated in the same transaction as every insert.
+"""
+
+import json
+import os
+import re
+import threading
+import uuid
+
+from storage import cache_path, connect_sqlite
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id TEXT PRIMARY KEY,
+    generated_at TEXT NOT NULL,
+    query TEXT NOT NULL DEFAULT '',
+    industry TEXT,
+    risk_level TEXT,
+    title TEXT NOT NULL DEFAULT '',
+    report TEXT NOT NULL,
+    market_data TEXT
+);
+CREATE INDEX IF NOT EXISTS reports_generated_at ON reports (generated_at);
+CREATE INDEX IF NOT EXISTS reports_query ON reports (query COLLATE NOCASE, generated_at);
+CREATE INDEX IF NOT EXISTS reports_industry ON reports (industry, generated_at);
+CREATE INDEX IF NOT EXISTS reports_risk_level ON reports (risk_level, generated_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5 (
+    title, query_text, summary, insights, recommendations, headlines,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# bm25 weights per FTS column: titles and queries matter most
+FTS_WEIGHTS = (5.0, 5.0, 2.0, 3.0, 1.0, 1.0)
+
+def search_text(report, market_data):
+    """Column values indexed for full-text search"""
+    analysis = report.get('analysis', {})
+    market_data = market_data or {}
+    return (
+        report.get('title', ''),
+        market_data.get('query', ''),
+        report.get('executive_summary', ''),
+        "\n".join(analysis.get('key_insights', [])),
+        "\n".join(report.get('recommendations', [])),
+        "\n".join(article.get('title') or '' for article in market_data.get('news', []))
+    )
+
+def match_expression(text):
+    """FTS5 query from free text: every word must match, as a prefix"""
+    return " ".join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+class ReportStore:
+    """Reports persisted in SQLite, newest first"""
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("REPORT_STORE_PATH") or cache_path("reports.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(self.path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._sync_search_index()
+
+    def _sync_search_index(self):
+        """Rebuild the FTS index if it is out of step, e.g. for a pre-FTS database"""
+        with self._lock:
+            indexed = self._conn.execute("SELECT COUNT(*) FROM reports_fts").fetchone()[0]
+            stored = self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+            if indexed == stored:
+                return
+            self._conn.execute("DELETE FROM reports_fts")
+            rows = self._conn.execute("SELECT rowid, report, market_data FROM reports").fetchall()
+            self._conn.executemany(
+                "INSERT INTO reports_fts (rowid, title, query_text, summary, insights, recommendations, headlines)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(rowid,) + search_text(json.loads(report), json.loads(market) if market else None)
+                 for rowid, report, market in rows]
+            )
+            self._conn.commit()
+
+    def add(self, report, industry=None):
+        """Store a report and return its id (also set as report['id'])"""
+        report_id = report.get('id') or uuid.uuid4().hex
+        market_data = report.get('market_data')
+        stored = {k: v for k, v in report.items() if k != 'market_data'}
+        stored['id'] = report_id
+        if industry is not None:
+            stored['industry'] = industry
+        analysis = report.get('analysis', {})
+        row = (
+            report_id,
+            report.get('generated_at', ''),
+            (market_data or {}).get('query', ''),
+            stored.get('industry'),
+            analysis.get('risk_level'),
+            report.get('title', ''),
+            json.dumps(stored, default=str),
+            json.dumps(market_data, default=str) if market_data is not None else None
+        )
+        with self._lock:
+            old = self._conn.execute("SELECT rowid FROM reports WHERE id = ?", (report_id,)).fetchone()
+            if old is not None:
+                self._conn.execute("DELETE FROM reports_fts WHERE rowid = ?", old)
+            rowid = self._conn.execute("INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row).lastrowid
+            self._conn.execute(
+                "INSERT INTO reports_fts (rowid, title, query_text, summary, insights, recommendations, headlines)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (rowid,) + search_text(stored, market_data)
+            )
+            self._conn.commit()
+        report['id'] = report_id
+        return report_id
+
+    def get(self, report_id, with_market_data=False):
+        columns = "report, market_data" if with_market_data else "report, NULL"
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {columns} FROM reports WHERE id = ?", (report_id,)
+            ).fetchone()
+        return self._load(row) if row is not None else None
+
+    def market_data(self, report_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT market_data FROM reports WHERE id = ?", (report_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None and row[0] else None
+
+    def count(self, **filters):
+        source, params = self._source(**filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) {source}", params).fetchone()[0]
+
+    def page(self, offset=0, limit=10, with_market_data=False, **filters):
+        """Reports ordered by search rank when `text` is given, else newest
+        first; `filters` as for `count`"""
+        source, params = self._source(**filters)
+        columns = "r.report, r.market_data" if with_market_data else "r.report, NULL"
+        order = "rank, r.generated_at DESC" if match_expression(filters.get('text') or '') else "r.generated_at DESC"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} {source} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [self._load(row) for row in rows]
+
+    def search(self, text, offset=0, limit=10, **filters):
+        """Best-matching reports for free text, combined with the usual filters"""
+        return self.page(offset, limit, text=text, **filters)
+
+    def delete(self, report_id):
+        with self._lock:
+            row = self._conn.execute("SELECT rowid FROM reports WHERE id = ?", (report_id,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM reports_fts WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM reports WHERE rowid = ?", row)
+            self._conn.commit()
+
+    @staticmethod
+    def _source(text=None, query=None, industry=None, risk_level=None, date_from=None, date_to=None):
+        """FROM/WHERE clause; dates are ISO strings or date objects, date_to is inclusive"""
+        clauses, params = [], []
+        source = "FROM reports r"
+        expression = match_expression(text or '')
+        if expression:
+            weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+            source = (f"FROM (SELECT rowid, bm25(reports_fts, {weights}) AS rank FROM reports_fts"
+                      " WHERE reports_fts MATCH ?) f JOIN reports r ON r.rowid = f.rowid")
+            params.append(expression)
+        if query:
+            clauses.append("r.query = ? COLLATE NOCASE")
+            params.append(query)
+        if industry:
+            clauses.append("r.industry = ?")
+            params.append(industry)
+        if risk_level:
+            clauses.append("r.risk_level = ?")
+            params.append(risk_level)
+        if date_from:
+            clauses.append("r.generated_at >= ?")
+            params.append(str(date_from))
+        if date_to:
+            # generated_at is a full ISO timestamp; '~' sorts after every time suffix
+            clauses.append("r.generated_at <= ?")
+            params.append(str(date_to) + "~")
+        return source + (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @staticmethod
+    def _load(row):
+        report = json.loads(row[0])
+        if row[1]:
+            report['market_data'] = json.loads(row[1])
+        return report
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_report_store():
+    """Process-wide report store shared by all sessions"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ReportStore()
+    return _store
@@ -0,0 +1,186 @@
+"""
+Shared resources
+Registry of the process-wide objects every Streamlit session reuses: the
+pooled HTTP client, the report job pool, googletrans clients, the sentiment lexicon and the
+forecast fit cache. Each is built once through st.cache_resource, checked
+by a health function before it is handed out (an unhealthy instance is
+released and rebuilt) and reported with its stats in the sidebar.
+"""
+
+import functools
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+from forecasting import get_fit_cache
+from http_client import HttpClient, get_http_client, reset_http_client
+from jobs import JobQueue, get_job_queue, reset_job_queue
+from sentiment import get_lexicon
+
+class Resource:
+    """Bookkeeping for one registered resource: live instances, age and release hook"""
+
+    def __init__(self, name):
+        self.name = name
+        self.health = None
+        self.release = None
+        self._lock = threading.Lock()
+        self._instances = {}
+        self.rebuilds = 0
+
+    def created(self, instance):
+        with self._lock:
+            self._instances[id(instance)] = (instance, time.time())
+
+    def released(self, instance):
+        with self._lock:
+            self._instances.pop(id(instance), None)
+            self.rebuilds += 1
+        if self.release is not None:
+            self.release(instance)
+
+    def validate(self, instance):
+        """st.cache_resource validate hook; an unhealthy instance is released here"""
+        if self.check(instance) is None:
+            return True
+        # Streamlit drops entries that fail validation without calling on_release
+        self.released(instance)
+        return False
+
+    def check(self, instance):
+        """None if the instance is usable, otherwise why it is not"""
+        if self.health is None:
+            return None
+        try:
+            return self.health(instance)
+        except Exception as e:
+            return f"health check failed: {e}"
+
+    def report(self):
+        with self._lock:
+            instances = list(self._instances.values())
+        report = {'name': self.name, 'instances': len(instances),
+                  'rebuilds': self.rebuilds, 'status': 'not created', 'age': None, 'stats': None}
+        if instances:
+            instance, created_at = max(instances, key=lambda item: item[1])
+            problem = self.check(instance)
+            report['status'] = problem or 'ok'
+            report['age'] = time.time() - created_at
+            if hasattr(instance, 'stats'):
+                try:
+                    report['stats'] = instance.stats()
+                except Exception:
+                    pass
+        return report
+
+REGISTRY = {}
+
+def shared_resource(name, health=None, release=None):
+    """Register a factory as a named st.cache_resource.
+
+    `health(instance)` returns None when the instance is usable or a short
+    reason when it is not; Streamlit then drops the instance, calls
+    `release(instance)` and builds a new one.
+    """
+    def decorate(factory):
+        # Reruns re-execute the script; keep the bookkeeping of the first registration
+        resource = REGISTRY.setdefault(name, Resource(name))
+        resource.health = health
+        resource.release = release
+
+        @functools.wraps(factory)
+        def create(*args, **kwargs):
+            instance = factory(*args, **kwargs)
+            resource.created(instance)
+            return instance
+
+        return st.cache_resource(
+            create,
+            show_spinner=False,
+            validate=resource.validate,
+            on_release=resource.released
+        )
+    return decorate
+
+def resource_health():
+    """Status, age and stats of every registered resource"""
+    return [resource.report() for resource in REGISTRY.values()]
+
+class TranslatorPool:
+    """Reusable googletrans clients.
+
+    A client is used by one caller at a time; idle clients are kept up to
+    TRANSLATOR_POOL_SIZE and extra ones are built on demand, so nested or
+    concurrent translations never wait on each other.
+    """
+
+    def __init__(self, size=None):
+        self.size = size or int(os.environ.get("TRANSLATOR_POOL_SIZE", 4))
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.closed = False
+        self.created = 0
+        self.in_use = 0
+
+    def _make(self):
+        # googletrans is only imported when the first translation is requested
+        from googletrans import Translator
+        with self._lock:
+            self.created += 1
+        return Translator()
+
+    @contextmanager
+    def client(self):
+        try:
+            translator = self._idle.get_nowait()
+        except queue.Empty:
+            translator = self._make()
+        with self._lock:
+            self.in_use += 1
+        try:
+            yield translator
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            if not self.closed and self._idle.qsize() < self.size:
+                self._idle.put(translator)
+
+    def stats(self):
+        return {'created': self.created, 'idle': self._idle.qsize(), 'in_use': self.in_use}
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                return
+
+@shared_resource("http_client", health=HttpClient.health, release=reset_http_client)
+def get_shared_http_client():
+    """The pooled HTTP client every agent uses"""
+    return get_http_client()
+
+@shared_resource("job_queue", health=JobQueue.health, release=reset_job_queue)
+def get_shared_job_queue():
+    """Worker pool running report jobs for every session"""
+    return get_job_queue()
+
+@shared_resource("translators", release=TranslatorPool.close)
+def get_translators():
+    """Pool of googletrans clients shared by all sessions"""
+    return TranslatorPool()
+
+@shared_resource("sentiment_lexicon")
+def get_sentiment_lexicon():
+    """Compiled sentiment lexicon used to score news"""
+    return get_lexicon()
+
+@shared_resource("forecast_models")
+def get_forecast_models():
+    """Cache of fitted forecasting models"""
+    return get_fit_cache()
@@ -0,0 +1,205 @@
+"""
+News sentiment scoring
+Offline, lexicon-based scorer in the style of VADER: term valences on a
+-4..4 scale, negation flips, booster words, the "but" shift and
+exclamation emphasis, squashed into a compound score in [-1, 1]. A whole
+batch of headlines is tokenized with one regex pass and scored with array
+operations, so cost grows with total tokens rather than Python work per
+article.
+"""
+
+import re
+import threading
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Market-news lexicon; valences follow VADER's -4 (most negative) .. 4 scale
+LEXICON = {
+    # positive
+    'gain': 1.8, 'gains': 1.8, 'gained': 1.8, 'growth': 1.9, 'grow': 1.6, 'grows': 1.6, 'growing': 1.6,
+    'surge': 2.2, 'surges': 2.2, 'surged': 2.2, 'soar': 2.5, 'soars': 2.5, 'soared': 2.5,
+    'rally': 2.0, 'rallies': 2.0, 'rallied': 2.0, 'rise': 1.3, 'rises': 1.3, 'rising': 1.3, 'rose': 1.3,
+    'jump': 1.5, 'jumps': 1.5, 'jumped': 1.5, 'climb': 1.3, 'climbs': 1.3, 'climbed': 1.3,
+    'beat': 1.6, 'beats': 1.6, 'record': 1.4, 'profit': 1.9, 'profits': 1.9, 'profitable': 2.1,
+    'strong': 2.0, 'stronger': 2.1, 'strongest': 2.4, 'robust': 2.0, 'solid': 1.6, 'healthy': 1.8,
+    'boost': 1.7, 'boosts': 1.7, 'boosted': 1.7, 'upgrade': 1.9, 'upgraded': 1.9, 'outperform': 2.0,
+    'optimism': 2.2, 'optimistic': 2.2, 'confident': 2.0, 'confidence': 1.8, 'bullish': 2.3,
+    'positive': 2.3, 'success': 2.6, 'successful': 2.6, 'win': 2.4, 'wins': 2.4, 'won': 2.3,
+    'innovation': 1.7, 'innovative': 1.9, 'breakthrough': 2.4, 'opportunity': 1.8, 'opportunities': 1.8,
+    'expand': 1.4, 'expands': 1.4, 'expansion': 1.5, 'recovery': 1.7, 'recover': 1.5, 'recovers': 1.5,
+    'improve': 1.9, 'improves': 1.9, 'improved': 1.9, 'improvement': 1.9, 'upbeat': 2.0,
+    'accelerate': 1.3, 'accelerates': 1.3, 'momentum': 1.2, 'demand': 0.8, 'launch': 0.9, 'launches': 0.9,
+    'partnership': 1.3, 'approval': 1.8, 'approved': 1.8, 'dividend': 1.2, 'best': 3.2, 'good': 1.9,
+    'great': 3.1, 'excellent': 3.2, 'impressive': 2.6, 'thrive': 2.4, 'thriving': 2.4, 'resilient': 1.9,
+    'favorable': 2.1, 'benefit': 2.0, 'benefits': 2.0, 'lead': 1.0, 'leading': 1.2, 'leader': 1.3,
+    # negative
+    'loss': -1.9, 'losses': -1.9, 'lose': -1.8, 'loses': -1.8, 'lost': -1.7, 'decline': -1.6,
+    'declines': -1.6, 'declined': -1.6, 'drop': -1.3, 'drops': -1.3, 'dropped': -1.3, 'fall': -1.3,
+    'falls': -1.3, 'fell': -1.3, 'plunge': -2.4, 'plunges': -2.4, 'plunged': -2.4, 'slump': -2.1,
+    'slumps': -2.1, 'tumble': -2.0, 'tumbles': -2.0, 'tumbled': -2.0, 'crash': -2.9, 'crashes': -2.9,
+    'sink': -1.6, 'sinks': -1.6, 'slide': -1.2, 'slides': -1.2, 'miss': -1.5, 'misses': -1.5,
+    'missed': -1.5, 'weak': -1.9, 'weaker': -2.0, 'weakness': -1.9, 'slowdown': -1.7, 'slow': -1.0,
+    'cut': -1.3, 'cuts': -1.3, 'layoff': -2.3, 'layoffs': -2.3, 'downgrade': -1.9, 'downgraded': -1.9,
+    'bearish': -2.3, 'pessimism': -2.2, 'pessimistic': -2.2, 'fear': -2.2, 'fears': -2.2,
+    'concern': -1.4, 'concerns': -1.4, 'worry': -1.9, 'worries': -1.9, 'risk': -1.1, 'risks': -1.1,
+    'risky': -1.4, 'uncertainty': -1.5, 'uncertain': -1.4, 'volatile': -1.2, 'volatility': -1.1,
+    'recession': -2.5, 'inflation': -1.0, 'debt': -1.2, 'default': -2.0, 'bankrupt': -3.0,
+    'bankruptcy': -3.0, 'lawsuit': -1.8, 'fraud': -3.0, 'scandal': -2.6, 'probe': -1.3,
+    'investigation': -1.4, 'fine': -1.0, 'fined': -1.6, 'penalty': -1.6, 'warning': -1.4, 'warns': -1.5,
+    'crisis': -2.7, 'shortage': -1.6, 'disruption': -1.6, 'delay': -1.2, 'delays': -1.2, 'delayed': -1.3,
+    'negative': -2.3, 'fail': -2.3, 'fails': -2.3, 'failed': -2.3, 'failure': -2.5, 'bad': -2.5,
+    'worse': -2.1, 'worst': -3.1, 'poor': -2.1, 'struggle': -1.9, 'struggles': -1.9, 'struggling': -1.9,
+    'threat': -2.0, 'threatens': -2.0, 'hack': -2.0, 'breach': -2.1, 'recall': -1.5, 'sell-off': -2.0,
+    'selloff': -2.0, 'underperform': -1.9, 'headwinds': -1.5, 'collapse': -2.9, 'collapsed': -2.9
+}
+
+# Intensifiers add (or dampeners subtract) this much in the direction of the next sentiment word
+BOOSTERS = {
+    'very': 0.293, 'extremely': 0.293, 'highly': 0.293, 'sharply': 0.293, 'significantly': 0.293,
+    'strongly': 0.293, 'substantially': 0.293, 'hugely': 0.293, 'massively': 0.293,
+    'slightly': -0.293, 'marginally': -0.293, 'somewhat': -0.293, 'barely': -0.293, 'modestly': -0.293
+}
+NEGATIONS = (
+    'not', 'no', 'never', 'none', 'nor', 'neither', 'without', 'cannot', "don't", "doesn't", "didn't",
+    "isn't", "aren't", "wasn't", "weren't", "won't", "can't", "couldn't", "shouldn't", "hasn't", "haven't"
+)
+
+NEGATION_SCALAR = -0.74
+BOOSTER_DECAY = (1.0, 0.95, 0.9)
+BUT_BEFORE, BUT_AFTER = 0.5, 1.5
+EXCLAMATION_BOOST, MAX_EXCLAMATIONS = 0.292, 4
+ALPHA = 15
+# Compound score at or beyond which a text counts as positive / negative
+LABEL_THRESHOLD = 0.05
+
+_SEPARATOR = '\x00'
+_TOKEN_RE = re.compile(r"\x00|!|[a-z]+(?:[-'][a-z]+)*")
+
+class SentimentLexicon:
+    """Term tables compiled into one vocabulary index and parallel weight arrays.
+
+    Unknown tokens look up as -1, which lands on a trailing all-zero row.
+    """
+
+    def __init__(self, lexicon=None, boosters=None, negations=None):
+        lexicon = LEXICON if lexicon is None else lexicon
+        boosters = BOOSTERS if boosters is None else boosters
+        negations = NEGATIONS if negations is None else negations
+        terms = sorted(set(lexicon) | set(boosters) | set(negations) | {'but', '!', _SEPARATOR})
+        self.vocabulary = pd.Index(terms)
+        size = len(terms) + 1
+        self.valence = np.zeros(size)
+        self.boost = np.zeros(size)
+        self.negates = np.zeros(size, dtype=bool)
+        self.valence[self.vocabulary.get_indexer(list(lexicon))] = list(lexicon.values())
+        self.boost[self.vocabulary.get_indexer(list(boosters))] = list(boosters.values())
+        self.negates[self.vocabulary.get_indexer(list(negations))] = True
+        self.but_id = self.vocabulary.get_loc('but')
+        self.exclamation_id = self.vocabulary.get_loc('!')
+        self.separator_id = self.vocabulary.get_loc(_SEPARATOR)
+
+    def lookup(self, tokens):
+        return self.vocabulary.get_indexer(tokens)
+
+def _shift(values, k, fill):
+    shifted = np.empty_like(values)
+    shifted[:k] = fill
+    shifted[k:] = values[:-k]
+    return shifted
+
+def polarity_scores(texts, lexicon=None):
+    """Score a batch of texts; returns a DataFrame with compound, pos, neg and neu.
+
+    `compound` is the normalized sum of valences in [-1, 1]; pos/neg/neu
+    are the shares of sentiment mass, as in VADER.
+    """
+    lexicon = lexicon or get_lexicon()
+    texts = ['' if text is None else str(text).replace(_SEPARATOR, ' ') for text in texts]
+    n = len(texts)
+    empty = pd.DataFrame({'compound': np.zeros(n), 'pos': np.zeros(n), 'neg': np.zeros(n), 'neu': np.zeros(n)})
+    if not n:
+        return empty
+
+    # One regex pass over the whole batch; separators mark document boundaries
+    tokens = _TOKEN_RE.findall(f" {_SEPARATOR} ".join(texts).lower())
+    if not tokens:
+        return empty
+    ids = lexicon.lookup(tokens)
+    is_separator = ids == lexicon.separator_id
+    doc = np.cumsum(is_separator)
+
+    valence = lexicon.valence[ids]
+    scored = valence != 0
+    # Boosters and negators up to three tokens back, within the same document
+    boost = np.zeros(len(ids))
+    negated = np.zeros(len(ids), dtype=bool)
+    for k, decay in enumerate(BOOSTER_DECAY, start=1):
+        if len(ids) <= k:
+            break
+        prev = _shift(ids, k, -1)
+        same_doc = _shift(doc, k, -1) == doc
+        boost += np.where(same_doc, lexicon.boost[prev], 0.0) * decay
+        negated |= same_doc & lexicon.negates[prev]
+    valence = valence + np.sign(valence) * boost
+    valence = np.where(negated, valence * NEGATION_SCALAR, valence)
+
+    # "but" shifts weight: words before it count half, words after count 1.5x
+    is_but = ids == lexicon.but_id
+    if is_but.any():
+        seen = np.cumsum(is_but)
+        seen_in_doc = seen - np.maximum.accumulate(np.where(is_separator, seen, 0))
+        total_in_doc = np.bincount(doc, weights=is_but, minlength=n)[doc]
+        valence = np.where(seen_in_doc > 0, valence * BUT_AFTER,
+                           np.where(seen_in_doc < total_in_doc, valence * BUT_BEFORE, valence))
+
+    total = np.bincount(doc, weights=valence, minlength=n)
+    positive = np.bincount(doc, weights=np.where(valence > 0, valence + 1, 0.0), minlength=n)
+    negative = np.bincount(doc, weights=np.where(valence < 0, valence - 1, 0.0), minlength=n)
+    words = np.bincount(doc, weights=~is_separator & (ids != lexicon.exclamation_id), minlength=n)
+    neutral = words - np.bincount(doc, weights=scored, minlength=n)
+
+    # Exclamation marks push the total further from zero
+    exclamations = np.minimum(np.bincount(doc, weights=ids == lexicon.exclamation_id, minlength=n), MAX_EXCLAMATIONS)
+    emphasis = np.sign(total) * exclamations * EXCLAMATION_BOOST
+    total = total + emphasis
+    positive = positive + np.where(total > 0, emphasis, 0.0)
+    negative = negative + np.where(total < 0, emphasis, 0.0)
+
+    compound = total / np.sqrt(total * total + ALPHA)
+    mass = positive + np.abs(negative) + neutral
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shares = [np.where(mass > 0, part / mass, 0.0) for part in (positive, np.abs(negative), neutral)]
+    return pd.DataFrame({'compound': compound, 'pos': shares[0], 'neg': shares[1], 'neu': shares[2]})
+
+def score_texts(texts, lexicon=None):
+    """Compound score in [-1, 1] for each text"""
+    return polarity_scores(texts, lexicon)['compound'].to_numpy()
+
+def article_text(article):
+    """Headline plus description of a NewsAPI article"""
+    return f"{article.get('title') or ''}. {article.get('description') or ''}"
+
+def score_articles(articles, lexicon=None):
+    return score_texts([article_text(article) for article in articles], lexicon)
+
+def label(score):
+    if score >= LABEL_THRESHOLD:
+        return 'positive'
+    if score <= -LABEL_THRESHOLD:
+        return 'negative'
+    return 'neutral'
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+def get_lexicon():
+    """Process-wide compiled default lexicon"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = SentimentLexicon()
+    return _lexicon
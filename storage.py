@@ -0,0 +1,28 @@
+"""
+Local storage helpers
+Shared location and SQLite settings for the on-disk caches and stores.
+"""
+
+import os
+import sqlite3
+
+def cache_dir():
+    """Directory for local caches, overridable via MARKET_ANALYZER_CACHE_DIR"""
+    path = os.environ.get("MARKET_ANALYZER_CACHE_DIR", ".cache")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def cache_path(filename):
+    return os.path.join(cache_dir(), filename)
+
+def connect_sqlite(path):
+    """Open a SQLite connection that can be shared across Streamlit threads.
+
+    Callers are expected to serialize access with their own lock.
+    """
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
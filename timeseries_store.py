@@ -0,0 +1,333 @@
+"""
+Time-series store
+Columnar market series on disk: one Parquet file per append, partitioned
+as <root>/industry=<name>/month=<YYYY-MM>/part-*.parquet. Range queries
+only open the months they need and read them memory-mapped; results can
+be resampled to daily, weekly or monthly bars.
+
+Writers to an industry are serialized across threads and (where flock is
+available) processes. Compaction merges a month's parts into
+compact-<ns>.parquet, which supersedes every part up to <ns>; readers
+skip superseded files, so a concurrent compaction never shows rows twice.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: writers are then only serialized within one process
+    fcntl = None
+
+from lazy_imports import lazy_import
+from storage import cache_path
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+pq = lazy_import("pyarrow.parquet")
+
+SERIES_COLUMNS = ('market_value', 'growth_rate', 'sentiment', 'volume')
+
+# How each column is aggregated when resampling
+RESAMPLE_AGG = {
+    'market_value': 'last',
+    'growth_rate': 'mean',
+    'sentiment': 'mean',
+    'volume': 'sum'
+}
+RESAMPLE_RULES = {'D': 'D', 'W': 'W', 'M': 'MS'}
+
+# Months with more part files than this are rewritten as one file on append
+COMPACT_AFTER_PARTS = 8
+
+# Sample tickers used to seed industries that have no real data loaded yet
+SAMPLE_TICKERS = {
+    'Technology': ['AAPL', 'MSFT', 'NVDA'],
+    'Healthcare': ['JNJ', 'PFE', 'UNH'],
+    'Finance': ['JPM', 'BAC', 'GS'],
+    'Retail': ['WMT', 'AMZN', 'COST'],
+    'Manufacturing': ['CAT', 'GE', 'HON']
+}
+# Industries offered by the dashboard and accepted by the API and batch runs
+INDUSTRIES = list(SAMPLE_TICKERS)
+_INDUSTRY_NAMES = {industry.lower(): industry for industry in INDUSTRIES}
+SAMPLE_YEARS = 3
+
+# Times a read starts over when compaction removed a file it had listed
+READ_RETRIES = 5
+
+PART_FILE = re.compile(r'^(part|compact)-(\d+)\.parquet$')
+
+def canonical_industry(name):
+    """The INDUSTRIES spelling of `name`, matched ignoring case and spacing; None if unknown"""
+    return _INDUSTRY_NAMES.get(" ".join(str(name).split()).lower())
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', name)
+
+def _seed(*parts):
+    return int.from_bytes(hashlib.sha1("|".join(parts).encode('utf-8')).digest()[:4], 'big')
+
+def synthetic_series(industry, tickers, start, end, freq='D', last=None):
+    """Deterministic random-walk sample data, one row per ticker and period.
+
+    `last` maps ticker -> (market_value, sentiment) to continue an existing series.
+    """
+    timestamps = pd.date_range(start=start, end=end, freq=freq)
+    last = last or {}
+    frames = []
+    for ticker in tickers:
+        rng = np.random.default_rng(_seed(industry, ticker, str(timestamps[0]) if len(timestamps) else ''))
+        base_value, base_sentiment = last.get(ticker, (1000 * (1 + (_seed(ticker) % 400) / 100), 0.6))
+        returns = rng.normal(0.0004, 0.015, len(timestamps))
+        frames.append(pd.DataFrame({
+            'timestamp': timestamps,
+            'ticker': ticker,
+            'market_value': base_value * np.exp(np.cumsum(returns)),
+            'growth_rate': returns,
+            'sentiment': np.clip(base_sentiment + np.cumsum(rng.normal(0, 0.001, len(timestamps))), 0, 1),
+            'volume': rng.integers(10_000, 1_000_000, len(timestamps)).astype('int64')
+        }))
+    if not frames:
+        return pd.DataFrame(columns=['timestamp', 'ticker', *SERIES_COLUMNS])
+    return pd.concat(frames, ignore_index=True)
+
+class TimeSeriesStore:
+    """Parquet-backed market series, partitioned by industry and month"""
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get("TIMESERIES_DIR") or cache_path("timeseries")
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _industry_dir(self, industry):
+        return os.path.join(self.root, f"industry={_slug(industry)}")
+
+    def _months(self, industry):
+        """Sorted (month, directory) pairs for an industry"""
+        base = self._industry_dir(industry)
+        if not os.path.isdir(base):
+            return []
+        return sorted(
+            (name[len("month="):], os.path.join(base, name))
+            for name in os.listdir(base) if name.startswith("month=")
+        )
+
+    @staticmethod
+    def _files(directory):
+        """(kind, ns, path) of every data file in a month directory"""
+        files = []
+        for name in os.listdir(directory):
+            match = PART_FILE.match(name)
+            if match:
+                files.append((match.group(1), int(match.group(2)), os.path.join(directory, name)))
+        return files
+
+    @classmethod
+    def _parts(cls, directory):
+        """Live files of a month: the newest compaction plus the parts written after it"""
+        files = cls._files(directory)
+        covered = max((ns for kind, ns, _ in files if kind == 'compact'), default=-1)
+        live = [(ns, path) for kind, ns, path in files if kind == 'part' and ns > covered]
+        live += [(ns, path) for kind, ns, path in files if kind == 'compact' and ns == covered][:1]
+        return [path for _, path in sorted(live)]
+
+    def _read_month(self, directory, **kwargs):
+        """Tables of a month's live files, listed again if compaction removes one mid-read"""
+        for attempt in range(READ_RETRIES):
+            try:
+                return [pq.read_table(part, memory_map=True, **kwargs) for part in self._parts(directory)]
+            except FileNotFoundError:
+                if attempt == READ_RETRIES - 1:
+                    raise
+
+    @contextmanager
+    def _industry_lock(self, industry):
+        """Serialize writers of an industry across threads and, with flock, across processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, f".industry={_slug(industry)}.lock"), 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def industries(self):
+        return sorted(
+            name[len("industry="):] for name in os.listdir(self.root) if name.startswith("industry=")
+        )
+
+    def append(self, industry, df):
+        """Add rows (timestamp, ticker and any SERIES_COLUMNS); writes one part file per month"""
+        with self._industry_lock(industry):
+            self._append(industry, df)
+
+    def _append(self, industry, df):
+        """append() for a caller holding the industry lock"""
+        if df.empty:
+            return
+        for directory in self._write(self._industry_dir(industry), df):
+            if len(self._parts(directory)) > COMPACT_AFTER_PARTS:
+                self._compact(directory)
+
+    @staticmethod
+    def _write(base, df):
+        """Write one part file per month under `base`; returns the month directories"""
+        df = df.copy()
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        directories = []
+        for month, rows in df.groupby(df['timestamp'].dt.strftime('%Y-%m')):
+            directory = os.path.join(base, f"month={month}")
+            os.makedirs(directory, exist_ok=True)
+            table = pa.Table.from_pandas(rows.sort_values(['timestamp', 'ticker']), preserve_index=False)
+            path = os.path.join(directory, f"part-{time.time_ns()}.parquet")
+            # Write then rename so readers never see a half-written file
+            pq.write_table(table, path + ".tmp")
+            os.replace(path + ".tmp", path)
+            directories.append(directory)
+        return directories
+
+    def _compact(self, directory):
+        files = self._files(directory)
+        parts = self._parts(directory)
+        table = pa.concat_tables(pq.read_table(part, memory_map=True) for part in parts)
+        table = table.sort_by([('timestamp', 'ascending'), ('ticker', 'ascending')])
+        # Named after the newest file it merges; from the rename on, readers skip everything it covers
+        covered = max(ns for _, ns, path in files if path in parts)
+        path = os.path.join(directory, f"compact-{covered}.parquet")
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        for _, ns, old in files:
+            if ns <= covered and old != path:
+                try:
+                    os.remove(old)
+                except FileNotFoundError:
+                    pass
+
+    def query(self, industry, start=None, end=None, tickers=None, columns=None, freq=None):
+        """Rows for [start, end] (inclusive), optionally resampled per ticker to 'D', 'W' or 'M'"""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        columns = list(columns or SERIES_COLUMNS)
+        filters = []
+        if start is not None:
+            filters.append(('timestamp', '>=', start))
+        if end is not None:
+            filters.append(('timestamp', '<=', end))
+        if tickers:
+            filters.append(('ticker', 'in', list(tickers)))
+
+        tables = []
+        for month, directory in self._months(industry):
+            # Partition pruning: skip months entirely outside the range
+            if start is not None and month < start.strftime('%Y-%m'):
+                continue
+            if end is not None and month > end.strftime('%Y-%m'):
+                continue
+            tables.extend(self._read_month(
+                directory, columns=['timestamp', 'ticker', *columns], filters=filters or None
+            ))
+        if not tables:
+            return pd.DataFrame(columns=['timestamp', 'ticker', *columns])
+
+        df = pa.concat_tables(tables).to_pandas()
+        df = df.sort_values(['timestamp', 'ticker'], ignore_index=True)
+        if freq is None:
+            return df
+        bars = df.groupby(['ticker', pd.Grouper(key='timestamp', freq=RESAMPLE_RULES[freq])]).agg(
+            {column: RESAMPLE_AGG[column] for column in columns}
+        )
+        return bars.reset_index().sort_values(['timestamp', 'ticker'], ignore_index=True)
+
+    def index_series(self, industry, freq='D', start=None):
+        """Equal-weighted industry index (1.0 at `start`), so high-priced tickers don't dominate"""
+        bars = self.query(industry, start=start, columns=['market_value'], freq=freq)
+        if bars.empty:
+            return pd.Series(dtype='float64')
+        prices = bars.pivot(index='timestamp', columns='ticker', values='market_value').ffill().dropna()
+        return (prices / prices.iloc[0]).mean(axis=1).rename(industry)
+
+    def span(self, industry):
+        """(first, last) timestamp stored for an industry, or None"""
+        months = self._months(industry)
+        if not months:
+            return None
+        first, last = (
+            pa.concat_tables(self._read_month(directory, columns=['timestamp']))['timestamp']
+            for directory in (months[0][1], months[-1][1])
+        )
+        return pd.Timestamp(pc.min(first).as_py()), pd.Timestamp(pc.max(last).as_py())
+
+    def version(self, industry):
+        """Changes whenever the industry's files change; used as a cache key"""
+        digest = hashlib.sha1(industry.encode('utf-8'))
+        for month, directory in self._months(industry):
+            for part in self._parts(directory):
+                try:
+                    stat = os.stat(part)
+                except FileNotFoundError:
+                    # Compacted meanwhile: the version changes either way
+                    continue
+                digest.update(f"{part}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def ensure_sample(self, industry, years=SAMPLE_YEARS):
+        """Seed daily sample history for an industry that has no data yet"""
+        if self._months(industry):
+            return
+        with self._industry_lock(industry):
+            # Checked again under the lock: another worker may have seeded it meanwhile
+            if self._months(industry):
+                return
+            end = pd.Timestamp(datetime.now().date())
+            tickers = SAMPLE_TICKERS.get(industry, [_slug(industry).upper()[:4]])
+            sample = synthetic_series(industry, tickers, end - pd.DateOffset(years=years), end)
+            # Staged and renamed into place, so readers see all of it or nothing, and a
+            # concurrent seeder without flock loses the rename instead of adding a copy
+            staging = tempfile.mkdtemp(prefix=".seed-", dir=self.root)
+            try:
+                self._write(staging, sample)
+                try:
+                    os.rename(staging, self._industry_dir(industry))
+                except OSError:
+                    pass
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def extend_sample(self, industry):
+        """Append sample days from the last stored day up to today"""
+        self.ensure_sample(industry)
+        with self._industry_lock(industry):
+            span = self.span(industry)
+            today = pd.Timestamp(datetime.now().date())
+            if span[1] >= today:
+                return
+            latest = self.query(industry, start=span[1], columns=['market_value', 'sentiment'])
+            last = {row.ticker: (row.market_value, row.sentiment) for row in latest.itertuples()}
+            self._append(industry, synthetic_series(industry, list(last), span[1] + pd.Timedelta(days=1), today,
+                                                    last=last))
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_timeseries_store():
+    """Process-wide time-series store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TimeSeriesStore()
+    return _store
@@ -0,0 +1,145 @@
+"""
+Translation memory
+Two-tier cache of translated strings keyed by (source text hash, target
+language): an in-process LRU in front of a SQLite table that survives
+restarts. Curated phrases can be pre-seeded and are never evicted.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from storage import cache_path, connect_sqlite
+
+DEFAULT_MEMORY_ENTRIES = 4096
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class TranslationMemory:
+    """LRU + SQLite store of translations"""
+
+    def __init__(self, path=None, max_entries=None):
+        if path is None:
+            path = os.environ.get("TRANSLATION_MEMORY_PATH") or cache_path("translation_memory.sqlite3")
+        if max_entries is None:
+            max_entries = int(os.environ.get("TRANSLATION_MEMORY_ENTRIES", DEFAULT_MEMORY_ENTRIES))
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._seeded = {}
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = connect_sqlite(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                text_hash TEXT NOT NULL,
+                target TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (text_hash, target)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    def seed(self, target, phrases):
+        """Pre-seed curated translations (e.g. OFFLINE_TRANSLATIONS) for a language"""
+        with self._lock:
+            for source, translation in phrases.items():
+                self._seeded[(text_hash(source), target)] = translation
+
+    def get(self, text, target):
+        """Return the stored translation or None"""
+        key = (text_hash(text), target)
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, text, target, translation):
+        key = (text_hash(text), target)
+        with self._lock:
+            self._remember(key, translation)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                (key[0], target, translation, time.time())
+            )
+            self._conn.commit()
+
+    def get_many(self, texts, target):
+        """Return {text: translation} for every text found in any tier"""
+        found = {}
+        with self._lock:
+            for text in texts:
+                translation = self._lookup((text_hash(text), target))
+                if translation is not None:
+                    found[text] = translation
+        return found
+
+    def put_many(self, target, translations):
+        """Store {text: translation} pairs in one transaction"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, translation in translations.items():
+                key = (text_hash(text), target)
+                self._remember(key, translation)
+                rows.append((key[0], target, translation, now))
+            self._conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def _lookup(self, key):
+        if key in self._seeded:
+            self.hits += 1
+            return self._seeded[key]
+
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return self._lru[key]
+
+        row = self._conn.execute(
+            "SELECT translation FROM translations WHERE text_hash = ? AND target = ?", key
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        # Promote disk hits into the in-process tier
+        self.disk_hits += 1
+        self._remember(key, row[0])
+        return row[0]
+
+    def _remember(self, key, translation):
+        self._lru[key] = translation
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            return {
+                'seeded': len(self._seeded),
+                'memory_entries': len(self._lru),
+                'disk_entries': stored,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses
+            }
+
+    def health(self):
+        """None while the SQLite table answers, otherwise why not"""
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1 FROM translations LIMIT 1").fetchall()
+        except sqlite3.Error as e:
+            return f"translation table unavailable: {e}"
+        return None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()